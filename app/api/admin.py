@@ -0,0 +1,105 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response
+
+from app.api.dependencies import TranslationServiceDep, require_admin
+from app.api.schemas import CacheStatsResponse, LoopLagResponse
+from app.core.loop_monitor import loop_monitor
+from app.core.profiling import (
+    ProfilerBusyError,
+    profiler,
+    stats_to_pstats_file,
+    stats_to_text,
+)
+
+router = APIRouter(
+    prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)]
+)
+
+
+@router.get("/cache/stats", response_model=CacheStatsResponse)
+async def get_cache_stats(service: TranslationServiceDep):
+    """
+    Get cache analytics.
+
+    Reports hit ratios and characters saved per language pair, the hottest
+    keys and an estimate of the working set size.
+    """
+    if service.analytics is None:
+        raise HTTPException(status_code=404, detail="Cache analytics are disabled")
+    return CacheStatsResponse(**service.analytics.snapshot())
+
+
+@router.get("/metrics/loop", response_model=LoopLagResponse)
+async def get_loop_lag():
+    """
+    Get event loop lag of this worker.
+
+    Lag is how late the loop runs a timer; sustained lag means synchronous
+    work is delaying every concurrent request. Stacks of code blocking the
+    loop for longer than LOOP_BLOCK_THRESHOLD are logged as warnings.
+    """
+    return LoopLagResponse(**loop_monitor.snapshot())
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Get the metrics of this worker in the Prometheus text format.
+
+    Exposes event loop lag as a gauge and a histogram of every probe, plus
+    the number of times the loop was reported blocked.
+    """
+    return PlainTextResponse(
+        loop_monitor.render_metrics(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@router.get("/profile/cpu")
+async def profile_cpu(
+    seconds: float = Query(10.0, gt=0, le=120),
+    format: str = Query("pstats", pattern="^(pstats|text)$"),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|calls)$"),
+    limit: int = Query(50, ge=1, le=1000),
+):
+    """
+    Capture a CPU profile of this worker.
+
+    Profiles everything the worker runs for the given number of seconds and
+    returns a ``.prof`` file (open with pstats or snakeviz) or a text report.
+    Only one profile runs at a time.
+    """
+    try:
+        stats = await profiler.cpu_profile(seconds)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if format == "text":
+        return PlainTextResponse(stats_to_text(stats, sort, limit))
+    return Response(
+        content=stats_to_pstats_file(stats),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": 'attachment; filename="cpu.prof"'},
+    )
+
+
+@router.get("/profile/memory")
+async def profile_memory(
+    seconds: float = Query(10.0, gt=0, le=120),
+    limit: int = Query(25, ge=1, le=500),
+    frames: int = Query(1, ge=1, le=50),
+):
+    """
+    Capture the allocations of this worker over a time window.
+
+    Returns the top allocation sites by memory growth between the start and
+    the end of the window as a text file. Only one profile runs at a time.
+    """
+    try:
+        report = await profiler.allocation_diff(seconds, limit, frames)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return PlainTextResponse(
+        report,
+        headers={"Content-Disposition": 'attachment; filename="allocations.txt"'},
+    )
@@ -1,33 +1,376 @@
+import math
+import secrets
+from pathlib import Path
+from typing import Annotated
+
+from fastapi import Depends, Header, HTTPException, Request, WebSocket
+
+from app.core.admission import AdmissionController
+from app.core.analytics import CacheAnalytics
+from app.core.batcher import MicroBatcher
 from app.core.cache.base import TranslationCache
+from app.core.cache.compression import ValueCodec
 from app.core.cache.memory import InMemoryTranslationCache
+from app.core.cache.peer import PeerTranslationCache
 from app.core.cache.redis import RedisTranslationCache
+from app.core.cache.shared_memory import SharedMemoryTranslationCache
 from app.core.config import settings
+from app.core.language_index import DetectedLanguageIndex
+from app.core.log import configure_logging
+from app.core.loop_monitor import loop_monitor
+from app.core.providers.base import TranslationProvider
 from app.core.providers.deepl import DeepLProvider
+from app.core.providers.record_replay import RECORD, REPLAY, RecordReplayProvider
+from app.core.providers.synthetic import SyntheticProvider
+from app.core.scheduler import BULK, INTERACTIVE, PriorityScheduler, TrafficClass
 from app.core.service import TranslationService
+from app.core.tracing import (
+    FileSpanExporter,
+    OTLPHttpSpanExporter,
+    SpanExporter,
+    tracer,
+)
+from app.core.translation_memory import TranslationMemory
+
+
+def _create_span_exporter() -> SpanExporter | None:
+    """Create the span exporter based on configuration."""
+    exporter = settings.tracing_exporter.lower()
+    if exporter == "file":
+        return FileSpanExporter(settings.tracing_file_path)
+    if exporter == "otlp":
+        return OTLPHttpSpanExporter(settings.tracing_otlp_endpoint)
+    return None
+
+
+def _create_codec() -> ValueCodec:
+    """Create the Redis value codec based on configuration."""
+    dictionary = None
+    if settings.redis_compression_dictionary:
+        dictionary = Path(settings.redis_compression_dictionary).read_bytes()
+    return ValueCodec(
+        threshold=settings.redis_compression_threshold,
+        level=settings.redis_compression_level,
+        dictionary=dictionary,
+    )
 
 
 def _create_cache() -> TranslationCache:
     """Create cache instance based on configuration."""
     if settings.cache_type.lower() == "redis":
-        return RedisTranslationCache(redis_url=settings.redis_url)
+        return RedisTranslationCache(
+            redis_url=settings.redis_url,
+            namespace=f"{settings.cache_namespace}:{_provider_name()}:{settings.cache_version}",
+            redis_urls=[
+                url.strip() for url in settings.redis_urls.split(",") if url.strip()
+            ],
+            cluster=settings.redis_cluster,
+            codec=_create_codec(),
+            lease_ttl=settings.redis_lease_ttl,
+            lease_wait_timeout=settings.redis_lease_wait_timeout,
+        )
+    if settings.cache_type.lower() == "peer":
+        if not settings.cache_peer_token:
+            # The internal cache endpoints share the public port
+            raise ValueError("CACHE_PEER_TOKEN must be set when CACHE_TYPE=peer")
+        return PeerTranslationCache(
+            self_url=settings.cache_peer_self,
+            peer_urls=[
+                url.strip() for url in settings.cache_peers.split(",") if url.strip()
+            ],
+            token=settings.cache_peer_token,
+            timeout=settings.cache_peer_timeout,
+            lease_ttl=settings.cache_peer_lease_ttl,
+            lease_wait_timeout=settings.cache_peer_lease_wait_timeout,
+            max_entries=settings.cache_peer_max_entries,
+        )
+    if settings.cache_type.lower() == "shared":
+        return SharedMemoryTranslationCache(
+            name=f"{settings.cache_namespace}-{_provider_name()}-{settings.cache_version}",
+            slots=settings.shared_cache_slots,
+            arena_size=settings.shared_cache_arena_mb * 1024 * 1024,
+        )
     return InMemoryTranslationCache()
 
 
-# Initialize cache and provider
-_cache = _create_cache()
-_provider = DeepLProvider(
-    api_url=settings.deepl_api_url, api_key=settings.deepl_api_key
-)
-_service = TranslationService(provider=_provider, cache=_cache)
+def _provider_name() -> str:
+    """
+    Name of the provider whose translations are cached.
+
+    Recorded traffic comes from DeepL and shares its cache; replayed
+    translations get their own, so a replay run cannot fill the DeepL cache
+    with stale or partial recordings.
+    """
+    provider_type = settings.provider_type.lower()
+    if provider_type in ("synthetic", REPLAY):
+        return provider_type
+    return "deepl"
+
+
+def _create_provider() -> TranslationProvider:
+    """Create the translation provider based on configuration."""
+    provider_type = settings.provider_type.lower()
+    if provider_type == "synthetic":
+        return SyntheticProvider(
+            latency_median=settings.synthetic_latency_median,
+            latency_sigma=settings.synthetic_latency_sigma,
+            latency_per_char=settings.synthetic_latency_per_char,
+            error_rate=settings.synthetic_error_rate,
+            max_batch_size=settings.synthetic_max_batch_size,
+            max_concurrency=settings.deepl_max_concurrency,
+            scheduler=_create_scheduler(),
+            seed=settings.synthetic_seed,
+        )
+    if provider_type == REPLAY:
+        return RecordReplayProvider(
+            settings.recording_path, mode=REPLAY, speed=settings.replay_speed
+        )
+
+    provider = DeepLProvider(
+        api_url=settings.deepl_api_url,
+        api_key=settings.deepl_api_key,
+        max_concurrency=settings.deepl_max_concurrency,
+        scheduler=_create_scheduler(),
+        warm_connections=settings.deepl_warm_connections,
+        max_chunk_chars=settings.deepl_max_chunk_chars,
+    )
+    if provider_type == RECORD:
+        return RecordReplayProvider(
+            settings.recording_path, mode=RECORD, provider=provider
+        )
+    return provider
+
+
+def _create_scheduler() -> PriorityScheduler:
+    """Create the provider scheduler based on configuration."""
+    return PriorityScheduler(
+        max_concurrency=settings.deepl_max_concurrency,
+        classes=[
+            TrafficClass(
+                INTERACTIVE,
+                weight=settings.interactive_weight,
+                max_concurrency=settings.interactive_max_concurrency,
+                rate_limit=settings.interactive_rate_limit,
+            ),
+            TrafficClass(
+                BULK,
+                weight=settings.bulk_weight,
+                max_concurrency=settings.bulk_max_concurrency,
+                rate_limit=settings.bulk_rate_limit,
+            ),
+        ],
+    )
+
+
+def configure_observability() -> None:
+    """Configure logging, tracing and event loop monitoring."""
+    configure_logging(
+        level=settings.log_level,
+        json_output=settings.log_format == "json",
+        rate_limit=settings.log_rate_limit,
+        sample_rate=settings.log_sample_rate,
+    )
+    tracer.configure(
+        sample_rate=settings.tracing_sample_rate, exporter=_create_span_exporter()
+    )
+    loop_monitor.configure(
+        interval=settings.loop_monitor_interval,
+        block_threshold=settings.loop_block_threshold,
+    )
+
+
+def create_service() -> TranslationService:
+    """
+    Build the translation service with its cache and provider.
+
+    Connections are not opened here; call TranslationService.start.
+
+    Returns:
+        TranslationService instance
+    """
+    return TranslationService(
+        provider=_create_provider(),
+        cache=_create_cache(),
+        admission=AdmissionController(
+            max_queued=settings.admission_max_queued,
+            max_queue_wait=settings.admission_max_queue_wait,
+            concurrency=settings.deepl_max_concurrency,
+        ),
+        analytics=CacheAnalytics() if settings.cache_analytics_enabled else None,
+        language_index=(
+            DetectedLanguageIndex(settings.detected_language_index_size)
+            if settings.detected_language_index_size > 0
+            else None
+        ),
+        translation_memory=(
+            TranslationMemory(
+                max_entries=settings.translation_memory_size,
+                threshold=settings.translation_memory_threshold,
+            )
+            if settings.translation_memory_size > 0
+            else None
+        ),
+    )
 
 
-def get_translation_service() -> TranslationService:
+def create_batcher(service: TranslationService) -> MicroBatcher:
+    """
+    Build the batcher shared by WebSocket translation sessions.
+
+    Args:
+        service: Service translating the batches
+
+    Returns:
+        MicroBatcher instance
+    """
+    return MicroBatcher(
+        service,
+        max_batch_size=settings.websocket_batch_size,
+        max_delay=settings.websocket_batch_delay,
+    )
+
+
+def get_translation_service(request: Request) -> TranslationService:
     """
     Dependency for getting the translation service instance.
 
+    The service is created at application startup (see the lifespan in
+    app.api.main).
+
     Returns:
         TranslationService instance
     """
-    return _service
+    return request.app.state.service
 
 
+# Endpoint parameter resolving to the shared translation service
+TranslationServiceDep = Annotated[TranslationService, Depends(get_translation_service)]
+
+
+def get_micro_batcher(websocket: WebSocket) -> MicroBatcher:
+    """
+    Dependency for getting the batcher of WebSocket translation sessions.
+
+    The batcher is created at application startup (see the lifespan in
+    app.api.main).
+
+    Returns:
+        MicroBatcher instance
+    """
+    return websocket.app.state.batcher
+
+
+# WebSocket parameter resolving to the shared micro-batcher
+MicroBatcherDep = Annotated[MicroBatcher, Depends(get_micro_batcher)]
+
+
+def get_traffic_class(default: str):
+    """
+    Build a dependency resolving the traffic class of a request.
+
+    The class is taken from the ``X-Traffic-Class`` header, falling back to
+    the endpoint default. Any caller may demote a request to bulk, but
+    promoting a bulk route to interactive requires an
+    ``X-Traffic-Class-Token`` header matching TRAFFIC_CLASS_TOKEN, so that
+    anonymous clients cannot jump the queue of user-facing requests.
+
+    Args:
+        default: Traffic class used when the header is absent
+
+    Returns:
+        Dependency callable returning the traffic class name
+    """
+
+    async def dependency(
+        x_traffic_class: str | None = Header(default=None),
+        x_traffic_class_token: str | None = Header(default=None),
+    ) -> str:
+        name = (x_traffic_class or default).lower()
+        if name not in (INTERACTIVE, BULK):
+            raise HTTPException(
+                status_code=400, detail=f"Unknown traffic class '{name}'"
+            )
+        promoted = name == INTERACTIVE and default != INTERACTIVE
+        if promoted and (
+            not settings.traffic_class_token
+            or x_traffic_class_token is None
+            or not secrets.compare_digest(
+                x_traffic_class_token, settings.traffic_class_token
+            )
+        ):
+            raise HTTPException(status_code=403, detail="Invalid traffic class token")
+        return name
+
+    return dependency
+
+
+def get_request_timeout(default: str):
+    """
+    Build a dependency resolving the deadline of a request.
+
+    The deadline is taken from the ``X-Request-Timeout`` header (seconds),
+    capped at MAX_REQUEST_TIMEOUT, falling back to the configured deadline
+    of the endpoint's traffic class.
+
+    Args:
+        default: Traffic class whose configured deadline is the default
+
+    Returns:
+        Dependency callable returning the deadline in seconds
+    """
+
+    async def dependency(
+        x_request_timeout: str | None = Header(default=None),
+    ) -> float:
+        if x_request_timeout is None:
+            if default == INTERACTIVE:
+                return settings.interactive_request_timeout
+            return settings.bulk_request_timeout
+        try:
+            seconds = float(x_request_timeout)
+        except ValueError:
+            seconds = math.nan
+        if not seconds > 0:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid request timeout '{x_request_timeout}'",
+            )
+        return min(seconds, settings.max_request_timeout)
+
+    return dependency
+
+
+async def require_admin(x_admin_token: str | None = Header(default=None)) -> None:
+    """
+    Dependency guarding admin endpoints.
+
+    Admin endpoints are hidden (404) unless ADMIN_TOKEN is configured, and
+    require a matching ``X-Admin-Token`` header.
+
+    Raises:
+        HTTPException: If admin endpoints are disabled or the token is wrong
+    """
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not secrets.compare_digest(
+        x_admin_token, settings.admin_token
+    ):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+async def require_peer(x_peer_token: str | None = Header(default=None)) -> None:
+    """
+    Dependency guarding the internal peer cache endpoints.
+
+    Internal endpoints are hidden (404) unless CACHE_PEER_TOKEN is
+    configured, and require a matching ``X-Peer-Token`` header.
+
+    Raises:
+        HTTPException: If internal endpoints are disabled or the token is wrong
+    """
+    if not settings.cache_peer_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_peer_token is None or not secrets.compare_digest(
+        x_peer_token, settings.cache_peer_token
+    ):
+        raise HTTPException(status_code=403, detail="Invalid peer token")
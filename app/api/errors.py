@@ -0,0 +1,32 @@
+from fastapi import HTTPException
+
+from app.core.admission import OverloadedError
+from app.core.deadline import DeadlineExceededError
+from app.core.providers.record_replay import UnrecordedTextError
+
+
+def translation_error(error: Exception) -> HTTPException:
+    """
+    Map a translation failure to the HTTP error answered for it.
+
+    Args:
+        error: Exception raised while translating
+
+    Returns:
+        HTTP error with the status code and detail of the failure
+    """
+    if isinstance(error, HTTPException):
+        return error
+    if isinstance(error, ValueError):
+        return HTTPException(status_code=400, detail=str(error))
+    if isinstance(error, UnrecordedTextError):
+        return HTTPException(status_code=422, detail=str(error))
+    if isinstance(error, OverloadedError):
+        return HTTPException(
+            status_code=503,
+            detail=str(error),
+            headers={"Retry-After": error.retry_after_header},
+        )
+    if isinstance(error, DeadlineExceededError):
+        return HTTPException(status_code=504, detail=str(error))
+    return HTTPException(status_code=500, detail=f"Translation failed: {error}")
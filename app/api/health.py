@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from app.api.schemas import HealthResponse
+from app.core.lifecycle import lifecycle
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live", response_model=HealthResponse)
+async def live():
+    """
+    Liveness probe.
+
+    Succeeds as long as the worker's event loop is serving requests.
+    """
+    return HealthResponse(status="ok")
+
+
+@router.get(
+    "/ready",
+    response_model=HealthResponse,
+    responses={503: {"model": HealthResponse}},
+)
+async def ready(request: Request):
+    """
+    Readiness probe.
+
+    Fails (503) until startup has finished and while the worker drains on
+    shutdown. Cache reachability is reported in the checks but does not
+    fail the probe: lookups degrade to misses, so the worker still serves.
+    """
+    checks = {"started": lifecycle.ready, "cache": False}
+    service = getattr(request.app.state, "service", None)
+    if lifecycle.ready and service is not None:
+        checks["cache"] = await service.ready()
+
+    if lifecycle.ready:
+        status = "ok" if checks["cache"] else "degraded"
+        return HealthResponse(status=status, checks=checks)
+    status = "draining" if lifecycle.draining else "unavailable"
+    return JSONResponse(
+        status_code=503,
+        content=HealthResponse(status=status, checks=checks).model_dump(),
+    )
@@ -0,0 +1,82 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.dependencies import TranslationServiceDep, require_peer
+from app.api.schemas import (
+    PeerClearRequest,
+    PeerKeysRequest,
+    PeerResultsResponse,
+    PeerSetRequest,
+)
+from app.core.cache.base import CacheScope
+from app.core.cache.peer import PeerTranslationCache
+
+router = APIRouter(
+    prefix="/internal/cache",
+    tags=["internal"],
+    dependencies=[Depends(require_peer)],
+    include_in_schema=False,
+)
+
+
+def get_peer_cache(service: TranslationServiceDep) -> PeerTranslationCache:
+    """
+    Dependency resolving the peer cache of this replica.
+
+    Raises:
+        HTTPException: If the replica does not run in peer cache mode
+    """
+    if not isinstance(service.cache, PeerTranslationCache):
+        raise HTTPException(status_code=404, detail="Not Found")
+    return service.cache
+
+
+# Endpoint parameter resolving to the peer cache of this replica
+PeerCacheDep = Annotated[PeerTranslationCache, Depends(get_peer_cache)]
+
+
+@router.post("/get", response_model=PeerResultsResponse)
+async def get_keys(request: PeerKeysRequest, cache: PeerCacheDep):
+    """Read keys owned by this replica."""
+    return PeerResultsResponse(results=await cache.local.get_many(request.keys))
+
+
+@router.post("/set", response_model=PeerResultsResponse)
+async def set_keys(request: PeerSetRequest, cache: PeerCacheDep):
+    """Store translations of keys owned by this replica."""
+    await cache.local.set_many(request.items)
+    return PeerResultsResponse(results=[None] * len(request.items))
+
+
+@router.post("/acquire", response_model=PeerResultsResponse)
+async def acquire_leases(request: PeerKeysRequest, cache: PeerCacheDep):
+    """Grant fetch leases on keys owned by this replica."""
+    return PeerResultsResponse(
+        results=await cache.serve_acquire(request.keys, request.holder)
+    )
+
+
+@router.post("/release", response_model=PeerResultsResponse)
+async def release_leases(request: PeerKeysRequest, cache: PeerCacheDep):
+    """Release fetch leases on keys owned by this replica."""
+    await cache.serve_release(request.keys, request.holder)
+    return PeerResultsResponse(results=[None] * len(request.keys))
+
+
+@router.post("/wait", response_model=PeerResultsResponse)
+async def wait_for_keys(request: PeerKeysRequest, cache: PeerCacheDep):
+    """Wait for leased keys owned by this replica to be filled."""
+    return PeerResultsResponse(
+        results=await cache.serve_wait(request.keys, request.timeout)
+    )
+
+
+@router.post("/clear", response_model=PeerResultsResponse)
+async def clear_local(request: PeerClearRequest, cache: PeerCacheDep):
+    """Clear translations stored on this replica."""
+    scope = None
+    if request.source_language or request.target_language:
+        scope = CacheScope(request.source_language, request.target_language)
+    await cache.local.clear(scope)
+    return PeerResultsResponse(results=[])
@@ -1,12 +1,113 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
 
+from fastapi import FastAPI, Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.api.admin import router as admin_router
+from app.api.dependencies import (
+    configure_observability,
+    create_batcher,
+    create_service,
+)
+from app.api.health import router as health_router
+from app.api.internal import router as internal_router
+from app.api.streaming import router as streaming_router
 from app.api.translation import router as translation_router
+from app.core.config import settings
+from app.core.lifecycle import lifecycle
+from app.core.log import shutdown_logging
+from app.core.loop_monitor import loop_monitor
+from app.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start up and shut down the worker.
+
+    Startup opens and checks the cache connections and warms the DeepL
+    connection pool before the worker reports ready. SIGTERM stops reporting
+    ready while the server still listens; shutdown then drains in-flight
+    requests and closes connections, also when startup fails.
+    """
+    configure_observability()
+    if settings.loop_monitor_enabled:
+        loop_monitor.start()
+    try:
+        service = create_service()
+        app.state.service = service
+        app.state.batcher = create_batcher(service)
+        try:
+            await service.start()
+            lifecycle.mark_ready()
+            logger.info("Translator API is ready")
+            with lifecycle.drain_on_signal(settings.shutdown_readiness_delay):
+                yield
+        finally:
+            await lifecycle.drain(settings.shutdown_drain_timeout)
+            await app.state.batcher.close()
+            await service.close()
+    finally:
+        await tracer.shutdown()
+        await loop_monitor.stop()
+        shutdown_logging()
+
 
 app = FastAPI(
     title="Translator API",
     description="A simple translation API service",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Include the API routers
 app.include_router(translation_router, prefix="/api/v1")
+app.include_router(streaming_router, prefix="/api/v1")
+app.include_router(admin_router, prefix="/api/v1")
+app.include_router(health_router, prefix="/api/v1")
+app.include_router(internal_router, prefix="/api/v1")
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """
+    Open the root span of each request.
+
+    Incoming W3C trace context is continued.
+    """
+    with tracer.start_trace(
+        f"{request.method} {request.url.path}",
+        request.headers.get("traceparent"),
+        **{"http.method": request.method, "http.target": request.url.path},
+    ) as span:
+        response = await call_next(request)
+        if span is not None:
+            span.set_attribute("http.status_code", response.status_code)
+        return response
+
+
+class TrackInFlightMiddleware:
+    """
+    Count HTTP requests and WebSocket sessions as in flight.
+
+    A plain ASGI middleware, so that a request is counted until its response
+    body is fully sent (including streamed responses) and WebSocket sessions
+    are counted until they close; shutdown drains both.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        with lifecycle.track():
+            await self.app(scope, receive, send)
+
+
+# Added last, so it wraps every other middleware
+app.add_middleware(TrackInFlightMiddleware)
@@ -1,4 +1,7 @@
-from pydantic import BaseModel, Field
+from collections.abc import Sequence
+from typing import Self
+
+from pydantic import BaseModel, Field, model_validator
 
 
 class LanguageResponse(BaseModel):
@@ -23,17 +26,158 @@ class TranslationResponse(BaseModel):
     translated_text: str
     source_language: str
     target_language: str
+    match_score: float | None = None
+
+
+class BatchTranslationItem(BaseModel):
+    """Batch item with its own language pair."""
+
+    text: str = Field(..., description="Text to translate")
+    source_language: str | None = Field(
+        default=None, description="Source language code (default: batch source)"
+    )
+    target_language: str | None = Field(
+        default=None, description="Target language code (default: batch target)"
+    )
 
 
 class BatchTranslationRequest(BaseModel):
     """Batch translation request."""
 
-    texts: list[str] = Field(..., description="List of texts to translate")
+    texts: list[str] = Field(
+        default_factory=list, description="List of texts to translate"
+    )
+    items: list[BatchTranslationItem] = Field(
+        default_factory=list,
+        description="Texts with per-item language pairs, translated after texts",
+    )
     source_language: str = Field(default="AUTO", description="Source language code")
     target_language: str = Field(default="EN", description="Target language code")
 
+    @model_validator(mode="after")
+    def check_not_empty(self) -> Self:
+        """Reject batches without any text to translate."""
+        if not self.texts and not self.items:
+            raise ValueError("Batch needs at least one entry in texts or items")
+        return self
+
 
 class BatchTranslationResponse(BaseModel):
     """Batch translation response."""
 
     translations: list[TranslationResponse]
+
+
+class MultiTargetTranslationRequest(BaseModel):
+    """Translation request fanning out to several target languages."""
+
+    texts: list[str] = Field(..., description="List of texts to translate")
+    source_language: str = Field(default="AUTO", description="Source language code")
+    target_languages: list[str] = Field(
+        ..., description="Target language codes", min_length=1
+    )
+
+
+class MultiTargetTranslationResponse(BaseModel):
+    """Translations grouped by target language."""
+
+    translations: dict[str, list[TranslationResponse]]
+
+
+class StreamTranslationMessage(BaseModel):
+    """Translation request sent over the WebSocket."""
+
+    id: str | int = Field(..., description="Client id echoed in the reply")
+    text: str = Field(..., description="Text to translate", min_length=1)
+    source_language: str = Field(default="AUTO", description="Source language code")
+    target_language: str = Field(default="EN", description="Target language code")
+
+
+class StreamTranslationReply(BaseModel):
+    """Translation (or error) sent back over the WebSocket."""
+
+    id: str | int | None
+    original_text: str | None = None
+    translated_text: str | None = None
+    source_language: str | None = None
+    target_language: str | None = None
+    match_score: float | None = None
+    error: str | None = None
+    status: int = 200
+
+
+class LanguagePairStatsResponse(BaseModel):
+    """Cache statistics of one language pair."""
+
+    source_language: str
+    target_language: str
+    hits: int
+    misses: int
+    hit_ratio: float
+    characters_saved: int
+
+
+class HotKeyResponse(BaseModel):
+    """A frequently requested cache key."""
+
+    key: str
+    text_preview: str
+    source_language: str
+    target_language: str
+    count: int
+
+
+class CacheStatsResponse(BaseModel):
+    """Cache analytics report."""
+
+    lookups: int
+    hit_ratio: float
+    characters_saved: int
+    working_set_estimate: int
+    language_pairs: list[LanguagePairStatsResponse]
+    hot_keys: list[HotKeyResponse]
+
+
+class LoopLagResponse(BaseModel):
+    """Event loop lag of this worker."""
+
+    running: bool
+    lag_ms: float
+    mean_lag_ms: float
+    p99_lag_ms: float
+    max_lag_ms: float
+    blocked_events: int
+
+
+class HealthResponse(BaseModel):
+    """Health probe result."""
+
+    status: str
+    checks: dict[str, bool] = Field(default_factory=dict)
+
+
+class PeerKeysRequest(BaseModel):
+    """Keys sent to the replica owning them."""
+
+    keys: list[str]
+    holder: str = ""
+    timeout: float = Field(default=0.0, ge=0, le=60)
+
+
+class PeerSetRequest(BaseModel):
+    """Translations sent to the replica owning their keys."""
+
+    items: dict[str, str]
+
+
+class PeerClearRequest(BaseModel):
+    """Scope of translations to clear on a peer."""
+
+    source_language: str | None = None
+    target_language: str | None = None
+
+
+class PeerResultsResponse(BaseModel):
+    """Per-key results of an internal cache operation."""
+
+    results: Sequence[str | bool | None]
@@ -0,0 +1,320 @@
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from app.api.dependencies import (
+    MicroBatcherDep,
+    TranslationServiceDep,
+    get_request_timeout,
+    get_traffic_class,
+)
+from app.api.errors import translation_error
+from app.api.schemas import (
+    BatchTranslationItem,
+    StreamTranslationMessage,
+    StreamTranslationReply,
+    TranslationResponse,
+)
+from app.core.config import settings
+from app.core.deadline import remaining, run_with_deadline, use_deadline
+from app.core.models import TranslationItem, TranslationResult
+from app.core.scheduler import BULK, use_traffic_class
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/translate", tags=["translation"])
+
+
+def _error_status(error: Exception) -> tuple[int, str]:
+    """Map a translation failure to an HTTP status code and message."""
+    http_error = translation_error(error)
+    return http_error.status_code, http_error.detail
+
+
+def _error_reply(
+    message_id: str | int | None, error: Exception
+) -> StreamTranslationReply:
+    """Map a translation failure to the reply sent to the client."""
+    status, detail = _error_status(error)
+    return StreamTranslationReply(id=message_id, error=detail, status=status)
+
+
+@router.websocket("/ws")
+async def translate_stream(
+    websocket: WebSocket,
+    batcher: MicroBatcherDep,
+):
+    """
+    Translate messages over a long-lived WebSocket connection.
+
+    Each message is a JSON object with an **id**, **text**,
+    **source_language** (default: AUTO) and **target_language** (default:
+    EN). Replies echo the id and arrive as soon as their translation is done,
+    so they may come out of order; failed messages get a reply with **error**
+    and an HTTP-like **status**. Messages from all connections are batched
+    together before they reach the provider. A connection with too many
+    untranslated messages is not read from until replies catch up.
+    """
+    await websocket.accept()
+    in_flight = asyncio.Semaphore(settings.websocket_max_in_flight)
+    send_lock = asyncio.Lock()
+    tasks: set[asyncio.Task] = set()
+
+    async def reply(payload: StreamTranslationReply) -> None:
+        async with send_lock:
+            await websocket.send_json(payload.model_dump(exclude_none=True))
+
+    async def handle(message: StreamTranslationMessage) -> None:
+        try:
+            result = await run_with_deadline(
+                batcher.translate(
+                    TranslationItem(
+                        message.text,
+                        message.source_language,
+                        message.target_language,
+                    )
+                ),
+                settings.interactive_request_timeout,
+            )
+            payload = StreamTranslationReply(
+                id=message.id,
+                original_text=result.original_text,
+                translated_text=result.translated_text,
+                source_language=result.source_language,
+                target_language=result.target_language,
+                match_score=result.match_score,
+            )
+        except Exception as e:
+            payload = _error_reply(message.id, e)
+            if payload.status == 500:
+                logger.exception(f"Streamed translation {message.id!r} failed")
+        finally:
+            in_flight.release()
+        try:
+            await reply(payload)
+        except (WebSocketDisconnect, RuntimeError):
+            # The client went away; the receive loop cleans up
+            pass
+
+    try:
+        while True:
+            # Stop reading while the connection has too much work in flight
+            await in_flight.acquire()
+            raw = await websocket.receive_text()
+            try:
+                message = StreamTranslationMessage.model_validate_json(raw)
+            except ValidationError as e:
+                in_flight.release()
+                problems = "; ".join(
+                    f"{'.'.join(map(str, error['loc'])) or 'message'}: {error['msg']}"
+                    for error in e.errors()
+                )
+                await reply(
+                    StreamTranslationReply(
+                        id=None, error=f"Invalid message: {problems}", status=422
+                    )
+                )
+                continue
+            task = asyncio.create_task(handle(message))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except WebSocketDisconnect:
+        logger.debug("WebSocket closed with %d messages in flight", len(tasks))
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _read_lines(
+    request: Request, max_bytes: int, max_line_bytes: int
+) -> AsyncIterator[bytes]:
+    """
+    Split a request body into lines while it is uploading.
+
+    Only newly received data is searched for line breaks, so long lines
+    arriving in many small pieces are not rescanned.
+
+    Args:
+        request: Incoming HTTP request
+        max_bytes: Maximum body size
+        max_line_bytes: Maximum size of one line
+
+    Yields:
+        Non-empty lines without their line break
+
+    Raises:
+        HTTPException: 413 if the body is larger than max_bytes or a line is
+            larger than max_line_bytes
+    """
+    received = 0
+    buffer = bytearray()
+    async for data in request.stream():
+        received += len(data)
+        if received > max_bytes:
+            raise HTTPException(
+                status_code=413, detail=f"Request body exceeds {max_bytes} bytes"
+            )
+        offset = len(buffer)
+        buffer += data
+        start = 0
+        while (end := buffer.find(b"\n", offset)) != -1:
+            _check_line_size(end - start, max_line_bytes)
+            line = bytes(buffer[start:end])
+            if line.strip():
+                yield line
+            start = offset = end + 1
+        del buffer[:start]
+        _check_line_size(len(buffer), max_line_bytes)
+    if buffer.strip():
+        yield bytes(buffer)
+
+
+def _check_line_size(size: int, max_line_bytes: int) -> None:
+    """Reject an NDJSON line larger than max_line_bytes."""
+    if size > max_line_bytes:
+        raise HTTPException(
+            status_code=413, detail=f"Line exceeds {max_line_bytes} bytes"
+        )
+
+
+def _parse_item(
+    line: bytes, number: int, source_language: str, target_language: str
+) -> TranslationItem:
+    """
+    Validate one line of an NDJSON batch.
+
+    Args:
+        line: JSON text: a string, or an object like BatchTranslationItem
+        number: Line number for error messages
+        source_language: Source language of items without their own
+        target_language: Target language of items without their own
+
+    Returns:
+        Item to translate
+
+    Raises:
+        HTTPException: 400 if the line is not a valid item
+    """
+    try:
+        value = json.loads(line)
+        if isinstance(value, str):
+            item = BatchTranslationItem(text=value)
+        else:
+            item = BatchTranslationItem.model_validate(value)
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(
+            status_code=400, detail=f"Invalid item on line {number}"
+        ) from e
+    return TranslationItem(
+        item.text,
+        item.source_language or source_language,
+        item.target_language or target_language,
+    )
+
+
+@router.post("/batch/stream")
+async def translate_batch_stream(
+    http_request: Request,
+    service: TranslationServiceDep,
+    source_language: str = "AUTO",
+    target_language: str = "EN",
+    traffic_class: str = Depends(get_traffic_class(BULK)),
+    timeout: float = Depends(get_request_timeout(BULK)),
+):
+    """
+    Translate a large batch sent as newline-delimited JSON.
+
+    Each line of the body is a text (a JSON string) or an object with
+    **text** and optional **source_language** / **target_language**;
+    the query parameters give the defaults. Lines are validated as they
+    arrive and translated in chunks while the rest of the body is still
+    uploading. The response streams one TranslationResponse per line, in
+    input order; a translation failure after the response has started ends
+    it with an ``{"error": ..., "status": ...}`` line.
+
+    Bodies above STREAM_MAX_BYTES or STREAM_MAX_ITEMS lines are rejected
+    with 413.
+    """
+    chunks: list[asyncio.Task[list[TranslationResult]]] = []
+
+    def start_chunk(items: list[TranslationItem]) -> None:
+        chunks.append(
+            asyncio.create_task(
+                run_with_deadline(service.translate_items(items), remaining())
+            )
+        )
+
+    try:
+        with use_traffic_class(traffic_class), use_deadline(timeout):
+            items: list[TranslationItem] = []
+            count = 0
+            async for line in _read_lines(
+                http_request, settings.stream_max_bytes, settings.stream_max_line_bytes
+            ):
+                count += 1
+                if count > settings.stream_max_items:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Batch exceeds {settings.stream_max_items} items",
+                    )
+                items.append(_parse_item(line, count, source_language, target_language))
+                if len(items) < settings.stream_chunk_size:
+                    continue
+                start_chunk(items)
+                items = []
+                # Stop reading the body while enough chunks are in flight
+                running = [chunk for chunk in chunks if not chunk.done()]
+                if len(running) >= settings.stream_max_chunks_in_flight:
+                    await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for chunk in chunks:
+                    if chunk.done() and (error := chunk.exception()) is not None:
+                        raise error
+            if items:
+                start_chunk(items)
+    except HTTPException:
+        for chunk in chunks:
+            chunk.cancel()
+        raise
+    except Exception as e:
+        for chunk in chunks:
+            chunk.cancel()
+        raise translation_error(e) from e
+
+    async def results() -> AsyncIterator[str]:
+        try:
+            for chunk in chunks:
+                try:
+                    translated = await chunk
+                except Exception as e:
+                    status, detail = _error_status(e)
+                    if status == 500:
+                        logger.exception("Streamed batch chunk failed")
+                    yield json.dumps({"error": detail, "status": status}) + "\n"
+                    return
+                for result in translated:
+                    response = TranslationResponse(
+                        original_text=result.original_text,
+                        translated_text=result.translated_text,
+                        source_language=result.source_language,
+                        target_language=result.target_language,
+                        match_score=result.match_score,
+                    )
+                    yield response.model_dump_json() + "\n"
+        finally:
+            # The client may disconnect before reading everything
+            for chunk in chunks:
+                chunk.cancel()
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
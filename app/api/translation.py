@@ -1,21 +1,89 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from collections.abc import Awaitable
 
-from app.api.dependencies import get_translation_service
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from app.api.dependencies import (
+    TranslationServiceDep,
+    get_request_timeout,
+    get_traffic_class,
+)
+from app.api.errors import translation_error
 from app.api.schemas import (
     BatchTranslationRequest,
     BatchTranslationResponse,
     LanguageResponse,
+    MultiTargetTranslationRequest,
+    MultiTargetTranslationResponse,
     TranslationRequest,
     TranslationResponse,
 )
-from app.core.service import TranslationService
+from app.core.deadline import run_with_deadline
+from app.core.models import TranslationItem
+from app.core.scheduler import BULK, INTERACTIVE, use_traffic_class
+from app.core.tracing import tracer
 
 router = APIRouter(prefix="/translate", tags=["translation"])
 
+# How often a running translation checks whether its client is still there
+DISCONNECT_POLL_INTERVAL = 0.1
+
+# Non-standard status logged for requests abandoned by the client
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def _run_request[T](
+    http_request: Request, work: Awaitable[T], timeout: float
+) -> T:
+    """
+    Run the service work of a request under its deadline.
+
+    The work runs in its own task, which is cancelled (together with the
+    provider calls it is waiting on) when the deadline passes or the client
+    disconnects.
+
+    Args:
+        http_request: Incoming HTTP request
+        work: Service coroutine producing the response data
+        timeout: Request deadline in seconds
+
+    Returns:
+        Result of the work
+
+    Raises:
+        HTTPException: 499 if the client disconnected
+        DeadlineExceededError: If the deadline passed
+    """
+    task = asyncio.ensure_future(run_with_deadline(work, timeout))
+    disconnected = False
+
+    async def watch() -> None:
+        nonlocal disconnected
+        while not task.done():
+            if await http_request.is_disconnected():
+                disconnected = True
+                task.cancel()
+                return
+            await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+
+    watcher = asyncio.create_task(watch())
+    try:
+        return await task
+    except asyncio.CancelledError:
+        current = asyncio.current_task()
+        if disconnected and current is not None and not current.cancelling():
+            raise HTTPException(
+                status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request"
+            )
+        raise
+    finally:
+        watcher.cancel()
+        task.cancel()
+
 
 @router.get("/languages", response_model=list[LanguageResponse])
 async def get_supported_languages(
-    service: TranslationService = Depends(get_translation_service),
+    service: TranslationServiceDep,
 ):
     """Get list of supported languages."""
     languages = service.get_supported_languages()
@@ -25,7 +93,10 @@ async def get_supported_languages(
 @router.post("/", response_model=TranslationResponse)
 async def translate(
     request: TranslationRequest,
-    service: TranslationService = Depends(get_translation_service),
+    http_request: Request,
+    service: TranslationServiceDep,
+    traffic_class: str = Depends(get_traffic_class(INTERACTIVE)),
+    timeout: float = Depends(get_request_timeout(INTERACTIVE)),
 ):
     """
     Translate a single text.
@@ -33,55 +104,138 @@ async def translate(
     - **text**: Text to translate
     - **source_language**: Source language code (default: AUTO)
     - **target_language**: Target language code (default: EN)
+
+    Runs in the interactive traffic class unless the ``X-Traffic-Class``
+    header says otherwise, with the interactive deadline unless the
+    ``X-Request-Timeout`` header sets another.
     """
     try:
-        result = await service.translate(
-            text=request.text,
-            source_language=request.source_language,
-            target_language=request.target_language,
-        )
-        return TranslationResponse(
-            original_text=result.original_text,
-            translated_text=result.translated_text,
-            source_language=result.source_language,
-            target_language=result.target_language,
-        )
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        with use_traffic_class(traffic_class):
+            result = await _run_request(
+                http_request,
+                service.translate(
+                    text=request.text,
+                    source_language=request.source_language,
+                    target_language=request.target_language,
+                ),
+                timeout,
+            )
+        with tracer.span("response.build"):
+            return TranslationResponse(
+                original_text=result.original_text,
+                translated_text=result.translated_text,
+                source_language=result.source_language,
+                target_language=result.target_language,
+                match_score=result.match_score,
+            )
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
+        raise translation_error(e) from e
 
 
 @router.post("/batch", response_model=BatchTranslationResponse)
 async def translate_batch(
     request: BatchTranslationRequest,
-    service: TranslationService = Depends(get_translation_service),
+    http_request: Request,
+    service: TranslationServiceDep,
+    traffic_class: str = Depends(get_traffic_class(BULK)),
+    timeout: float = Depends(get_request_timeout(BULK)),
 ):
     """
     Translate multiple texts in batch.
 
     - **texts**: List of texts to translate
+    - **items**: Texts with their own language pairs, translated after texts
     - **source_language**: Source language code (default: AUTO)
     - **target_language**: Target language code (default: EN)
+
+    Runs in the bulk traffic class unless the ``X-Traffic-Class`` header says
+    otherwise, with the bulk deadline unless the ``X-Request-Timeout`` header
+    sets another.
+    """
+    try:
+        items = [
+            TranslationItem(text, request.source_language, request.target_language)
+            for text in request.texts
+        ] + [
+            TranslationItem(
+                item.text,
+                item.source_language or request.source_language,
+                item.target_language or request.target_language,
+            )
+            for item in request.items
+        ]
+        with use_traffic_class(traffic_class):
+            results = await _run_request(
+                http_request, service.translate_items(items), timeout
+            )
+        with tracer.span("response.build", translations=len(results)):
+            return BatchTranslationResponse(
+                translations=[
+                    TranslationResponse(
+                        original_text=result.original_text,
+                        translated_text=result.translated_text,
+                        source_language=result.source_language,
+                        target_language=result.target_language,
+                        match_score=result.match_score,
+                    )
+                    for result in results
+                ]
+            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise translation_error(e) from e
+
+
+@router.post("/multi", response_model=MultiTargetTranslationResponse)
+async def translate_multi(
+    request: MultiTargetTranslationRequest,
+    http_request: Request,
+    service: TranslationServiceDep,
+    traffic_class: str = Depends(get_traffic_class(BULK)),
+    timeout: float = Depends(get_request_timeout(BULK)),
+):
+    """
+    Translate multiple texts into several target languages at once.
+
+    - **texts**: List of texts to translate
+    - **source_language**: Source language code (default: AUTO)
+    - **target_languages**: Target language codes
+
+    Runs in the bulk traffic class unless the ``X-Traffic-Class`` header says
+    otherwise, with the bulk deadline unless the ``X-Request-Timeout`` header
+    sets another.
     """
     try:
-        results = await service.translate_batch(
-            texts=request.texts,
-            source_language=request.source_language,
-            target_language=request.target_language,
-        )
-        return BatchTranslationResponse(
-            translations=[
-                TranslationResponse(
-                    original_text=result.original_text,
-                    translated_text=result.translated_text,
-                    source_language=result.source_language,
-                    target_language=result.target_language,
-                )
-                for result in results
-            ]
-        )
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        with use_traffic_class(traffic_class):
+            results = await _run_request(
+                http_request,
+                service.translate_multi(
+                    texts=request.texts,
+                    target_languages=request.target_languages,
+                    source_language=request.source_language,
+                ),
+                timeout,
+            )
+        with tracer.span("response.build"):
+            return MultiTargetTranslationResponse(
+                translations={
+                    target: [
+                        TranslationResponse(
+                            original_text=result.original_text,
+                            translated_text=result.translated_text,
+                            source_language=result.source_language,
+                            target_language=result.target_language,
+                            match_score=result.match_score,
+                        )
+                        for result in target_results
+                    ]
+                    for target, target_results in results.items()
+                }
+            )
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
+        raise translation_error(e) from e
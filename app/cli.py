@@ -0,0 +1,319 @@
+"""
+Translate a JSONL or CSV file offline with the configured cache and provider.
+
+Usage:
+    python -m app.cli INPUT OUTPUT [--target-language EN] [--source-language AUTO]
+        [--text-field text] [--batch-size 100] [--concurrency 8]
+        [--checkpoint FILE]
+
+Every input record is written to OUTPUT with a ``translated_text`` field
+added, in input order. JSONL lines are objects (or plain strings); CSV files
+need a header row. Records may carry their own ``source_language`` and
+``target_language``; records without the text field are skipped and counted
+with a warning. Progress is checkpointed after every written batch, so
+running the same command again after an interruption resumes where it
+stopped instead of translating (and paying for) finished rows again.
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import itertools
+import json
+import logging
+import os
+import sys
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from app.api.dependencies import create_service
+from app.core.admission import OverloadedError
+from app.core.config import settings
+from app.core.log import configure_logging
+from app.core.models import TranslationItem
+from app.core.scheduler import BULK, use_traffic_class
+from app.core.service import TranslationService
+
+logger = logging.getLogger(__name__)
+
+TRANSLATED_FIELD = "translated_text"
+
+
+@dataclass
+class Checkpoint:
+    """Progress of a run: input rows done and the output size they fill."""
+
+    rows: int = 0
+    offset: int = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "Checkpoint":
+        """
+        Read a checkpoint, or start from scratch if there is none.
+
+        Args:
+            path: Checkpoint file
+
+        Returns:
+            Checkpoint instance
+        """
+        if not path.exists():
+            return cls()
+        return cls(**json.loads(path.read_text()))
+
+    def save(self, path: Path) -> None:
+        """
+        Write the checkpoint atomically.
+
+        Args:
+            path: Checkpoint file
+        """
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(asdict(self)))
+        os.replace(tmp, path)
+
+
+def _file_format(path: Path, requested: str | None) -> str:
+    """Get the format of a file from the option or its extension."""
+    file_format = requested or path.suffix.lstrip(".").lower()
+    if file_format not in ("jsonl", "csv"):
+        raise ValueError(f"Cannot tell the format of '{path}'; pass --format")
+    return file_format
+
+
+def read_records(path: Path, file_format: str) -> Iterator[dict[str, Any]]:
+    """
+    Stream the records of an input file.
+
+    Args:
+        path: Input file
+        file_format: jsonl or csv
+
+    Yields:
+        Records as dictionaries
+    """
+    with path.open(encoding="utf-8", newline="") as f:
+        if file_format == "csv":
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield record if isinstance(record, dict) else {"text": record}
+
+
+class OutputWriter:
+    """Appends records to the output file and tracks its size."""
+
+    def __init__(self, path: Path, file_format: str, offset: int):
+        """
+        Open the output, dropping anything written after the checkpoint.
+
+        Args:
+            path: Output file
+            file_format: jsonl or csv
+            offset: Output size at the checkpoint
+        """
+        self.file_format = file_format
+        self._fieldnames: list[str] | None = None
+        self._file: BinaryIO = path.open("r+b" if offset else "wb")
+        self._file.truncate(offset)
+        self._file.seek(offset)
+        self._write_header = offset == 0
+
+    @property
+    def offset(self) -> int:
+        """Bytes written so far."""
+        return self._file.tell()
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        """
+        Write records and flush them to disk.
+
+        Args:
+            records: Records with their translation
+        """
+        if self.file_format == "jsonl":
+            data = "".join(
+                json.dumps(record, ensure_ascii=False) + "\n" for record in records
+            )
+        else:
+            buffer = io.StringIO()
+            if self._fieldnames is None:
+                self._fieldnames = list(records[0])
+            writer = csv.DictWriter(buffer, self._fieldnames, extrasaction="ignore")
+            if self._write_header:
+                writer.writeheader()
+                self._write_header = False
+            writer.writerows(records)
+            data = buffer.getvalue()
+        self._file.write(data.encode())
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Close the output file."""
+        self._file.close()
+
+
+async def translate_records(
+    service: TranslationService,
+    records: list[dict[str, Any]],
+    text_field: str,
+    source_language: str,
+    target_language: str,
+) -> list[dict[str, Any]]:
+    """
+    Translate a batch of records, waiting out load shedding.
+
+    Records without the text field are left out of the result.
+
+    Args:
+        service: Translation service
+        records: Input records
+        text_field: Field holding the text
+        source_language: Source language of records without their own
+        target_language: Target language of records without their own
+
+    Returns:
+        Records with the translated_text field added
+    """
+    present = [record for record in records if record.get(text_field) is not None]
+    if len(present) < len(records):
+        logger.warning(
+            "Skipping %d records without a %r field",
+            len(records) - len(present),
+            text_field,
+        )
+    records = present
+    if not records:
+        return []
+    items = [
+        TranslationItem(
+            str(record[text_field]),
+            record.get("source_language") or source_language,
+            record.get("target_language") or target_language,
+        )
+        for record in records
+    ]
+    while True:
+        try:
+            results = await service.translate_items(items)
+            break
+        except OverloadedError as e:
+            await asyncio.sleep(e.retry_after)
+    return [
+        {**record, TRANSLATED_FIELD: result.translated_text}
+        for record, result in zip(records, results)
+    ]
+
+
+async def run(args: argparse.Namespace) -> int:
+    """
+    Translate the input file, resuming from the checkpoint.
+
+    Args:
+        args: Parsed command line
+
+    Returns:
+        Number of rows translated by this run
+    """
+    source = Path(args.input)
+    target = Path(args.output)
+    checkpoint_path = Path(args.checkpoint or f"{args.output}.checkpoint")
+    input_format = _file_format(source, args.format)
+    output_format = _file_format(target, args.format)
+
+    checkpoint = Checkpoint.load(checkpoint_path)
+    if checkpoint.rows:
+        logger.info("Resuming after %d rows", checkpoint.rows)
+    records = itertools.islice(
+        read_records(source, input_format), checkpoint.rows, None
+    )
+
+    service = create_service()
+    await service.start()
+    writer = OutputWriter(target, output_format, checkpoint.offset)
+    # Input rows of every batch with the task translating it
+    pending: deque[tuple[int, asyncio.Task]] = deque()
+    translated = skipped = 0
+
+    async def write_next() -> None:
+        nonlocal translated, skipped
+        rows, task = pending.popleft()
+        batch = await task
+        if batch:
+            writer.write(batch)
+        translated += len(batch)
+        skipped += rows - len(batch)
+        checkpoint.rows += rows
+        checkpoint.offset = writer.offset
+        checkpoint.save(checkpoint_path)
+        logger.info("%d rows translated", checkpoint.rows)
+
+    try:
+        with use_traffic_class(BULK):
+            for batch in itertools.batched(records, args.batch_size):
+                task = asyncio.create_task(
+                    translate_records(
+                        service,
+                        list(batch),
+                        args.text_field,
+                        args.source_language,
+                        args.target_language,
+                    )
+                )
+                pending.append((len(batch), task))
+                # Batches finish out of order but are written in order
+                if len(pending) >= args.concurrency:
+                    await write_next()
+            while pending:
+                await write_next()
+    finally:
+        for _, task in pending:
+            task.cancel()
+        writer.close()
+        await service.close()
+    if skipped:
+        logger.warning("Skipped %d rows without a %r field", skipped, args.text_field)
+    return translated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", help="JSONL or CSV file to translate")
+    parser.add_argument("output", help="File the translated records go to")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None)
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--source-language", default="AUTO")
+    parser.add_argument("--target-language", default="EN")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--checkpoint", help="Progress file (default: OUTPUT.checkpoint)"
+    )
+    args = parser.parse_args()
+    configure_logging(
+        level=settings.log_level,
+        json_output=settings.log_format == "json",
+        rate_limit=settings.log_rate_limit,
+        sample_rate=settings.log_sample_rate,
+    )
+
+    try:
+        translated = asyncio.run(run(args))
+    except KeyboardInterrupt:
+        sys.exit("Interrupted; run the same command again to resume")
+    except Exception:
+        logger.exception("Translation failed")
+        sys.exit("Run the same command again to resume")
+    logger.info("Translated %d rows into %s", translated, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from typing import Any, Self
+
+import httpx
+
+from app.api.schemas import (
+    BatchTranslationItem,
+    BatchTranslationRequest,
+    BatchTranslationResponse,
+    LanguageResponse,
+    TranslationResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/v1/translate"
+
+_Key = tuple[str, str, str]
+
+
+class TranslatorClientError(Exception):
+    """Raised when the Translator API rejects or fails a request."""
+
+    def __init__(self, status_code: int, detail: str):
+        """
+        Initialize the error.
+
+        Args:
+            status_code: HTTP status code returned by the API
+            detail: Error detail returned by the API
+        """
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class TranslatorClient:
+    """
+    Async client of the Translator API.
+
+    Requests share one pooled HTTP client. Concurrent ``translate`` calls
+    are coalesced into ``/translate/batch`` requests (one per language pair)
+    after waiting up to batch_delay for company, and recent results are kept
+    in a small LRU so repeated texts are answered locally. Use it as an async
+    context manager, or call ``aclose`` when done.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 30.0,
+        max_connections: int = 20,
+        max_batch_size: int = 100,
+        batch_delay: float = 0.005,
+        cache_size: int = 1024,
+        headers: dict[str, str] | None = None,
+        traffic_class_token: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            base_url: Base URL of the API, e.g. http://translator:8000
+            timeout: Request timeout in seconds (default: 30)
+            max_connections: Size of the connection pool (default: 20)
+            max_batch_size: Texts that trigger a batch request immediately
+                (default: 100)
+            batch_delay: Seconds a translate call waits for others to batch
+                with (default: 0.005)
+            cache_size: Results kept in the local LRU; 0 disables it
+                (default: 1024)
+            headers: Headers sent with every request
+            traffic_class_token: TRAFFIC_CLASS_TOKEN of the API; coalesced
+                translate calls are sent as interactive traffic with it, and
+                as bulk traffic without it
+            transport: HTTP transport (default: network transport)
+        """
+        self.max_batch_size = max_batch_size
+        self.batch_delay = batch_delay
+        self.cache_size = cache_size
+        self.traffic_class_token = traffic_class_token
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            headers=headers,
+            limits=httpx.Limits(max_connections=max_connections),
+            transport=transport,
+        )
+        self._cache: OrderedDict[_Key, TranslationResponse] = OrderedDict()
+        self._pending: dict[_Key, asyncio.Future] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Send pending translations and close the connection pool."""
+        self._flush()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        await self._http.aclose()
+
+    async def translate(
+        self,
+        text: str,
+        source_language: str = "AUTO",
+        target_language: str = "EN",
+    ) -> TranslationResponse:
+        """
+        Translate a single text, batched with concurrent calls.
+
+        Args:
+            text: Text to translate
+            source_language: Source language code (default: AUTO)
+            target_language: Target language code (default: EN)
+
+        Returns:
+            Translation
+
+        Raises:
+            TranslatorClientError: If the API returns an error
+            httpx.HTTPError: If the API cannot be reached
+        """
+        key = (text, source_language.upper(), target_language.upper())
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.batch_delay, self._flush)
+        # Callers of the same text share one future
+        return await asyncio.shield(future)
+
+    async def translate_batch(
+        self,
+        texts: list[str],
+        source_language: str = "AUTO",
+        target_language: str = "EN",
+    ) -> list[TranslationResponse]:
+        """
+        Translate several texts in one request.
+
+        Args:
+            texts: Texts to translate
+            source_language: Source language code (default: AUTO)
+            target_language: Target language code (default: EN)
+
+        Returns:
+            Translations in the order of texts
+
+        Raises:
+            TranslatorClientError: If the API returns an error
+            httpx.HTTPError: If the API cannot be reached
+        """
+        if not texts:
+            return []
+        request = BatchTranslationRequest(
+            texts=texts,
+            source_language=source_language,
+            target_language=target_language,
+        )
+        translations = await self._post_batch(request)
+        source, target = source_language.upper(), target_language.upper()
+        for text, translation in zip(texts, translations):
+            self._cache_put((text, source, target), translation)
+        return translations
+
+    async def translate_stream(
+        self,
+        texts: Iterable[str | BatchTranslationItem]
+        | AsyncIterable[str | BatchTranslationItem],
+        source_language: str = "AUTO",
+        target_language: str = "EN",
+    ) -> AsyncIterator[TranslationResponse]:
+        """
+        Translate a large batch with the streaming NDJSON endpoint.
+
+        Texts are uploaded as they are produced and translations are yielded
+        as they arrive, in input order, so neither side holds the whole batch.
+
+        Args:
+            texts: Texts, or items with their own language pair
+            source_language: Source language of plain texts (default: AUTO)
+            target_language: Target language of plain texts (default: EN)
+
+        Yields:
+            Translations in the order of texts
+
+        Raises:
+            TranslatorClientError: If the API returns an error
+            httpx.HTTPError: If the API cannot be reached
+        """
+
+        async def body() -> AsyncIterator[bytes]:
+            if isinstance(texts, AsyncIterable):
+                async for text in texts:
+                    yield _ndjson_line(text)
+            else:
+                for text in texts:
+                    yield _ndjson_line(text)
+
+        async with self._http.stream(
+            "POST",
+            f"{API_PREFIX}/batch/stream",
+            params={
+                "source_language": source_language,
+                "target_language": target_language,
+            },
+            content=body(),
+            headers={"Content-Type": "application/x-ndjson"},
+        ) as response:
+            if response.is_error:
+                await response.aread()
+                _raise_for_status(response)
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                if "error" in data:
+                    raise TranslatorClientError(data["status"], data["error"])
+                yield TranslationResponse.model_validate(data)
+
+    async def get_supported_languages(self) -> list[LanguageResponse]:
+        """
+        Get the languages supported by the API.
+
+        Returns:
+            Supported languages
+
+        Raises:
+            TranslatorClientError: If the API returns an error
+            httpx.HTTPError: If the API cannot be reached
+        """
+        response = await self._http.get(f"{API_PREFIX}/languages")
+        _raise_for_status(response)
+        return [LanguageResponse.model_validate(item) for item in response.json()]
+
+    def _flush(self) -> None:
+        """Send the pending translate calls as batch requests."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        pairs: dict[tuple[str, str], dict[_Key, asyncio.Future]] = {}
+        for key, future in pending.items():
+            pairs.setdefault(key[1:], {})[key] = future
+        for entries in pairs.values():
+            task = asyncio.create_task(self._send(entries))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _send(self, entries: dict[_Key, asyncio.Future]) -> None:
+        """Send the coalesced texts of one language pair."""
+        request = BatchTranslationRequest(
+            items=[
+                BatchTranslationItem(
+                    text=text, source_language=source, target_language=target
+                )
+                for text, source, target in entries
+            ]
+        )
+        headers = None
+        if self.traffic_class_token:
+            # The callers are waiting, unlike a real bulk request
+            headers = {
+                "X-Traffic-Class": "interactive",
+                "X-Traffic-Class-Token": self.traffic_class_token,
+            }
+        try:
+            translations = await self._post_batch(request, headers=headers)
+        except Exception as e:
+            logger.debug(
+                "Coalesced batch of %d texts failed", len(entries), exc_info=True
+            )
+            for future in entries.values():
+                future.set_exception(e)
+            return
+        for (key, future), translation in zip(entries.items(), translations):
+            self._cache_put(key, translation)
+            future.set_result(translation)
+
+    async def _post_batch(
+        self, request: BatchTranslationRequest, headers: dict[str, str] | None = None
+    ) -> list[TranslationResponse]:
+        """Send a request to the batch endpoint."""
+        response = await self._http.post(
+            f"{API_PREFIX}/batch",
+            content=request.model_dump_json(),
+            headers={"Content-Type": "application/json", **(headers or {})},
+        )
+        _raise_for_status(response)
+        return BatchTranslationResponse.model_validate_json(
+            response.content
+        ).translations
+
+    def _cache_get(self, key: _Key) -> TranslationResponse | None:
+        """Get a recent result and mark it as used."""
+        translation = self._cache.get(key)
+        if translation is not None:
+            self._cache.move_to_end(key)
+        return translation
+
+    def _cache_put(self, key: _Key, translation: TranslationResponse) -> None:
+        """Remember a result, evicting the least recently used."""
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = translation
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+def _ndjson_line(text: str | BatchTranslationItem) -> bytes:
+    """Encode a text or item as one NDJSON line."""
+    if isinstance(text, BatchTranslationItem):
+        return (text.model_dump_json(exclude_none=True) + "\n").encode()
+    return (json.dumps(text, ensure_ascii=False) + "\n").encode()
+
+
+def _raise_for_status(response: httpx.Response) -> None:
+    """Raise TranslatorClientError for an error response."""
+    if not response.is_error:
+        return
+    try:
+        detail: Any = response.json().get("detail", response.text)
+    except ValueError:
+        detail = response.text
+    raise TranslatorClientError(response.status_code, str(detail))
@@ -0,0 +1,136 @@
+import math
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from app.core.deadline import DeadlineExceededError, remaining
+
+
+class OverloadedError(Exception):
+    """Raised when provider work is shed because the service is overloaded."""
+
+    def __init__(self, message: str, retry_after: float):
+        """
+        Initialize the error.
+
+        Args:
+            message: Error message
+            retry_after: Suggested delay in seconds before retrying
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """Value for the HTTP ``Retry-After`` header (whole seconds)."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class AdmissionController:
+    """
+    Admission control for work that has to go to the translation provider.
+
+    Tracks the number of texts queued for or being translated by the provider
+    and an exponentially weighted moving average of how long one provider
+    call takes. New work is rejected when the queue is full or when its
+    estimated queueing delay exceeds the configured deadline. Work that is
+    fully served from cache never reaches the controller.
+    """
+
+    def __init__(
+        self,
+        max_queued: int = 1000,
+        max_queue_wait: float = 10.0,
+        concurrency: int = 10,
+        initial_latency: float = 0.5,
+        smoothing: float = 0.2,
+    ):
+        """
+        Initialize the admission controller.
+
+        Args:
+            max_queued: Maximum number of texts queued for the provider
+            max_queue_wait: Maximum estimated queueing delay in seconds
+            concurrency: Number of provider calls that run in parallel
+            initial_latency: Initial estimate of one provider call in seconds
+            smoothing: EWMA smoothing factor for latency samples
+        """
+        self.max_queued = max_queued
+        self.max_queue_wait = max_queue_wait
+        self.concurrency = concurrency
+        self.smoothing = smoothing
+        self._latency = initial_latency
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of texts currently queued for or running on the provider."""
+        return self._pending
+
+    @property
+    def latency(self) -> float:
+        """Current estimate of one provider call in seconds."""
+        return self._latency
+
+    def estimated_wait(self, items: int = 0) -> float:
+        """
+        Estimate how long new work would wait before it completes.
+
+        Args:
+            items: Number of texts the new work adds
+
+        Returns:
+            Estimated delay in seconds
+        """
+        rounds = math.ceil((self._pending + items) / self.concurrency)
+        return rounds * self._latency
+
+    @asynccontextmanager
+    async def admit(self, items: int) -> AsyncIterator[None]:
+        """
+        Admit provider work for the duration of the block.
+
+        Work is always admitted when nothing else is queued, so oversized
+        requests still make progress on an idle service.
+
+        Args:
+            items: Number of texts the work sends to the provider
+
+        Raises:
+            OverloadedError: If the work is shed
+            DeadlineExceededError: If the work would not finish before the
+                request deadline
+        """
+        if self._pending:
+            if self._pending + items > self.max_queued:
+                raise OverloadedError(
+                    "Translation queue is full", self.estimated_wait()
+                )
+            wait = self.estimated_wait(items)
+            if wait > self.max_queue_wait:
+                raise OverloadedError(
+                    f"Estimated queue wait {wait:.1f}s exceeds "
+                    f"{self.max_queue_wait:.1f}s",
+                    wait - self.max_queue_wait,
+                )
+            left = remaining()
+            if left is not None and wait > left:
+                raise DeadlineExceededError(
+                    f"Estimated queue wait {wait:.1f}s exceeds the request deadline"
+                )
+
+        # Work queued ahead of us is part of the measured duration
+        self._pending += items
+        queued = self._pending
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._pending -= items
+            self._observe(time.monotonic() - started, queued)
+
+    def _observe(self, elapsed: float, queued: int) -> None:
+        """Fold the duration of completed work into the latency estimate."""
+        rounds = max(1, math.ceil(queued / self.concurrency))
+        sample = elapsed / rounds
+        self._latency += self.smoothing * (sample - self._latency)
@@ -0,0 +1,308 @@
+import hashlib
+import math
+from dataclasses import dataclass
+
+# Language pairs beyond max_pairs are counted together under this pair
+OTHER_PAIR = ("*", "*")
+
+
+def _hash128(key: str) -> tuple[int, int]:
+    """Hash a key to two independent 64-bit integers."""
+    digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big")
+
+
+class CountMinSketch:
+    """Fixed-size frequency estimator that never underestimates."""
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        """
+        Initialize the sketch.
+
+        Args:
+            width: Counters per row (error ~ total / width)
+            depth: Number of rows (failure probability ~ e^-depth)
+        """
+        self.width = width
+        self.depth = depth
+        self._rows = [[0] * width for _ in range(depth)]
+
+    def _indexes(self, hashes: tuple[int, int]) -> list[int]:
+        h1, h2 = hashes
+        return [(h1 + row * h2) % self.width for row in range(self.depth)]
+
+    def add(self, hashes: tuple[int, int], count: int = 1) -> int:
+        """
+        Count a key and return its new estimate.
+
+        Args:
+            hashes: Key hashes from _hash128
+            count: Increment (default: 1)
+
+        Returns:
+            Estimated frequency of the key
+        """
+        estimate = None
+        for row, index in zip(self._rows, self._indexes(hashes)):
+            row[index] += count
+            estimate = row[index] if estimate is None else min(estimate, row[index])
+        return estimate or 0
+
+    def estimate(self, hashes: tuple[int, int]) -> int:
+        """
+        Estimate the frequency of a key.
+
+        Args:
+            hashes: Key hashes from _hash128
+
+        Returns:
+            Estimated frequency of the key
+        """
+        return min(row[index] for row, index in zip(self._rows, self._indexes(hashes)))
+
+
+class HyperLogLog:
+    """Fixed-size estimator of the number of distinct keys."""
+
+    def __init__(self, precision: int = 14):
+        """
+        Initialize the estimator.
+
+        Args:
+            precision: log2 of the number of registers (standard error is
+                about 1.04 / sqrt(2 ** precision), 0.8% for 14)
+        """
+        self.precision = precision
+        self._size = 1 << precision
+        self._registers = bytearray(self._size)
+
+    def add(self, hashes: tuple[int, int]) -> None:
+        """
+        Add a key.
+
+        Args:
+            hashes: Key hashes from _hash128
+        """
+        value = hashes[0]
+        index = value >> (64 - self.precision)
+        remaining = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        self._registers[index] = max(self._registers[index], rank)
+
+    def count(self) -> int:
+        """
+        Estimate the number of distinct keys added.
+
+        Returns:
+            Estimated cardinality
+        """
+        size = self._size
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0**-r for r in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            # Small range correction: linear counting
+            estimate = size * math.log(size / zeros)
+        return round(estimate)
+
+
+@dataclass
+class HotKey:
+    """A frequently requested cache key."""
+
+    key: str
+    text_preview: str
+    source_language: str
+    target_language: str
+    count: int
+
+
+class TopK:
+    """Heavy hitters tracked on top of a count-min sketch."""
+
+    def __init__(self, k: int = 50, preview_length: int = 80):
+        """
+        Initialize the tracker.
+
+        Args:
+            k: Number of heavy hitters kept
+            preview_length: Characters of text kept per heavy hitter
+        """
+        self.k = k
+        self.preview_length = preview_length
+        self._entries: dict[str, HotKey] = {}
+        self._min_count = 0
+
+    def offer(
+        self,
+        key: str,
+        estimate: int,
+        text: str,
+        source_language: str,
+        target_language: str,
+    ) -> None:
+        """
+        Offer a key with its current frequency estimate.
+
+        Args:
+            key: Cache key
+            estimate: Frequency estimate from the count-min sketch
+            text: Original text
+            source_language: Source language code
+            target_language: Target language code
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.count = estimate
+            return
+        if len(self._entries) >= self.k:
+            # Cached minimum is a lower bound, so only recompute when beaten
+            if estimate <= self._min_count:
+                return
+            victim = min(self._entries.values(), key=lambda e: e.count)
+            self._min_count = victim.count
+            if estimate <= victim.count:
+                return
+            del self._entries[victim.key]
+        self._entries[key] = HotKey(
+            key=key,
+            text_preview=text[: self.preview_length],
+            source_language=source_language,
+            target_language=target_language,
+            count=estimate,
+        )
+
+    def items(self) -> list[HotKey]:
+        """Get the heavy hitters, most frequent first."""
+        return sorted(self._entries.values(), key=lambda e: e.count, reverse=True)
+
+
+@dataclass
+class LanguagePairStats:
+    """Cache statistics of one language pair."""
+
+    hits: int = 0
+    misses: int = 0
+    characters_saved: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served from cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CacheAnalytics:
+    """
+    Streaming cache analytics with fixed memory overhead.
+
+    Updated on every cache lookup. Tracks hit ratios and characters saved
+    per language pair, heavy-hitter keys (count-min sketch + top-K) and the
+    number of distinct keys requested (HyperLogLog), i.e. the working set.
+
+    Lookups are recorded before the provider validates the language codes,
+    so only the first max_pairs pairs are tracked on their own; lookups of
+    any other pair are added to OTHER_PAIR.
+    """
+
+    def __init__(
+        self,
+        top_k: int = 50,
+        sketch_width: int = 2048,
+        sketch_depth: int = 4,
+        hll_precision: int = 14,
+        max_pairs: int = 256,
+    ):
+        """
+        Initialize the analytics.
+
+        Args:
+            top_k: Number of hot keys tracked
+            sketch_width: Count-min sketch width
+            sketch_depth: Count-min sketch depth
+            hll_precision: HyperLogLog precision
+            max_pairs: Number of language pairs tracked separately
+                (default: 256)
+        """
+        self.max_pairs = max_pairs
+        self.pairs: dict[tuple[str, str], LanguagePairStats] = {}
+        self.sketch = CountMinSketch(sketch_width, sketch_depth)
+        self.top_keys = TopK(top_k)
+        self.distinct_keys = HyperLogLog(hll_precision)
+
+    def record(
+        self,
+        key: str,
+        text: str,
+        source_language: str,
+        target_language: str,
+        hit: bool,
+    ) -> None:
+        """
+        Record a cache lookup.
+
+        Args:
+            key: Cache key
+            text: Original text
+            source_language: Source language code
+            target_language: Target language code
+            hit: Whether the lookup was served from cache
+        """
+        pair = (source_language.upper(), target_language.upper())
+        stats = self.pairs.get(pair)
+        if stats is None:
+            if len(self.pairs) >= self.max_pairs:
+                pair = OTHER_PAIR
+                stats = self.pairs.get(pair)
+            if stats is None:
+                stats = self.pairs[pair] = LanguagePairStats()
+        if hit:
+            stats.hits += 1
+            stats.characters_saved += len(text)
+        else:
+            stats.misses += 1
+
+        hashes = _hash128(key)
+        estimate = self.sketch.add(hashes)
+        self.top_keys.offer(key, estimate, text, *pair)
+        self.distinct_keys.add(hashes)
+
+    def snapshot(self) -> dict:
+        """
+        Get a report of the collected statistics.
+
+        Returns:
+            Dictionary with totals, per-pair stats, hot keys and the working
+            set estimate
+        """
+        hits = sum(stats.hits for stats in self.pairs.values())
+        lookups = hits + sum(stats.misses for stats in self.pairs.values())
+        return {
+            "lookups": lookups,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "characters_saved": sum(
+                stats.characters_saved for stats in self.pairs.values()
+            ),
+            "working_set_estimate": self.distinct_keys.count(),
+            "language_pairs": [
+                {
+                    "source_language": source,
+                    "target_language": target,
+                    "hits": stats.hits,
+                    "misses": stats.misses,
+                    "hit_ratio": stats.hit_ratio,
+                    "characters_saved": stats.characters_saved,
+                }
+                for (source, target), stats in sorted(self.pairs.items())
+            ],
+            "hot_keys": [
+                {
+                    "key": entry.key,
+                    "text_preview": entry.text_preview,
+                    "source_language": entry.source_language,
+                    "target_language": entry.target_language,
+                    "count": entry.count,
+                }
+                for entry in self.top_keys.items()
+            ],
+        }
@@ -0,0 +1,126 @@
+import asyncio
+import contextvars
+import logging
+
+from app.core.log import RateLimitedLogger
+from app.core.models import TranslationItem, TranslationResult
+from app.core.scheduler import INTERACTIVE, use_traffic_class
+from app.core.service import TranslationService
+
+logger = logging.getLogger(__name__)
+
+# A provider outage fails every batch
+_batch_logger = RateLimitedLogger(logger)
+
+
+class MicroBatcher:
+    """
+    Collects single translations from many callers into shared batches.
+
+    Texts submitted within max_delay of each other (e.g. chat messages from
+    different WebSocket connections) are translated together through
+    TranslationService.translate_items, one batch per language pair, so
+    concurrent messages share cache lookups and provider requests. A batch
+    is sent as soon as it holds max_batch_size texts.
+    """
+
+    def __init__(
+        self,
+        service: TranslationService,
+        max_batch_size: int = 50,
+        max_delay: float = 0.005,
+        traffic_class: str = INTERACTIVE,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            service: Service translating the batches
+            max_batch_size: Texts that trigger a batch immediately
+                (default: 50)
+            max_delay: Seconds the first text of a batch waits for others
+                (default: 0.005)
+            traffic_class: Traffic class batches are scheduled in
+                (default: interactive)
+        """
+        self.service = service
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.traffic_class = traffic_class
+        self._pending: list[tuple[TranslationItem, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task] = set()
+
+    async def translate(self, item: TranslationItem) -> TranslationResult:
+        """
+        Translate a text as part of the next batch.
+
+        Args:
+            item: Text with its language pair
+
+        Returns:
+            Translation of the text
+
+        Raises:
+            ValueError: If language is not supported
+            OverloadedError: If the batch is shed
+            Exception: If translation fails
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """Send the pending texts as a batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        # Batches serve many callers, so they must not inherit the context
+        # (deadline, trace) of the one that happened to fill them
+        task = asyncio.create_task(self._run(batch), context=contextvars.Context())
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _run(self, batch: list[tuple[TranslationItem, asyncio.Future]]) -> None:
+        """Translate a batch, one service call per language pair."""
+        pairs: dict[tuple[str, str], list[tuple[TranslationItem, asyncio.Future]]] = {}
+        for item, future in batch:
+            if not future.done():
+                key = (item.source_language.upper(), item.target_language.upper())
+                pairs.setdefault(key, []).append((item, future))
+        with use_traffic_class(self.traffic_class):
+            await asyncio.gather(
+                *(self._run_pair(entries) for entries in pairs.values())
+            )
+
+    async def _run_pair(
+        self, entries: list[tuple[TranslationItem, asyncio.Future]]
+    ) -> None:
+        """Translate the texts of one language pair and resolve their callers."""
+        try:
+            results = await self.service.translate_items([item for item, _ in entries])
+        except Exception as e:
+            _batch_logger.warning(
+                "Batch of %d streamed texts failed: %s", len(entries), e, exc_info=True
+            )
+            for _, future in entries:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(entries, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Send pending texts and wait for running batches to finish."""
+        self._flush()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
@@ -1,5 +1,51 @@
+import asyncio
 import hashlib
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+# Inputs larger than this (in characters) are hashed in a worker thread so
+# that the event loop keeps serving other requests (hashlib releases the GIL)
+OFFLOAD_HASH_SIZE = 64 * 1024
+
+# Layout version of the keys made by TranslationCache._make_key. Bump it when
+# the layout changes so that keys of different layouts never mix; keys without
+# a version prefix are bare SHA256 digests from before the layout had one.
+KEY_FORMAT_VERSION = "k2"
+
+
+@dataclass(frozen=True)
+class CacheScope:
+    """Subset of cached translations, selected by language pair."""
+
+    source_language: str | None = None
+    target_language: str | None = None
+
+    @property
+    def key_pattern(self) -> str:
+        """Glob pattern matching the cache keys in this scope."""
+        source = self.source_language.upper() if self.source_language else "*"
+        target = self.target_language.upper() if self.target_language else "*"
+        return f"{KEY_FORMAT_VERSION}:{source}:{target}:*"
+
+    def matches(self, key: str) -> bool:
+        """
+        Check if a cache key belongs to this scope.
+
+        Args:
+            key: Cache key as produced by TranslationCache._make_key
+
+        Returns:
+            True if the key is in scope, False otherwise
+        """
+        parts = key.split(":", 3)
+        if len(parts) != 4:
+            return False
+        version, source, target, _ = parts
+        return (
+            version == KEY_FORMAT_VERSION
+            and (not self.source_language or source == self.source_language.upper())
+            and (not self.target_language or target == self.target_language.upper())
+        )
 
 
 class TranslationCache(ABC):
@@ -43,10 +89,126 @@ class TranslationCache(ABC):
         pass
 
     @abstractmethod
-    async def clear(self) -> None:
-        """Clear all cached translations."""
+    async def clear(self, scope: CacheScope | None = None) -> None:
+        """
+        Clear cached translations.
+
+        Args:
+            scope: Only clear translations in this scope (default: all)
+        """
         pass
 
+    async def connect(self) -> None:
+        """
+        Open connections to the cache backend.
+
+        Called once at application startup so that the first requests do not
+        pay connection setup; the default does nothing.
+        """
+
+    async def ping(self) -> bool:
+        """
+        Check that the cache backend is reachable.
+
+        Returns:
+            True if the backend responds, False otherwise
+        """
+        return True
+
+    async def close(self) -> None:
+        """Close connections to the cache backend."""
+
+    def get_cache_size(self) -> int:
+        """
+        Get the number of cached translations.
+
+        Returns:
+            Number of entries, or 0 if the backend cannot count them cheaply
+        """
+        return 0
+
+    async def get_many(self, keys: list[str]) -> list[str | None]:
+        """
+        Get several cached translations in one call.
+
+        Backends that support bulk reads should override this.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Cached translations (or None for misses) in the order of keys
+        """
+        return [await self.get(key) for key in keys]
+
+    async def set_many(self, items: dict[str, str]) -> None:
+        """
+        Set several cached translations in one call.
+
+        Backends that support bulk writes should override this.
+
+        Args:
+            items: Mapping of cache key to translation value
+        """
+        for key, value in items.items():
+            await self.set(key, value)
+
+    async def acquire_leases(self, keys: list[str]) -> list[bool]:
+        """
+        Try to become the only fetcher of keys that missed the cache.
+
+        Backends shared between processes override this with a distributed
+        lease so that only one replica calls the provider for a hot key. The
+        default grants every lease.
+
+        Args:
+            keys: Cache keys that missed
+
+        Returns:
+            True for every key whose lease was acquired, in the order of keys
+        """
+        return [True] * len(keys)
+
+    async def release_leases(self, keys: list[str]) -> None:
+        """
+        Release leases previously acquired with acquire_leases.
+
+        Args:
+            keys: Cache keys whose leases are held
+        """
+
+    async def wait_for(self, keys: list[str]) -> list[str | None]:
+        """
+        Wait for keys leased by someone else to be filled.
+
+        Args:
+            keys: Cache keys leased by another fetcher
+
+        Returns:
+            Cached translations, or None where the value did not show up
+            before the lease was released or the wait timed out
+        """
+        return await self.get_many(keys)
+
+    async def make_keys(self, items: list[tuple[str, str, str]]) -> list[str]:
+        """
+        Generate the cache keys of several translations.
+
+        Large inputs are hashed in a worker thread instead of on the event
+        loop.
+
+        Args:
+            items: (text, source language, target language) tuples
+
+        Returns:
+            Cache keys in the order of items
+        """
+        if sum(len(text) for text, _, _ in items) < OFFLOAD_HASH_SIZE:
+            return [self._make_key(*item) for item in items]
+        return await asyncio.to_thread(
+            lambda: [self._make_key(*item) for item in items]
+        )
+
     def _make_key(
         self,
         text: str,
@@ -56,13 +218,21 @@ class TranslationCache(ABC):
         """
         Generate a cache key from translation parameters using SHA256 hash.
 
+        The language pair is kept readable in front of the hash so that a
+        pair can be invalidated on its own (see CacheScope), after the key
+        layout version.
+
         Args:
             text: Text to translate
             source_language: Source language code
             target_language: Target language code
 
         Returns:
-            Hashed cache key (64 character hex string)
+            Cache key of the form
+            ``<KEY_FORMAT_VERSION>:SOURCE:TARGET:<sha256 hex digest>``
         """
+        source_language = source_language.upper()
+        target_language = target_language.upper()
         key_str = f"{source_language}:{target_language}:{text}"
-        return hashlib.sha256(key_str.encode()).hexdigest()
+        digest = hashlib.sha256(key_str.encode()).hexdigest()
+        return f"{KEY_FORMAT_VERSION}:{source_language}:{target_language}:{digest}"
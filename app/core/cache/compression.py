@@ -0,0 +1,137 @@
+import re
+import zlib
+from collections import Counter
+from collections.abc import Iterable
+from itertools import pairwise
+
+# Values starting with this byte carry a format marker in the next byte.
+# Anything else is a plain UTF-8 string, which keeps entries written before
+# compression was enabled readable.
+_MARKER = b"\x00"
+_PLAIN = b"p"
+_ZLIB = b"z"
+_ZLIB_DICT = b"d"
+
+
+class ValueCodec:
+    """
+    Encodes cached translations for storage, compressing large values.
+
+    Values of at least ``threshold`` bytes are zlib-compressed, optionally
+    with a preset dictionary trained on typical translations so that short
+    strings compress too. Compressed values are only kept when they are
+    actually smaller. Every stored value is self-describing, so plain,
+    compressed and dictionary-compressed entries coexist.
+    """
+
+    def __init__(
+        self,
+        threshold: int | None = 512,
+        level: int = 6,
+        dictionary: bytes | None = None,
+    ):
+        """
+        Initialize the codec.
+
+        Args:
+            threshold: Minimum size in bytes of a value to compress
+                (default: 512, None disables compression)
+            level: zlib compression level (default: 6)
+            dictionary: Optional preset dictionary (see train_dictionary)
+        """
+        self.threshold = threshold
+        self.level = level
+        self.dictionary = dictionary or None
+        self._dictionary_id = (
+            zlib.adler32(self.dictionary).to_bytes(4, "big") if self.dictionary else b""
+        )
+
+    def encode(self, value: str) -> bytes:
+        """
+        Encode a translation for storage.
+
+        Args:
+            value: Translation value
+
+        Returns:
+            Stored representation
+        """
+        data = value.encode()
+        if self.threshold is not None and len(data) >= self.threshold:
+            if self.dictionary:
+                compressor = zlib.compressobj(self.level, zdict=self.dictionary)
+                compressed = compressor.compress(data) + compressor.flush()
+                header = _MARKER + _ZLIB_DICT + self._dictionary_id
+            else:
+                compressed = zlib.compress(data, self.level)
+                header = _MARKER + _ZLIB
+            if len(header) + len(compressed) < len(data):
+                return header + compressed
+        if data.startswith(_MARKER):
+            return _MARKER + _PLAIN + data
+        return data
+
+    def decode(self, stored: bytes) -> str | None:
+        """
+        Decode a stored translation.
+
+        Args:
+            stored: Stored representation
+
+        Returns:
+            Translation value, or None if it was compressed with a dictionary
+            this codec does not have (treated as a cache miss)
+        """
+        if not stored.startswith(_MARKER):
+            return stored.decode()
+
+        marker, payload = stored[1:2], stored[2:]
+        if marker == _PLAIN:
+            return payload.decode()
+        if marker == _ZLIB:
+            return zlib.decompress(payload).decode()
+        if marker == _ZLIB_DICT:
+            dictionary_id, payload = payload[:4], payload[4:]
+            if not self.dictionary or dictionary_id != self._dictionary_id:
+                return None
+            decompressor = zlib.decompressobj(zdict=self.dictionary)
+            return (decompressor.decompress(payload) + decompressor.flush()).decode()
+        raise ValueError(f"Unknown cache value format {marker!r}")
+
+
+def train_dictionary(samples: Iterable[str], size: int = 16 * 1024) -> bytes:
+    """
+    Build a zlib preset dictionary from sample translations.
+
+    Picks the recurring words and word pairs of the samples that cover the
+    most bytes. zlib favours matches close to the end of the dictionary, so
+    the most valuable fragments are placed last.
+
+    Args:
+        samples: Typical translation values
+        size: Maximum dictionary size in bytes (zlib uses at most 32 KiB)
+
+    Returns:
+        Dictionary bytes
+    """
+    counts: Counter[str] = Counter()
+    for sample in samples:
+        words = re.findall(r"\w+\W*", sample)
+        counts.update(words)
+        counts.update(a + b for a, b in pairwise(words))
+
+    fragments: list[bytes] = []
+    total = 0
+    # Rank fragments by the number of bytes they would save
+    ranked = sorted(
+        counts.items(), key=lambda item: item[1] * len(item[0]), reverse=True
+    )
+    for fragment, count in ranked:
+        if count < 2:
+            continue
+        encoded = fragment.encode()
+        if total + len(encoded) > size:
+            continue
+        fragments.append(encoded)
+        total += len(encoded)
+    return b"".join(reversed(fragments))
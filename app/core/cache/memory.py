@@ -1,12 +1,34 @@
-from app.core.cache.base import TranslationCache
+import asyncio
+from collections import OrderedDict
+
+from app.core.cache.base import CacheScope, TranslationCache
 
 
 class InMemoryTranslationCache(TranslationCache):
     """In-memory implementation of translation cache."""
 
-    def __init__(self):
-        """Initialize the in-memory cache."""
-        self._cache: dict[str, str] = {}
+    def __init__(self, max_entries: int | None = None):
+        """
+        Initialize the in-memory cache.
+
+        Args:
+            max_entries: Evict the least recently used translations beyond
+                this many entries (default: unbounded)
+        """
+        self.max_entries = max_entries
+        self._cache: OrderedDict[str, str] = OrderedDict()
+
+    def _touch(self, key: str) -> None:
+        """Mark a key as the most recently used one."""
+        if self.max_entries is not None:
+            self._cache.move_to_end(key)
+
+    def _evict(self) -> None:
+        """Drop the least recently used entries beyond max_entries."""
+        if self.max_entries is None:
+            return
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
 
     async def get(self, key: str) -> str | None:
         """
@@ -18,7 +40,10 @@ class InMemoryTranslationCache(TranslationCache):
         Returns:
             Cached translation or None if not found
         """
-        return self._cache.get(key)
+        value = self._cache.get(key)
+        if value is not None:
+            self._touch(key)
+        return value
 
     async def set(self, key: str, value: str) -> None:
         """
@@ -29,6 +54,36 @@ class InMemoryTranslationCache(TranslationCache):
             value: Translation value
         """
         self._cache[key] = value
+        self._touch(key)
+        self._evict()
+
+    async def get_many(self, keys: list[str]) -> list[str | None]:
+        """
+        Get several cached translations in one call.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Cached translations (or None for misses) in the order of keys
+        """
+        values = [self._cache.get(key) for key in keys]
+        for key, value in zip(keys, values, strict=True):
+            if value is not None:
+                self._touch(key)
+        return values
+
+    async def set_many(self, items: dict[str, str]) -> None:
+        """
+        Set several cached translations in one call.
+
+        Args:
+            items: Mapping of cache key to translation value
+        """
+        self._cache.update(items)
+        for key in items:
+            self._touch(key)
+        self._evict()
 
     async def exists(self, key: str) -> bool:
         """
@@ -42,9 +97,29 @@ class InMemoryTranslationCache(TranslationCache):
         """
         return key in self._cache
 
-    async def clear(self) -> None:
-        """Clear all cached translations."""
-        self._cache.clear()
+    async def clear(
+        self, scope: CacheScope | None = None, batch_size: int = 1000
+    ) -> None:
+        """
+        Clear cached translations.
+
+        A scoped clear checks the keys present when it starts in batches,
+        yielding to the event loop between batches so that clearing a large
+        cache does not stall other requests.
+
+        Args:
+            scope: Only clear translations in this scope (default: all)
+            batch_size: Number of keys checked per batch (default: 1000)
+        """
+        if scope is None:
+            self._cache.clear()
+            return
+        keys = list(self._cache)
+        for start in range(0, len(keys), batch_size):
+            for key in keys[start : start + batch_size]:
+                if scope.matches(key):
+                    self._cache.pop(key, None)
+            await asyncio.sleep(0)
 
     def get_cache_size(self) -> int:
         """Get the current size of the cache."""
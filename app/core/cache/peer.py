@@ -0,0 +1,452 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+import httpx
+
+from app.core.cache.base import CacheScope, TranslationCache
+from app.core.cache.memory import InMemoryTranslationCache
+from app.core.deadline import timeout_for
+from app.core.hashring import HashRing
+from app.core.log import RateLimitedLogger
+from app.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# An unreachable peer fails every request that touches its keys
+_peer_logger = RateLimitedLogger(logger)
+
+T = TypeVar("T")
+
+# Path of the internal peer endpoints (see app.api.internal)
+INTERNAL_PATH = "/api/v1/internal/cache"
+
+
+@dataclass
+class _Lease:
+    """A fetch lease held on a key owned by this replica."""
+
+    holder: str
+    expires_at: float
+    released: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class PeerTranslationCache(TranslationCache):
+    """
+    Cache spread across the memory of a static set of replicas.
+
+    Every key has one owner replica, chosen by consistent hashing over the
+    peer list. Reads and writes of a key go to its owner (in process for the
+    replica's own keys, over the internal HTTP endpoint otherwise), so the
+    fleet acts as one cache. Fetch leases are held by the owner as well, so
+    a string missing everywhere is translated by one replica while the
+    others wait for it. An unreachable peer is treated as a cache miss.
+    """
+
+    def __init__(
+        self,
+        self_url: str,
+        peer_urls: list[str],
+        local: TranslationCache | None = None,
+        token: str = "",
+        timeout: float = 1.0,
+        lease_ttl: float = 30.0,
+        lease_wait_timeout: float = 5.0,
+        max_entries: int | None = 100_000,
+        client: httpx.AsyncClient | None = None,
+    ):
+        """
+        Initialize the peer cache.
+
+        Args:
+            self_url: Base URL other peers reach this replica at
+            peer_urls: Base URLs of all replicas (self_url is added if
+                missing); must be the same list on every replica
+            local: Storage for the keys this replica owns (default: in-memory)
+            token: Shared secret sent to peers in the ``X-Peer-Token`` header
+            timeout: Timeout in seconds of peer requests (default: 1)
+            lease_ttl: Lifetime in seconds of a fetch lease (default: 30)
+            lease_wait_timeout: How long to wait for a key leased by another
+                replica before fetching it anyway (default: 5 seconds)
+            max_entries: Bound of the default in-memory storage, which evicts
+                its least recently used keys beyond it (default: 100000;
+                None for unbounded)
+            client: HTTP client used to reach peers (default: a pooled client
+                created on first use)
+        """
+        self.self_url = self_url.rstrip("/")
+        self.peer_urls = list(
+            dict.fromkeys([url.rstrip("/") for url in peer_urls] + [self.self_url])
+        )
+        self.local = local or InMemoryTranslationCache(max_entries=max_entries)
+        self.token = token
+        self.timeout = timeout
+        self.lease_ttl = lease_ttl
+        self.lease_wait_timeout = lease_wait_timeout
+        self._ring = HashRing(self.peer_urls)
+        self._holder = uuid.uuid4().hex
+        self._leases: dict[str, _Lease] = {}
+        self._next_sweep = 0.0
+        self._client = client
+
+    def owner(self, key: str) -> str:
+        """
+        Get the base URL of the replica owning a key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Peer base URL
+        """
+        return self._ring.get_node(key)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get or create the HTTP client used to reach peers."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
+
+    async def _call(
+        self, peer: str, operation: str, payload: dict[str, Any], timeout: float
+    ) -> Any:
+        """
+        Call an internal cache endpoint of a peer.
+
+        Args:
+            peer: Peer base URL
+            operation: Endpoint name, e.g. get or acquire
+            payload: JSON request body
+            timeout: Request timeout in seconds
+
+        Returns:
+            The ``results`` field of the response
+        """
+        with tracer.span(f"peer.{operation}", peer=peer):
+            response = await self._get_client().post(
+                f"{peer}{INTERNAL_PATH}/{operation}",
+                json=payload,
+                headers=tracer.inject({"X-Peer-Token": self.token}),
+                timeout=timeout,
+            )
+            response.raise_for_status()
+            return response.json()["results"]
+
+    async def _dispatch(
+        self,
+        keys: list[str],
+        local: Callable[[list[str]], Awaitable[list[T]]],
+        operation: str,
+        payload: Callable[[list[str]], dict[str, Any]],
+        default: T,
+        timeout: float | None = None,
+    ) -> list[T]:
+        """
+        Run a bulk operation on the owner of each key.
+
+        Args:
+            keys: Keys to operate on
+            local: Coroutine function serving this replica's own keys
+            operation: Internal endpoint serving keys owned by peers
+            payload: Builds the request body from the keys of one peer
+            default: Result for keys whose owner could not be reached
+            timeout: Peer request timeout (default: the cache timeout)
+
+        Returns:
+            Results in the order of keys
+        """
+        results: list[T] = [default] * len(keys)
+
+        async def run(peer: str, indices: list[int]) -> None:
+            peer_keys = [keys[index] for index in indices]
+            if peer == self.self_url:
+                values = await local(peer_keys)
+            else:
+                try:
+                    values = await self._call(
+                        peer, operation, payload(peer_keys), timeout or self.timeout
+                    )
+                except (httpx.HTTPError, KeyError, ValueError) as e:
+                    _peer_logger.warning(
+                        "Cache peer %s %s failed: %s", peer, operation, e
+                    )
+                    return
+            for index, value in zip(indices, values):
+                results[index] = value
+
+        await asyncio.gather(
+            *(run(peer, indices) for peer, indices in self._ring.group(keys).items())
+        )
+        return results
+
+    async def get(self, key: str) -> str | None:
+        """
+        Get a cached translation from its owner.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached translation or None if not found (or its owner is down)
+        """
+        [value] = await self.get_many([key])
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        """
+        Store a translation on its owner.
+
+        Args:
+            key: Cache key
+            value: Translation value
+        """
+        await self.set_many({key: value})
+
+    async def get_many(self, keys: list[str]) -> list[str | None]:
+        """
+        Get several cached translations, one request per owning peer.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Cached translations (or None for misses) in the order of keys
+        """
+        if not keys:
+            return []
+        return await self._dispatch(
+            keys,
+            self.local.get_many,
+            "get",
+            lambda peer_keys: {"keys": peer_keys},
+            None,
+        )
+
+    async def set_many(self, items: dict[str, str]) -> None:
+        """
+        Store several translations, one request per owning peer.
+
+        Args:
+            items: Mapping of cache key to translation value
+        """
+        if not items:
+            return
+
+        async def set_local(keys: list[str]) -> list[None]:
+            await self.local.set_many({key: items[key] for key in keys})
+            return [None] * len(keys)
+
+        await self._dispatch(
+            list(items),
+            set_local,
+            "set",
+            lambda peer_keys: {"items": {key: items[key] for key in peer_keys}},
+            None,
+        )
+
+    async def exists(self, key: str) -> bool:
+        """
+        Check if a key exists on its owner.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if key exists, False otherwise
+        """
+        return await self.get(key) is not None
+
+    async def acquire_leases(self, keys: list[str]) -> list[bool]:
+        """
+        Take fetch leases on missed keys from their owners.
+
+        Keys whose owner cannot be reached are leased (fetched here).
+
+        Args:
+            keys: Cache keys that missed
+
+        Returns:
+            True for every key whose lease was acquired, in the order of keys
+        """
+        if not keys:
+            return []
+        return await self._dispatch(
+            keys,
+            lambda own_keys: self.serve_acquire(own_keys, self._holder),
+            "acquire",
+            lambda peer_keys: {"keys": peer_keys, "holder": self._holder},
+            True,
+        )
+
+    async def release_leases(self, keys: list[str]) -> None:
+        """
+        Release fetch leases held by this replica.
+
+        Args:
+            keys: Cache keys whose leases are held
+        """
+        if not keys:
+            return
+
+        async def release_local(own_keys: list[str]) -> list[None]:
+            await self.serve_release(own_keys, self._holder)
+            return [None] * len(own_keys)
+
+        await self._dispatch(
+            keys,
+            release_local,
+            "release",
+            lambda peer_keys: {"keys": peer_keys, "holder": self._holder},
+            None,
+        )
+
+    async def wait_for(self, keys: list[str]) -> list[str | None]:
+        """
+        Wait on the owners for keys leased by another replica.
+
+        Args:
+            keys: Cache keys leased by another fetcher
+
+        Returns:
+            Cached translations, or None where the value did not show up
+            before the lease was released or the wait timed out
+        """
+        if not keys:
+            return []
+        wait = timeout_for(self.lease_wait_timeout)
+        return await self._dispatch(
+            keys,
+            lambda own_keys: self.serve_wait(own_keys, wait),
+            "wait",
+            lambda peer_keys: {"keys": peer_keys, "timeout": wait},
+            None,
+            timeout=wait + self.timeout,
+        )
+
+    async def clear(self, scope: CacheScope | None = None) -> None:
+        """
+        Clear cached translations on every peer.
+
+        Args:
+            scope: Only clear translations in this scope (default: all)
+        """
+        payload = {
+            "source_language": scope.source_language if scope else None,
+            "target_language": scope.target_language if scope else None,
+        }
+
+        async def clear_peer(peer: str) -> None:
+            if peer == self.self_url:
+                await self.local.clear(scope)
+                return
+            try:
+                await self._call(peer, "clear", payload, self.timeout)
+            except (httpx.HTTPError, KeyError, ValueError) as e:
+                logger.warning("Cache peer %s clear failed: %s", peer, e)
+
+        await asyncio.gather(*(clear_peer(peer) for peer in self.peer_urls))
+
+    def _sweep_leases(self) -> float:
+        """
+        Drop expired leases, at most once every half lease lifetime.
+
+        Runs on every access to the lease table, so leases whose holder
+        never released them (e.g. it crashed) do not pile up.
+
+        Returns:
+            The current monotonic time
+        """
+        now = time.monotonic()
+        if now < self._next_sweep:
+            return now
+        self._next_sweep = now + self.lease_ttl / 2
+        for key in [k for k, lease in self._leases.items() if lease.expires_at <= now]:
+            self._leases.pop(key).released.set()
+        return now
+
+    async def serve_acquire(self, keys: list[str], holder: str) -> list[bool]:
+        """
+        Grant fetch leases on keys owned by this replica.
+
+        Args:
+            keys: Cache keys
+            holder: Identifier of the requesting replica
+
+        Returns:
+            True for every key leased to holder, in the order of keys
+        """
+        now = self._sweep_leases()
+        granted = []
+        for key in keys:
+            lease = self._leases.get(key)
+            if lease is not None and lease.expires_at > now and lease.holder != holder:
+                granted.append(False)
+                continue
+            if lease is not None:
+                lease.released.set()
+            self._leases[key] = _Lease(holder, now + self.lease_ttl)
+            granted.append(True)
+        return granted
+
+    async def serve_release(self, keys: list[str], holder: str) -> None:
+        """
+        Release fetch leases on keys owned by this replica.
+
+        Args:
+            keys: Cache keys
+            holder: Identifier of the replica that took the leases
+        """
+        self._sweep_leases()
+        for key in keys:
+            lease = self._leases.get(key)
+            if lease is not None and lease.holder == holder:
+                del self._leases[key]
+                lease.released.set()
+
+    async def serve_wait(self, keys: list[str], timeout: float) -> list[str | None]:
+        """
+        Wait for leased keys owned by this replica to be filled.
+
+        Args:
+            keys: Cache keys
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Cached translations, or None where the value did not show up
+        """
+        self._sweep_leases()
+
+        async def wait_key(key: str) -> None:
+            lease = self._leases.get(key)
+            if lease is None:
+                return
+            remaining = min(timeout, lease.expires_at - time.monotonic())
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(lease.released.wait(), remaining)
+            except TimeoutError:
+                pass
+
+        await asyncio.gather(*(wait_key(key) for key in keys))
+        return await self.local.get_many(keys)
+
+    async def connect(self) -> None:
+        """Open the connection pool used to reach peers."""
+        self._get_client()
+        await self.local.connect()
+
+    async def close(self) -> None:
+        """Close connections to peers and the local storage."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        await self.local.close()
+
+    def get_cache_size(self) -> int:
+        """Get the number of keys stored on this replica."""
+        return self.local.get_cache_size()
@@ -1,31 +1,212 @@
+import asyncio
+import logging
+import time
+import uuid
+import zlib
+from collections.abc import Awaitable, Callable
+from typing import TypeVar, cast
+
 import redis.asyncio as redis
+from redis.asyncio.cluster import RedisCluster
+from redis.exceptions import RedisClusterException
+
+from app.core.cache.base import CacheScope, TranslationCache
+from app.core.cache.compression import ValueCodec
+from app.core.deadline import timeout_for
+from app.core.hashring import HashRing
+from app.core.log import RateLimitedLogger
+from app.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# An unavailable shard fails every request that touches it
+_shard_logger = RateLimitedLogger(logger)
 
-from app.core.cache.base import TranslationCache
+T = TypeVar("T")
+
+# Errors of one shard that degrade it to misses instead of failing requests;
+# cluster errors (e.g. no reachable startup node) do not derive from RedisError
+_SHARD_ERRORS = (redis.RedisError, RedisClusterException, OSError)
+
+# Deletes a lease key only if it still holds our token
+_RELEASE_LEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
 
 
 class RedisTranslationCache(TranslationCache):
-    """Redis-based implementation of translation cache."""
+    """
+    Redis-based implementation of translation cache.
+
+    Supports a single Redis node, client-side consistent-hash sharding across
+    several nodes (redis_urls) or Redis Cluster (cluster=True). Bulk
+    operations are split per shard and run concurrently. A shard that cannot
+    be reached is treated as a miss rather than failing the request, and
+    so is a stored value that cannot be decoded.
+    """
 
-    def __init__(self, redis_url: str = "redis://localhost:6379/0"):
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379/0",
+        namespace: str = "translator",
+        lease_ttl: float | None = None,
+        lease_wait_timeout: float = 5.0,
+        lease_poll_interval: float = 0.05,
+        redis_urls: list[str] | None = None,
+        cluster: bool = False,
+        codec: ValueCodec | None = None,
+    ):
         """
         Initialize the Redis cache.
 
         Args:
             redis_url: Redis connection URL
+            namespace: Prefix of every key written by this cache, e.g.
+                ``translator:deepl:v1``; clearing only touches this namespace
+                (default: translator)
+            lease_ttl: Lifetime in seconds of the lease taken on a cache miss,
+                so only one replica fetches a key from the provider
+                (default: None, leases disabled)
+            lease_wait_timeout: How long to wait for a key leased by another
+                replica before fetching it anyway (default: 5 seconds)
+            lease_poll_interval: Initial polling interval while waiting for a
+                leased key (default: 50 ms, doubling up to 0.5 s)
+            redis_urls: Redis URLs to shard keys across with consistent
+                hashing (default: only redis_url)
+            cluster: Treat redis_url as the entry point of a Redis Cluster
+                (default: False)
+            codec: Encoding of stored values, e.g. to compress long
+                translations (default: plain UTF-8)
         """
         self.redis_url = redis_url
-        self._client: redis.Redis | None = None
+        self.namespace = namespace
+        self._prefix = f"{namespace}:"
+        self.lease_ttl = lease_ttl
+        self.lease_wait_timeout = lease_wait_timeout
+        self.lease_poll_interval = lease_poll_interval
+        self.cluster = cluster
+        self.codec = codec or ValueCodec(threshold=None)
+        self.redis_urls = [redis_url] if cluster or not redis_urls else redis_urls
+        self._ring = HashRing(self.redis_urls)
+        self._lease_token = uuid.uuid4().hex
+        self._clients: dict[str, redis.Redis | RedisCluster] = {}
 
-    async def _get_client(self) -> redis.Redis:
+    async def _get_client(self, url: str) -> "redis.Redis | RedisCluster":
         """
-        Get or create Redis client connection.
+        Get or create the client connection of a shard.
+
+        Args:
+            url: Shard URL
+
+        Returns:
+            Redis (or Redis Cluster) async client
+        """
+        client = self._clients.get(url)
+        if client is None:
+            if self.cluster:
+                client = RedisCluster.from_url(url)
+            else:
+                client = await redis.from_url(url)
+            self._clients[url] = client
+        return client
+
+    async def _mget(
+        self, client: "redis.Redis | RedisCluster", keys: list[str]
+    ) -> list[bytes | None]:
+        """MGET that also works across hash slots of a Redis Cluster."""
+        if isinstance(client, RedisCluster):
+            stored = await client.mget_nonatomic(keys)
+        else:
+            stored = await client.mget(keys)
+        # Clients are created without decode_responses, so values are bytes
+        return cast(list[bytes | None], stored)
+
+    async def _run_sharded(
+        self,
+        keys: list[str],
+        operation: Callable[
+            ["redis.Redis | RedisCluster", list[str]], Awaitable[list[T]]
+        ],
+        default: T,
+    ) -> list[T]:
+        """
+        Run a bulk operation on every shard owning some of the keys.
+
+        Args:
+            keys: Keys to operate on
+            operation: Coroutine function called with a shard client and the
+                keys it owns, returning one result per key
+            default: Result for keys whose shard failed
+
+        Returns:
+            Results in the order of keys
+        """
+        results: list[T] = [default] * len(keys)
+
+        async def run(url: str, indices: list[int]) -> None:
+            try:
+                with tracer.span(
+                    f"redis.{operation.__name__}",
+                    shard=self._safe_url(url),
+                    keys=len(indices),
+                ):
+                    client = await self._get_client(url)
+                    shard_results = await operation(client, [keys[i] for i in indices])
+            except _SHARD_ERRORS as e:
+                _shard_logger.warning(
+                    "Redis shard %s unavailable: %s", self._safe_url(url), e
+                )
+                return
+            for i, result in zip(indices, shard_results):
+                results[i] = result
+
+        await asyncio.gather(
+            *(run(url, indices) for url, indices in self._ring.group(keys).items())
+        )
+        return results
+
+    async def _run_on_all_shards(
+        self,
+        operation: Callable[["redis.Redis | RedisCluster"], Awaitable[T]],
+        default: T,
+    ) -> list[T]:
+        """
+        Run an operation on every shard concurrently.
+
+        Args:
+            operation: Coroutine function called with each shard client
+            default: Result of shards that failed
 
         Returns:
-            Redis async client
+            Results per shard
         """
-        if self._client is None:
-            self._client = await redis.from_url(self.redis_url, decode_responses=True)
-        return self._client
+
+        async def run(url: str) -> T:
+            try:
+                return await operation(await self._get_client(url))
+            except _SHARD_ERRORS as e:
+                _shard_logger.warning(
+                    "Redis shard %s unavailable: %s", self._safe_url(url), e
+                )
+                return default
+
+        return await asyncio.gather(*(run(url) for url in self.redis_urls))
+
+    @staticmethod
+    def _safe_url(url: str) -> str:
+        """Strip credentials from a Redis URL for logging."""
+        return url.rsplit("@", 1)[-1]
+
+    def _decode(self, stored: bytes) -> str | None:
+        """Decode a stored value, treating a corrupt one as a miss."""
+        try:
+            return self.codec.decode(stored)
+        except (ValueError, zlib.error) as e:
+            _shard_logger.warning("Undecodable Redis cache value: %s", e)
+            return None
 
     async def get(self, key: str) -> str | None:
         """
@@ -35,10 +216,10 @@ class RedisTranslationCache(TranslationCache):
             key: Cache key
 
         Returns:
-            Cached translation or None if not found
+            Cached translation or None if not found (or its shard is down)
         """
-        client = await self._get_client()
-        return await client.get(key)
+        [value] = await self.get_many([key])
+        return value
 
     async def set(self, key: str, value: str, ttl: int = 86400) -> None:
         """
@@ -49,8 +230,153 @@ class RedisTranslationCache(TranslationCache):
             value: Translation value
             ttl: Time to live in seconds (default: 24 hours)
         """
-        client = await self._get_client()
-        await client.set(key, value, ex=ttl)
+        await self.set_many({key: value}, ttl=ttl)
+
+    async def get_many(self, keys: list[str]) -> list[str | None]:
+        """
+        Get several cached translations with one MGET per shard.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Cached translations (or None for misses) in the order of keys
+        """
+        if not keys:
+            return []
+
+        async def get_shard(client, shard_keys: list[str]) -> list[str | None]:
+            stored = await self._mget(client, [self._full_key(k) for k in shard_keys])
+            return [None if raw is None else self._decode(raw) for raw in stored]
+
+        return await self._run_sharded(keys, get_shard, None)
+
+    async def set_many(self, items: dict[str, str], ttl: int = 86400) -> None:
+        """
+        Set several cached translations in one pipelined round trip per shard.
+
+        Args:
+            items: Mapping of cache key to translation value
+            ttl: Time to live in seconds (default: 24 hours)
+        """
+        if not items:
+            return
+
+        async def set_shard(client, keys: list[str]) -> list[bool]:
+            async with client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.set(self._full_key(key), self.codec.encode(items[key]), ex=ttl)
+                return await pipe.execute()
+
+        await self._run_sharded(list(items), set_shard, False)
+
+    async def acquire_leases(self, keys: list[str]) -> list[bool]:
+        """
+        Try to take a short-lived lease (SET NX) on each missed key.
+
+        Keys on an unreachable shard are reported as leased, so the caller
+        fetches them itself.
+
+        Args:
+            keys: Cache keys that missed
+
+        Returns:
+            True for every key whose lease was acquired, in the order of keys
+        """
+        if self.lease_ttl is None or not keys:
+            return [True] * len(keys)
+        lease_ms = int(self.lease_ttl * 1000)
+
+        async def acquire_shard(client, shard_keys: list[str]) -> list[bool]:
+            async with client.pipeline(transaction=False) as pipe:
+                for key in shard_keys:
+                    pipe.set(
+                        self._lease_key(key), self._lease_token, nx=True, px=lease_ms
+                    )
+                return [bool(result) for result in await pipe.execute()]
+
+        return await self._run_sharded(keys, acquire_shard, True)
+
+    async def release_leases(self, keys: list[str]) -> None:
+        """
+        Release leases held by this instance.
+
+        Args:
+            keys: Cache keys whose leases are held
+        """
+        if self.lease_ttl is None or not keys:
+            return
+
+        async def release_shard(client, shard_keys: list[str]) -> list[int]:
+            async with client.pipeline(transaction=False) as pipe:
+                for key in shard_keys:
+                    pipe.eval(
+                        _RELEASE_LEASE_SCRIPT,
+                        1,
+                        self._lease_key(key),
+                        self._lease_token,
+                    )
+                return await pipe.execute()
+
+        await self._run_sharded(keys, release_shard, 0)
+
+    async def wait_for(self, keys: list[str]) -> list[str | None]:
+        """
+        Poll keys leased by another replica until they are filled.
+
+        Stops waiting for a key when its value appears, when its lease goes
+        away without a value (the other fetcher failed), when its shard is
+        unreachable or when lease_wait_timeout (or the request deadline)
+        expires.
+
+        Args:
+            keys: Cache keys leased by another fetcher
+
+        Returns:
+            Cached translations, or None where the caller should fall back to
+            fetching the key itself
+        """
+        results: list[str | None] = [None] * len(keys)
+        if not keys:
+            return results
+
+        async def poll_shard(client, shard_keys: list[str]) -> list[tuple]:
+            async with client.pipeline(transaction=False) as pipe:
+                for key in shard_keys:
+                    pipe.get(self._full_key(key))
+                    pipe.exists(self._lease_key(key))
+                replies = await pipe.execute()
+            return list(zip(replies[::2], replies[1::2]))
+
+        deadline = time.monotonic() + timeout_for(self.lease_wait_timeout)
+        interval = self.lease_poll_interval
+        pending = list(range(len(keys)))
+
+        while True:
+            polled = await self._run_sharded(
+                [keys[i] for i in pending], poll_shard, (None, 0)
+            )
+
+            still_pending = []
+            for i, (stored, leased) in zip(pending, polled):
+                if stored is not None:
+                    results[i] = self._decode(stored)
+                elif leased:
+                    still_pending.append(i)
+            pending = still_pending
+
+            if not pending or time.monotonic() + interval > deadline:
+                return results
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, 0.5)
+
+    def _full_key(self, key: str) -> str:
+        """Get the namespaced Redis key of a cache key."""
+        return f"{self._prefix}{key}"
+
+    def _lease_key(self, key: str) -> str:
+        """Get the Redis key holding the lease for a cache key."""
+        return f"{self._prefix}lease:{key}"
 
     async def exists(self, key: str) -> bool:
         """
@@ -60,21 +386,76 @@ class RedisTranslationCache(TranslationCache):
             key: Cache key
 
         Returns:
-            True if key exists, False otherwise
+            True if key exists, False otherwise (or if its shard is down)
+        """
+
+        async def exists_shard(client, shard_keys: list[str]) -> list[bool]:
+            return [await client.exists(self._full_key(shard_keys[0])) > 0]
+
+        [found] = await self._run_sharded([key], exists_shard, False)
+        return found
+
+    async def clear(
+        self, scope: CacheScope | None = None, batch_size: int = 500
+    ) -> None:
+        """
+        Clear cached translations of this namespace.
+
+        Keys are found incrementally with SCAN and removed in batches with
+        UNLINK, so Redis is never blocked and other namespaces sharing the
+        database are left alone. Unreachable shards are skipped.
+
+        Args:
+            scope: Only clear translations in this scope (default: all)
+            batch_size: Number of keys unlinked per command (default: 500)
+        """
+        if scope is None:
+            pattern = f"{self._glob_prefix}*"
+        else:
+            pattern = f"{self._glob_prefix}{scope.key_pattern}"
+
+        async def clear_shard(client) -> None:
+            batch: list[str] = []
+            async for key in client.scan_iter(match=pattern, count=batch_size):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    await client.unlink(*batch)
+                    batch = []
+            if batch:
+                await client.unlink(*batch)
+
+        await self._run_on_all_shards(clear_shard, None)
+
+    @property
+    def _glob_prefix(self) -> str:
+        """Namespace prefix with glob special characters escaped."""
+        return "".join(
+            f"\\{char}" if char in "*?[]\\" else char for char in self._prefix
+        )
+
+    async def connect(self) -> None:
+        """Open a connection to every shard and check it responds."""
+        if not await self.ping():
+            logger.error("Redis cache is unreachable, serving cache misses")
+
+    async def ping(self) -> bool:
+        """
+        Check that every shard responds.
+
+        Returns:
+            True if all shards answered PING, False otherwise
         """
-        client = await self._get_client()
-        return await client.exists(key) > 0
 
-    async def clear(self) -> None:
-        """Clear all cached translations."""
-        client = await self._get_client()
-        await client.flushdb()
+        async def ping_shard(client) -> bool:
+            return bool(await client.ping())
+
+        return all(await self._run_on_all_shards(ping_shard, False))
 
     async def close(self) -> None:
-        """Close Redis connection."""
-        if self._client is not None:
-            await self._client.close()
-            self._client = None
+        """Close Redis connections."""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
 
     def get_cache_size(self) -> int:
         """
@@ -93,7 +474,20 @@ class RedisTranslationCache(TranslationCache):
         Get the current size of the cache asynchronously.
 
         Returns:
-            Number of keys in Redis
+            Number of translations of this namespace across all reachable
+            Redis shards, without lease keys
         """
-        client = await self._get_client()
-        return await client.dbsize()
+        pattern = f"{self._glob_prefix}*"
+        lease_prefix = self._lease_key("").encode()
+
+        async def count_shard(client) -> int:
+            return sum(
+                [
+                    1
+                    async for key in client.scan_iter(match=pattern, count=500)
+                    if not key.startswith(lease_prefix)
+                ]
+            )
+
+        sizes = await self._run_on_all_shards(count_shard, 0)
+        return sum(sizes)
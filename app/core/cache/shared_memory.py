@@ -0,0 +1,428 @@
+import asyncio
+import fcntl
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+from app.core.cache.base import CacheScope, TranslationCache
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"TRCACHE1"
+# magic, slot count, reserved, arena size, arena used, epoch, used slots
+# (including deleted ones), live entries
+_HEADER = struct.Struct("<8sIIQQQQQ")
+_HEADER_SIZE = 64
+# seqlock counter, state, key hash, arena offset, key length, value length
+_SLOT = struct.Struct("<IIQQII")
+_SEQ = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+_EMPTY = 0
+_USED = 1
+_DELETED = 2
+
+# Header field offsets, following the magic, slot count, reserved and
+# arena size fields
+_ARENA_USED_AT = struct.calcsize("<8sIIQ")
+_EPOCH_AT = _ARENA_USED_AT + _U64.size
+_USED_SLOTS_AT = _EPOCH_AT + _U64.size
+_ENTRIES_AT = _USED_SLOTS_AT + _U64.size
+
+_MAX_LOAD = 0.75
+_READ_RETRIES = 8
+_RETRY = object()
+
+
+def _hash(key: bytes) -> int:
+    """Hash a key to a non-zero 64-bit integer."""
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") | 1
+
+
+class SharedMemoryTranslationCache(TranslationCache):
+    """
+    Translation cache in a shared memory segment used by all local workers.
+
+    Every worker process on the host attaches to the same named segment,
+    holding a fixed-size open-addressing hash table (linear probing) and an
+    append-only arena for keys and values. Reads take no lock: each slot is
+    guarded by a seqlock counter and the table by an epoch, and a read that
+    overlaps a write is retried. Writes are serialized across processes with
+    an advisory file lock, taken off the event loop. When the table or arena
+    fills up the whole cache is reset, so the segment never grows.
+
+    Every attached cache holds a shared lock on an owners file for as long
+    as it is open, and the last one to close unlinks the segment. The kernel
+    drops the locks of crashed processes, so a segment left behind by a crash
+    is reused by the next workers and removed when they exit. The lock files
+    stay in place; unlink() removes them along with the segment.
+    """
+
+    def __init__(
+        self,
+        name: str = "translator-cache",
+        slots: int = 65536,
+        arena_size: int = 32 * 1024 * 1024,
+        lock_path: str | None = None,
+    ):
+        """
+        Create or attach to the shared cache.
+
+        Args:
+            name: Shared memory segment name, identical for all workers
+            slots: Hash table slots; at most 75% are filled before a reset
+                (default: 65536, 32 bytes each)
+            arena_size: Bytes available for keys and values
+                (default: 32 MiB)
+            lock_path: File used for the cross-process write lock
+                (default: <tmpdir>/<name>.lock); the owners lock uses the
+                same path with an ``.owners`` suffix
+        """
+        self.name = name
+        self.lock_path = lock_path or os.path.join(
+            tempfile.gettempdir(), f"{name}.lock"
+        )
+        self._thread_lock = threading.Lock()
+        self._lock_fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._owners_fd = os.open(
+            f"{self.lock_path}.owners", os.O_RDWR | os.O_CREAT, 0o600
+        )
+        self._closed = False
+
+        with self._locked():
+            # Taken under the write lock, so a closing owner either sees this
+            # one or has already unlinked the segment before it is created
+            fcntl.flock(self._owners_fd, fcntl.LOCK_SH)
+            size = _HEADER_SIZE + slots * _SLOT.size + arena_size
+            try:
+                self._shm = shared_memory.SharedMemory(
+                    name=name, create=True, size=size, track=False
+                )
+            except FileExistsError:
+                self._shm = shared_memory.SharedMemory(name=name, track=False)
+            buf = self._shm.buf
+            assert buf is not None
+            self._buf: memoryview = buf
+
+            magic, stored_slots, _, stored_arena, *_ = _HEADER.unpack_from(self._buf)
+            if magic != _MAGIC:
+                _HEADER.pack_into(
+                    self._buf, 0, _MAGIC, slots, 0, arena_size, 0, 0, 0, 0
+                )
+            elif (stored_slots, stored_arena) != (slots, arena_size):
+                logger.warning(
+                    "Shared cache '%s' exists with %d slots and %d arena bytes, "
+                    "using its geometry",
+                    name,
+                    stored_slots,
+                    stored_arena,
+                )
+                slots, arena_size = stored_slots, stored_arena
+
+        self.slots = slots
+        self.arena_size = arena_size
+        self._slots_at = _HEADER_SIZE
+        self._arena_at = _HEADER_SIZE + slots * _SLOT.size
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the write lock across threads and processes."""
+        with self._thread_lock:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _read_u64(self, offset: int) -> int:
+        return _U64.unpack_from(self._buf, offset)[0]
+
+    def _write_u64(self, offset: int, value: int) -> None:
+        _U64.pack_into(self._buf, offset, value)
+
+    def _slot_at(self, index: int) -> int:
+        return self._slots_at + index * _SLOT.size
+
+    def _read(self, key: bytes, key_hash: int) -> bytes | None | object:
+        """
+        Look a key up without locking.
+
+        Returns:
+            Value bytes, None on a miss, or _RETRY if a write interfered
+        """
+        buf = self._buf
+        arena_at = self._arena_at
+        for probe in range(self.slots):
+            slot_at = self._slot_at((key_hash + probe) % self.slots)
+            seq, state, slot_hash, offset, key_len, value_len = _SLOT.unpack_from(
+                buf, slot_at
+            )
+            if seq & 1:
+                return _RETRY
+            if state == _EMPTY:
+                return None
+            if state != _USED or slot_hash != key_hash:
+                continue
+            start = arena_at + offset
+            stored_key = bytes(buf[start : start + key_len])
+            value = bytes(buf[start + key_len : start + key_len + value_len])
+            if _SEQ.unpack_from(buf, slot_at)[0] != seq:
+                return _RETRY
+            if stored_key == key:
+                return value
+        return None
+
+    def _read_consistent(self, key: bytes, key_hash: int) -> bytes | None | object:
+        """
+        Look a key up without locking, retrying reads that overlapped a write.
+
+        Returns:
+            Value bytes, None on a miss, or _RETRY if every attempt overlapped
+            a write
+        """
+        for _ in range(_READ_RETRIES):
+            epoch = self._read_u64(_EPOCH_AT)
+            if epoch & 1:
+                continue
+            value = self._read(key, key_hash)
+            if value is not _RETRY and self._read_u64(_EPOCH_AT) == epoch:
+                return value
+        return _RETRY
+
+    def _read_locked(self, key: bytes, key_hash: int) -> bytes | None | object:
+        """Look a key up under the write lock."""
+        with self._locked():
+            return self._read(key, key_hash)
+
+    async def _get(self, key: str) -> str | None:
+        """Get a value, falling back to a locked read under write contention."""
+        encoded = key.encode()
+        key_hash = _hash(encoded)
+        value = self._read_consistent(encoded, key_hash)
+        if value is _RETRY:
+            value = await asyncio.to_thread(self._read_locked, encoded, key_hash)
+        return value.decode() if isinstance(value, bytes) else None
+
+    def _reset(self) -> None:
+        """Drop every entry. Caller holds the write lock."""
+        epoch = self._read_u64(_EPOCH_AT)
+        self._write_u64(_EPOCH_AT, epoch + 1)
+        self._buf[self._slots_at : self._arena_at] = bytes(
+            self._arena_at - self._slots_at
+        )
+        self._write_u64(_ARENA_USED_AT, 0)
+        self._write_u64(_USED_SLOTS_AT, 0)
+        self._write_u64(_ENTRIES_AT, 0)
+        self._write_u64(_EPOCH_AT, epoch + 2)
+
+    def _write_slot(self, slot_at: int, *fields: int) -> None:
+        """Publish slot fields under its seqlock. Caller holds the lock."""
+        seq = _SEQ.unpack_from(self._buf, slot_at)[0]
+        _SEQ.pack_into(self._buf, slot_at, (seq + 1) & 0xFFFFFFFF)
+        _SLOT.pack_into(self._buf, slot_at, (seq + 1) & 0xFFFFFFFF, *fields)
+        _SEQ.pack_into(self._buf, slot_at, (seq + 2) & 0xFFFFFFFF)
+
+    def _set(self, key: str, value: str) -> None:
+        """Store a value. Caller holds the write lock."""
+        encoded_key = key.encode()
+        record = encoded_key + value.encode()
+        if len(record) > self.arena_size:
+            logger.warning("Value for key %s is larger than the shared cache", key)
+            return
+        key_hash = _hash(encoded_key)
+
+        arena_used = self._read_u64(_ARENA_USED_AT)
+        used_slots = self._read_u64(_USED_SLOTS_AT)
+        if (
+            arena_used + len(record) > self.arena_size
+            or used_slots + 1 > self.slots * _MAX_LOAD
+        ):
+            logger.info("Shared cache '%s' is full, resetting", self.name)
+            self._reset()
+            arena_used = used_slots = 0
+
+        target = None
+        replaces = False
+        for probe in range(self.slots):
+            slot_at = self._slot_at((key_hash + probe) % self.slots)
+            _, state, slot_hash, offset, key_len, _ = _SLOT.unpack_from(
+                self._buf, slot_at
+            )
+            if state == _EMPTY:
+                if target is None:
+                    target = slot_at
+                    used_slots += 1
+                break
+            if state == _DELETED:
+                if target is None:
+                    target = slot_at
+                continue
+            if slot_hash == key_hash and key_len == len(encoded_key):
+                start = self._arena_at + offset
+                if bytes(self._buf[start : start + key_len]) == encoded_key:
+                    target, replaces = slot_at, True
+                    break
+        if target is None:
+            return
+
+        start = self._arena_at + arena_used
+        self._buf[start : start + len(record)] = record
+        self._write_slot(
+            target,
+            _USED,
+            key_hash,
+            arena_used,
+            len(encoded_key),
+            len(record) - len(encoded_key),
+        )
+        self._write_u64(_ARENA_USED_AT, arena_used + len(record))
+        self._write_u64(_USED_SLOTS_AT, used_slots)
+        if not replaces:
+            self._write_u64(_ENTRIES_AT, self._read_u64(_ENTRIES_AT) + 1)
+
+    def _set_many(self, items: dict[str, str]) -> None:
+        """Store values under a single lock acquisition."""
+        with self._locked():
+            for key, value in items.items():
+                self._set(key, value)
+
+    def _clear(self, scope: CacheScope | None) -> None:
+        """Drop every entry, or those in scope, under the write lock."""
+        with self._locked():
+            if scope is None:
+                self._reset()
+                return
+            removed = 0
+            for index in range(self.slots):
+                slot_at = self._slot_at(index)
+                _, state, slot_hash, offset, key_len, value_len = _SLOT.unpack_from(
+                    self._buf, slot_at
+                )
+                if state != _USED:
+                    continue
+                start = self._arena_at + offset
+                key = bytes(self._buf[start : start + key_len]).decode()
+                if scope.matches(key):
+                    self._write_slot(
+                        slot_at, _DELETED, slot_hash, offset, key_len, value_len
+                    )
+                    removed += 1
+            self._write_u64(_ENTRIES_AT, self._read_u64(_ENTRIES_AT) - removed)
+
+    async def get(self, key: str) -> str | None:
+        """
+        Get a cached translation.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached translation or None if not found
+        """
+        return await self._get(key)
+
+    async def set(self, key: str, value: str) -> None:
+        """
+        Set a cached translation.
+
+        Args:
+            key: Cache key
+            value: Translation value
+        """
+        await asyncio.to_thread(self._set_many, {key: value})
+
+    async def get_many(self, keys: list[str]) -> list[str | None]:
+        """
+        Get several cached translations in one call.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Cached translations (or None for misses) in the order of keys
+        """
+        return [await self._get(key) for key in keys]
+
+    async def set_many(self, items: dict[str, str]) -> None:
+        """
+        Set several cached translations under a single lock acquisition.
+
+        Args:
+            items: Mapping of cache key to translation value
+        """
+        await asyncio.to_thread(self._set_many, items)
+
+    async def exists(self, key: str) -> bool:
+        """
+        Check if a key exists in cache.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if key exists, False otherwise
+        """
+        return await self._get(key) is not None
+
+    async def clear(self, scope: CacheScope | None = None) -> None:
+        """
+        Clear cached translations of every worker.
+
+        Args:
+            scope: Only clear translations in this scope (default: all)
+        """
+        await asyncio.to_thread(self._clear, scope)
+
+    def get_cache_size(self) -> int:
+        """Get the number of entries shared by all workers."""
+        return self._read_u64(_ENTRIES_AT)
+
+    async def close(self) -> None:
+        """Detach from the shared segment, unlinking it if no one else uses it."""
+        if self._closed:
+            return
+        self._closed = True
+        await asyncio.to_thread(self._detach)
+
+    def _detach(self) -> None:
+        """Release this owner and unlink the segment if it was the last one."""
+        with self._locked():
+            # Trade the shared owners lock for an exclusive one, which is only
+            # granted when no other process or cache holds the segment
+            fcntl.flock(self._owners_fd, fcntl.LOCK_UN)
+            try:
+                fcntl.flock(self._owners_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                last = False
+            else:
+                last = True
+                fcntl.flock(self._owners_fd, fcntl.LOCK_UN)
+            # Releases the memoryview self._buf refers to as well
+            self._shm.close()
+            if last:
+                self._unlink_segment()
+                logger.info("Unlinked shared cache '%s', its last owner", self.name)
+        os.close(self._owners_fd)
+        os.close(self._lock_fd)
+
+    def _unlink_segment(self) -> None:
+        """Remove the shared segment if it still exists."""
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def unlink(self) -> None:
+        """Remove the shared segment and its lock files from the host."""
+        self._unlink_segment()
+        for path in (self.lock_path, f"{self.lock_path}.owners"):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
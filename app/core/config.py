@@ -8,17 +8,175 @@ class Settings(BaseSettings):
     Uses Pydantic BaseSettings for type-safe configuration.
     """
 
+    # Options: deepl (default), synthetic, record (DeepL traffic is written to
+    # RECORDING_PATH) or replay (translations are served from RECORDING_PATH)
+    provider_type: str = Field(default="deepl", alias="PROVIDER_TYPE")
+
     deepl_api_key: str = Field(default="", alias="DEEPL_API_KEY")
     deepl_api_url: str = Field(
         default="https://api-free.deepl.com/v2/translate", alias="DEEPL_API_URL"
     )
+    deepl_max_concurrency: int = Field(default=10, alias="DEEPL_MAX_CONCURRENCY")
+    # Longer texts are split at sentence boundaries and translated in parallel
+    deepl_max_chunk_chars: int = Field(default=5000, alias="DEEPL_MAX_CHUNK_CHARS")
+    # Connections opened to DeepL at startup
+    deepl_warm_connections: int = Field(default=2, alias="DEEPL_WARM_CONNECTIONS")
+
+    # Synthetic provider for load tests
+    synthetic_latency_median: float = Field(
+        default=0.1, alias="SYNTHETIC_LATENCY_MEDIAN"
+    )
+    synthetic_latency_sigma: float = Field(default=0.5, alias="SYNTHETIC_LATENCY_SIGMA")
+    synthetic_latency_per_char: float = Field(
+        default=0.0, alias="SYNTHETIC_LATENCY_PER_CHAR"
+    )
+    synthetic_error_rate: float = Field(default=0.0, alias="SYNTHETIC_ERROR_RATE")
+    synthetic_max_batch_size: int = Field(default=50, alias="SYNTHETIC_MAX_BATCH_SIZE")
+    synthetic_seed: int | None = Field(default=None, alias="SYNTHETIC_SEED")
+
+    # Record/replay provider
+    recording_path: str = Field(default="recordings.jsonl", alias="RECORDING_PATH")
+    # Multiplier of replayed latencies, 0 replays instantly
+    replay_speed: float = Field(default=1.0, alias="REPLAY_SPEED")
+
+    # Scheduling of DeepL requests between traffic classes
+    interactive_weight: float = Field(default=4.0, alias="INTERACTIVE_WEIGHT")
+    interactive_max_concurrency: int = Field(
+        default=10, alias="INTERACTIVE_MAX_CONCURRENCY"
+    )
+    interactive_rate_limit: float | None = Field(
+        default=None, alias="INTERACTIVE_RATE_LIMIT"
+    )
+    bulk_weight: float = Field(default=1.0, alias="BULK_WEIGHT")
+    bulk_max_concurrency: int = Field(default=8, alias="BULK_MAX_CONCURRENCY")
+    bulk_rate_limit: float | None = Field(default=None, alias="BULK_RATE_LIMIT")
+    # Secret allowing callers to promote bulk routes to the interactive class
+    # (unset: no promotion)
+    traffic_class_token: str = Field(default="", alias="TRAFFIC_CLASS_TOKEN")
+
+    # Admission control for work that misses the cache
+    admission_max_queued: int = Field(default=1000, alias="ADMISSION_MAX_QUEUED")
+    admission_max_queue_wait: float = Field(
+        default=10.0, alias="ADMISSION_MAX_QUEUE_WAIT"
+    )
+
+    # End-to-end request deadlines in seconds per route type; clients can
+    # pick their own with the X-Request-Timeout header up to the maximum
+    interactive_request_timeout: float = Field(
+        default=10.0, alias="INTERACTIVE_REQUEST_TIMEOUT"
+    )
+    bulk_request_timeout: float = Field(default=60.0, alias="BULK_REQUEST_TIMEOUT")
+    max_request_timeout: float = Field(default=300.0, alias="MAX_REQUEST_TIMEOUT")
+
+    # WebSocket streaming: messages from all connections are batched for up to
+    # websocket_batch_delay seconds; each connection may have at most
+    # websocket_max_in_flight untranslated messages before reads pause
+    websocket_batch_size: int = Field(default=50, alias="WEBSOCKET_BATCH_SIZE")
+    websocket_batch_delay: float = Field(default=0.005, alias="WEBSOCKET_BATCH_DELAY")
+    websocket_max_in_flight: int = Field(default=32, alias="WEBSOCKET_MAX_IN_FLIGHT")
+
+    # Streaming NDJSON batches: limits of a request body, and how many items
+    # are translated per chunk while the body is still uploading
+    stream_max_items: int = Field(default=100_000, alias="STREAM_MAX_ITEMS")
+    stream_max_bytes: int = Field(default=64 * 1024 * 1024, alias="STREAM_MAX_BYTES")
+    stream_max_line_bytes: int = Field(
+        default=1024 * 1024, alias="STREAM_MAX_LINE_BYTES"
+    )
+    stream_chunk_size: int = Field(default=100, alias="STREAM_CHUNK_SIZE")
+    stream_max_chunks_in_flight: int = Field(
+        default=4, alias="STREAM_MAX_CHUNKS_IN_FLIGHT"
+    )
+
+    # Admin endpoints are disabled unless a token is set
+    admin_token: str = Field(default="", alias="ADMIN_TOKEN")
+    cache_analytics_enabled: bool = Field(default=True, alias="CACHE_ANALYTICS_ENABLED")
+    # Texts whose detected source language is remembered, so AUTO and explicit
+    # source requests share cache entries (opt-in, 0 disables)
+    detected_language_index_size: int = Field(
+        default=0, alias="DETECTED_LANGUAGE_INDEX_SIZE"
+    )
+    # Provider translations remembered for fuzzy reuse by near-duplicate
+    # texts (0 disables) and the similarity a match needs
+    translation_memory_size: int = Field(default=0, alias="TRANSLATION_MEMORY_SIZE")
+    translation_memory_threshold: float = Field(
+        default=0.9, alias="TRANSLATION_MEMORY_THRESHOLD"
+    )
+
+    # Tracing: fraction of new traces recorded and where spans go
+    tracing_sample_rate: float = Field(default=0.0, alias="TRACING_SAMPLE_RATE")
+    # Options: none (default), file or otlp
+    tracing_exporter: str = Field(default="none", alias="TRACING_EXPORTER")
+    tracing_file_path: str = Field(default="spans.jsonl", alias="TRACING_FILE_PATH")
+    tracing_otlp_endpoint: str = Field(
+        default="http://localhost:4318/v1/traces", alias="TRACING_OTLP_ENDPOINT"
+    )
 
     # Logging
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
+    # Options: json (default) or text
+    log_format: str = Field(default="json", alias="LOG_FORMAT")
+    # High-frequency events (cache hits/misses, failed provider attempts,
+    # unreachable peers) are sampled and then limited to this many records
+    # per second each
+    log_sample_rate: float = Field(default=1.0, alias="LOG_SAMPLE_RATE")
+    log_rate_limit: float = Field(default=10.0, alias="LOG_RATE_LIMIT")
+
+    # Seconds to wait for in-flight requests on shutdown
+    shutdown_drain_timeout: float = Field(default=30.0, alias="SHUTDOWN_DRAIN_TIMEOUT")
+    # Seconds between failing readiness on SIGTERM and closing the listener
+    shutdown_readiness_delay: float = Field(
+        default=5.0, alias="SHUTDOWN_READINESS_DELAY"
+    )
+
+    # Event loop lag monitoring
+    loop_monitor_enabled: bool = Field(default=True, alias="LOOP_MONITOR_ENABLED")
+    loop_monitor_interval: float = Field(default=0.1, alias="LOOP_MONITOR_INTERVAL")
+    # Log the stack of code blocking the event loop for longer than this
+    loop_block_threshold: float = Field(default=0.5, alias="LOOP_BLOCK_THRESHOLD")
 
     # Cache configuration
+    # Options: memory (default), shared (all workers on the host), peer
+    # (spread across replicas) or redis
     cache_type: str = Field(default="memory", alias="CACHE_TYPE")
+    # Size of the shared-memory cache (CACHE_TYPE=shared)
+    shared_cache_slots: int = Field(default=65536, alias="SHARED_CACHE_SLOTS")
+    shared_cache_arena_mb: int = Field(default=32, alias="SHARED_CACHE_ARENA_MB")
     redis_url: str = Field(default="redis://localhost:6379/0", alias="REDIS_URL")
+    # Keys are namespaced as <namespace>:<provider>:<version>
+    cache_namespace: str = Field(default="translator", alias="CACHE_NAMESPACE")
+    cache_version: str = Field(default="v1", alias="CACHE_VERSION")
+    # Peer cache (CACHE_TYPE=peer): comma-separated base URLs of all replicas
+    # and the URL of this one
+    cache_peers: str = Field(default="", alias="CACHE_PEERS")
+    cache_peer_self: str = Field(
+        default="http://localhost:8000", alias="CACHE_PEER_SELF"
+    )
+    cache_peer_token: str = Field(default="", alias="CACHE_PEER_TOKEN")
+    cache_peer_timeout: float = Field(default=1.0, alias="CACHE_PEER_TIMEOUT")
+    cache_peer_lease_ttl: float = Field(default=30.0, alias="CACHE_PEER_LEASE_TTL")
+    cache_peer_lease_wait_timeout: float = Field(
+        default=5.0, alias="CACHE_PEER_LEASE_WAIT_TIMEOUT"
+    )
+    # Keys owned by this replica kept in memory, least recently used evicted
+    cache_peer_max_entries: int = Field(default=100_000, alias="CACHE_PEER_MAX_ENTRIES")
+    # Comma-separated Redis URLs to shard across (overrides REDIS_URL)
+    redis_urls: str = Field(default="", alias="REDIS_URLS")
+    # Treat REDIS_URL as the entry point of a Redis Cluster
+    redis_cluster: bool = Field(default=False, alias="REDIS_CLUSTER")
+    # Compress Redis values of at least this many bytes, disabled when unset
+    redis_compression_threshold: int | None = Field(
+        default=None, alias="REDIS_COMPRESSION_THRESHOLD"
+    )
+    redis_compression_level: int = Field(default=6, alias="REDIS_COMPRESSION_LEVEL")
+    # Optional zlib preset dictionary file (see train_dictionary)
+    redis_compression_dictionary: str = Field(
+        default="", alias="REDIS_COMPRESSION_DICTIONARY"
+    )
+    # Cross-replica stampede protection, disabled when unset
+    redis_lease_ttl: float | None = Field(default=None, alias="REDIS_LEASE_TTL")
+    redis_lease_wait_timeout: float = Field(
+        default=5.0, alias="REDIS_LEASE_WAIT_TIMEOUT"
+    )
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a request cannot complete before its deadline."""
+
+
+def remaining() -> float | None:
+    """
+    Get the time left until the deadline of the current context.
+
+    Returns:
+        Seconds left (negative once passed), or None without a deadline
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline() -> None:
+    """
+    Fail if the deadline of the current context has passed.
+
+    Raises:
+        DeadlineExceededError: If no time is left
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError("Request deadline exceeded")
+
+
+def timeout_for(default: float) -> float:
+    """
+    Bound an operation timeout by the deadline of the current context.
+
+    Args:
+        default: Timeout used without a deadline
+
+    Returns:
+        The smaller of default and the time left
+
+    Raises:
+        DeadlineExceededError: If no time is left
+    """
+    check_deadline()
+    left = remaining()
+    return default if left is None else min(default, left)
+
+
+@contextmanager
+def use_deadline(seconds: float | None) -> Iterator[None]:
+    """
+    Run the enclosed code (and tasks it spawns) under a deadline.
+
+    A nested deadline can only shorten the enclosing one.
+
+    Args:
+        seconds: Time budget from now (None keeps the current deadline)
+    """
+    deadline = _deadline.get()
+    if seconds is not None:
+        candidate = time.monotonic() + seconds
+        deadline = candidate if deadline is None else min(deadline, candidate)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+async def run_with_deadline[T](awaitable: Awaitable[T], seconds: float | None) -> T:
+    """
+    Await work under a deadline, cancelling it when the deadline passes.
+
+    Args:
+        awaitable: Work to run
+        seconds: Time budget from now (None for no deadline)
+
+    Returns:
+        Result of the work
+
+    Raises:
+        DeadlineExceededError: If the work did not finish in time
+        TimeoutError: If the work itself timed out (e.g. a provider socket)
+    """
+    with use_deadline(seconds):
+        scope = asyncio.timeout(remaining())
+        try:
+            async with scope:
+                return await awaitable
+        except TimeoutError as e:
+            if not scope.expired():
+                raise
+            raise DeadlineExceededError("Request deadline exceeded") from e
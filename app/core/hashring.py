@@ -0,0 +1,72 @@
+import bisect
+import hashlib
+
+
+class HashRing:
+    """
+    Consistent hash ring mapping keys to nodes.
+
+    Each node is placed on the ring at several virtual points so keys spread
+    evenly, and adding or removing a node only moves the keys it owned.
+    """
+
+    def __init__(self, nodes: list[str], replicas: int = 160):
+        """
+        Initialize the hash ring.
+
+        Args:
+            nodes: Node identifiers (e.g. Redis URLs or peer base URLs)
+            replicas: Number of virtual points per node (default: 160)
+
+        Raises:
+            ValueError: If no nodes are given
+        """
+        if not nodes:
+            raise ValueError("Hash ring needs at least one node")
+        self.nodes = list(dict.fromkeys(nodes))
+        self.replicas = replicas
+
+        points = sorted(
+            (self._hash(f"{node}#{replica}"), node)
+            for node in self.nodes
+            for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def get_node(self, key: str) -> str:
+        """
+        Get the node owning a key.
+
+        Args:
+            key: Key to place on the ring
+
+        Returns:
+            Node identifier
+        """
+        if len(self.nodes) == 1:
+            return self.nodes[0]
+        index = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+    def group(self, keys: list[str]) -> dict[str, list[int]]:
+        """
+        Group keys by owning node.
+
+        Args:
+            keys: Keys to place on the ring
+
+        Returns:
+            Mapping of node identifier to the positions of its keys in keys
+        """
+        groups: dict[str, list[int]] = {}
+        for index, key in enumerate(keys):
+            groups.setdefault(self.get_node(key), []).append(index)
+        return groups
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        """Hash a value to a point on the ring."""
+        return int.from_bytes(
+            hashlib.blake2b(value.encode(), digest_size=8).digest(), "big"
+        )
@@ -0,0 +1,63 @@
+import hashlib
+from collections import OrderedDict
+
+
+class DetectedLanguageIndex:
+    """
+    Bounded index of the source language the provider detected per text.
+
+    Lets lookups of texts requested with source language AUTO fall back to
+    the cache entry of the detected language, so clients sending AUTO and
+    clients sending the explicit language share cached translations. Texts
+    are stored as short digests and the least recently used entries are
+    dropped once max_entries is reached.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        """
+        Initialize the index.
+
+        Args:
+            max_entries: Maximum number of texts remembered (default: 100000)
+        """
+        self.max_entries = max_entries
+        self._languages: OrderedDict[bytes, str] = OrderedDict()
+
+    @staticmethod
+    def _digest(text: str) -> bytes:
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+    def get(self, text: str) -> str | None:
+        """
+        Get the detected language of a text.
+
+        Args:
+            text: Original text
+
+        Returns:
+            Language code, or None if no detection is remembered
+        """
+        digest = self._digest(text)
+        language = self._languages.get(digest)
+        if language is not None:
+            self._languages.move_to_end(digest)
+        return language
+
+    def set(self, text: str, language: str) -> None:
+        """
+        Remember the detected language of a text.
+
+        Args:
+            text: Original text
+            language: Detected language code
+        """
+        if self.max_entries <= 0:
+            return
+        digest = self._digest(text)
+        self._languages[digest] = language.upper()
+        self._languages.move_to_end(digest)
+        while len(self._languages) > self.max_entries:
+            self._languages.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._languages)
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import signal
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class Lifecycle:
+    """
+    Readiness and in-flight request tracking of a worker.
+
+    The worker becomes ready once startup has finished. On a shutdown signal
+    it stops being ready, so load balancers route new traffic elsewhere
+    while it still listens, and waits for the requests it is still serving
+    before resources are closed.
+    """
+
+    def __init__(self):
+        """Initialize the lifecycle in the starting state."""
+        self.ready = False
+        self.draining = False
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently being served."""
+        return self._in_flight
+
+    def mark_ready(self) -> None:
+        """Mark startup as finished."""
+        self.ready = True
+        self.draining = False
+
+    def stop_ready(self) -> None:
+        """Stop reporting ready while still serving requests."""
+        self.ready = False
+        self.draining = True
+
+    @contextmanager
+    def drain_on_signal(self, delay: float) -> Iterator[None]:
+        """
+        Stop being ready as soon as SIGTERM arrives, before the server stops.
+
+        The server only stops accepting connections once the signal reaches
+        its own handler, which is delayed here by delay seconds so that load
+        balancers see the worker fail readiness and route new traffic
+        elsewhere first. A second SIGTERM is passed on at once. Nothing is
+        installed outside the main thread, where signals cannot be handled.
+
+        Args:
+            delay: Seconds between failing readiness and passing the signal on
+        """
+        if threading.current_thread() is not threading.main_thread():
+            yield
+            return
+        loop = asyncio.get_running_loop()
+        previous = signal.getsignal(signal.SIGTERM)
+
+        def pass_on() -> None:
+            if signal.getsignal(signal.SIGTERM) is handle:
+                signal.signal(signal.SIGTERM, previous)
+                signal.raise_signal(signal.SIGTERM)
+
+        def handle(signum: int, frame: object) -> None:
+            if self.draining:
+                loop.call_soon_threadsafe(pass_on)
+                return
+            self.stop_ready()
+            logger.info("Shutdown requested; no longer ready, stopping in %ss", delay)
+            loop.call_soon_threadsafe(loop.call_later, delay, pass_on)
+
+        signal.signal(signal.SIGTERM, handle)
+        try:
+            yield
+        finally:
+            if signal.getsignal(signal.SIGTERM) is handle:
+                signal.signal(signal.SIGTERM, previous)
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Count the enclosed request as in flight."""
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.set()
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Stop being ready and wait for in-flight requests to finish.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if all requests finished, False if the wait timed out
+        """
+        self.stop_ready()
+        if self._in_flight:
+            logger.info("Draining %d in-flight requests", self._in_flight)
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except TimeoutError:
+            logger.warning(
+                "Shutdown drain timed out with %d requests in flight", self._in_flight
+            )
+            return False
+        return True
+
+
+# Process-wide lifecycle of this worker
+lifecycle = Lifecycle()
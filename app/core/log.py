@@ -0,0 +1,226 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+
+from app.core.tracing import current_span
+
+# Attributes every LogRecord has; anything else was passed via ``extra``
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "asctime", "taskName"}
+
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a record.
+
+        Args:
+            record: Log record
+
+        Returns:
+            JSON line with time, level, logger, message, the fields passed
+            via ``extra`` and the exception, if any
+        """
+        entry = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _QueueHandler(QueueHandler):
+    """QueueHandler that keeps the exception apart from the message."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the message arguments and render the exception in place."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class TraceContextFilter(logging.Filter):
+    """Adds the trace id of the current span to records."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        span = current_span()
+        if span is not None:
+            record.trace_id = span.trace_id
+        return True
+
+
+class RateLimitedLogger:
+    """
+    Logs a high-frequency event at a bounded rate.
+
+    A fraction (sample_rate) of the calls is considered, and of those at
+    most rate records per second are emitted, with bursts up to burst. The
+    next emitted record reports how many were dropped in the ``suppressed``
+    field. Calls below the logger's level cost a single level check.
+    """
+
+    default_rate = 10.0
+    default_sample_rate = 1.0
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        rate: float | None = None,
+        burst: float | None = None,
+        sample_rate: float | None = None,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            logger: Logger records go to
+            rate: Records per second (default: LOG_RATE_LIMIT)
+            burst: Records allowed at once (default: rate)
+            sample_rate: Fraction of calls considered (default:
+                LOG_SAMPLE_RATE)
+        """
+        self.logger = logger
+        self.rate = rate
+        self.burst = burst
+        self.sample_rate = sample_rate
+        self._tokens: float | None = None
+        self._updated = time.monotonic()
+        self._suppressed = 0
+        self._lock = threading.Lock()
+
+    def _allow(self) -> bool:
+        """Take a token if the rate allows it."""
+        rate = self.rate if self.rate is not None else self.default_rate
+        sample_rate = (
+            self.sample_rate
+            if self.sample_rate is not None
+            else self.default_sample_rate
+        )
+        burst = self.burst if self.burst is not None else max(rate, 1.0)
+        with self._lock:
+            if sample_rate < 1.0 and random.random() >= sample_rate:
+                self._suppressed += 1
+                return False
+            now = time.monotonic()
+            if self._tokens is None:
+                self._tokens = burst
+            self._tokens = min(burst, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            if self._tokens < 1.0:
+                self._suppressed += 1
+                return False
+            self._tokens -= 1.0
+            return True
+
+    def log(self, level: int, msg: str, *args: object, **kwargs) -> None:
+        """
+        Log a record if the rate allows it.
+
+        Args:
+            level: Logging level
+            msg: Message with %-style placeholders
+            *args: Placeholder values, formatted only if the record is emitted
+            **kwargs: Passed on to Logger.log
+        """
+        if not self.logger.isEnabledFor(level) or not self._allow():
+            return
+        with self._lock:
+            suppressed, self._suppressed = self._suppressed, 0
+        if suppressed:
+            kwargs["extra"] = {**kwargs.get("extra", {}), "suppressed": suppressed}
+        self.logger.log(level, msg, *args, **kwargs)
+
+    def debug(self, msg: str, *args: object, **kwargs) -> None:
+        """Log a debug record if the rate allows it."""
+        self.log(logging.DEBUG, msg, *args, **kwargs)
+
+    def info(self, msg: str, *args: object, **kwargs) -> None:
+        """Log an info record if the rate allows it."""
+        self.log(logging.INFO, msg, *args, **kwargs)
+
+    def warning(self, msg: str, *args: object, **kwargs) -> None:
+        """Log a warning record if the rate allows it."""
+        self.log(logging.WARNING, msg, *args, **kwargs)
+
+
+def configure_logging(
+    level: str = "INFO",
+    json_output: bool = True,
+    rate_limit: float = 10.0,
+    sample_rate: float = 1.0,
+) -> None:
+    """
+    Send log records through a queue to a background writer thread.
+
+    The root logger gets a QueueHandler, so logging from the event loop only
+    enqueues the record; formatting and writing to stderr happen on the
+    listener thread. Calling this again replaces the previous setup; handlers
+    installed by anyone else (e.g. an APM agent or a test harness) are kept.
+
+    Args:
+        level: Root logging level
+        json_output: Write JSON lines instead of plain text (default: True)
+        rate_limit: Default records per second of rate-limited events
+        sample_rate: Default fraction of rate-limited events considered
+    """
+    global _listener
+    shutdown_logging()
+
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(
+        JsonFormatter()
+        if json_output
+        else logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _QueueHandler(records)
+    handler.addFilter(TraceContextFilter())
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        if isinstance(existing, _QueueHandler):
+            root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+
+    RateLimitedLogger.default_rate = rate_limit
+    RateLimitedLogger.default_sample_rate = sample_rate
+
+    _listener = QueueListener(records, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,203 @@
+import asyncio
+import bisect
+import logging
+import statistics
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the lag histogram buckets (plus +Inf)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class LoopMonitor:
+    """
+    Measures event loop lag and reports code that blocks the loop.
+
+    A probe task sleeps for ``interval`` seconds and measures how late it
+    wakes up; the delay is the time ready callbacks had to wait for the loop.
+    A watchdog thread checks the probe's heartbeat and, when the loop has not
+    run it for longer than ``block_threshold``, logs the stack of the loop
+    thread, i.e. the code that is blocking it.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        block_threshold: float = 0.5,
+        window: int = 600,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between lag probes
+            block_threshold: Seconds the loop may be blocked before its stack
+                is logged
+            window: Number of recent probes kept for percentiles
+        """
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self._lags: deque[float] = deque(maxlen=window)
+        self._max_lag = 0.0
+        self._bucket_counts = [0] * (len(LAG_BUCKETS) + 1)
+        self._lag_sum = 0.0
+        self._blocked_events = 0
+        self._heartbeat = time.monotonic()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._probe_task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    def configure(self, interval: float, block_threshold: float) -> None:
+        """
+        Change probe interval and blocking threshold before start.
+
+        Args:
+            interval: Seconds between lag probes
+            block_threshold: Seconds the loop may be blocked before its stack
+                is logged
+        """
+        self.interval = interval
+        self.block_threshold = block_threshold
+
+    @property
+    def running(self) -> bool:
+        """Whether the monitor is started."""
+        return self._probe_task is not None
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopping.clear()
+        self._probe_task = self._loop.create_task(self._probe())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop monitoring."""
+        if self._probe_task is None:
+            return
+        self._stopping.set()
+        self._probe_task.cancel()
+        try:
+            await self._probe_task
+        except asyncio.CancelledError:
+            pass
+        self._probe_task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    def snapshot(self) -> dict:
+        """
+        Get the current lag statistics.
+
+        Returns:
+            Dictionary with the latest, mean, p99 and maximum lag in
+            milliseconds and the number of blocking events
+        """
+        lags = sorted(self._lags)
+        return {
+            "running": self.running,
+            "lag_ms": self._lags[-1] * 1000 if self._lags else 0.0,
+            "mean_lag_ms": statistics.fmean(lags) * 1000 if lags else 0.0,
+            "p99_lag_ms": (
+                lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000 if lags else 0.0
+            ),
+            "max_lag_ms": self._max_lag * 1000,
+            "blocked_events": self._blocked_events,
+        }
+
+    def render_metrics(self) -> str:
+        """
+        Render the lag statistics in the Prometheus text format.
+
+        Exposes the latest lag as a gauge, every probe since start as a
+        histogram and the blocking events as a counter, so that lag can be
+        scraped and aggregated over time instead of polled as a snapshot.
+
+        Returns:
+            Metrics in the Prometheus text exposition format
+        """
+        latest = self._lags[-1] if self._lags else 0.0
+        lines = [
+            "# HELP translator_event_loop_lag_seconds Lag of the latest probe.",
+            "# TYPE translator_event_loop_lag_seconds gauge",
+            f"translator_event_loop_lag_seconds {latest}",
+            "# HELP translator_event_loop_probe_lag_seconds Lag of every probe.",
+            "# TYPE translator_event_loop_probe_lag_seconds histogram",
+        ]
+        cumulative = 0
+        for bound, count in zip((*LAG_BUCKETS, None), self._bucket_counts):
+            cumulative += count
+            le = "+Inf" if bound is None else str(bound)
+            lines.append(
+                f'translator_event_loop_probe_lag_seconds_bucket{{le="{le}"}} '
+                f"{cumulative}"
+            )
+        lines += [
+            f"translator_event_loop_probe_lag_seconds_sum {self._lag_sum}",
+            f"translator_event_loop_probe_lag_seconds_count {cumulative}",
+            "# HELP translator_event_loop_blocked_total Watchdog blocking reports.",
+            "# TYPE translator_event_loop_blocked_total counter",
+            f"translator_event_loop_blocked_total {self._blocked_events}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    async def _probe(self) -> None:
+        """Measure how late the loop runs a timer, forever."""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            self._lags.append(lag)
+            self._max_lag = max(self._max_lag, lag)
+            self._bucket_counts[bisect.bisect_left(LAG_BUCKETS, lag)] += 1
+            self._lag_sum += lag
+            self._heartbeat = time.monotonic()
+
+    def _watch(self) -> None:
+        """Watchdog thread: log the loop's stack while the probe is starved."""
+        reported = None
+        check_interval = min(self.interval, self.block_threshold / 2)
+        while not self._stopping.wait(check_interval):
+            heartbeat = self._heartbeat
+            blocked = time.monotonic() - heartbeat - self.interval
+            if blocked >= self.block_threshold and heartbeat != reported:
+                reported = heartbeat
+                self._blocked_events += 1
+                self._report(blocked)
+
+    def _report(self, blocked: float) -> None:
+        """
+        Log the stack of the event loop thread.
+
+        Runs in the watchdog thread, so it only reads the loop thread's
+        frame; asyncio task state is not safe to inspect from here.
+        """
+        if self._loop_thread_id is None:
+            return
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = "".join(traceback.format_stack(frame))
+        logger.warning(
+            "Event loop blocked for at least %.0f ms:\n%s", blocked * 1000, stack
+        )
+
+
+# Process-wide loop monitor, started with the application
+loop_monitor = LoopMonitor()
@@ -17,3 +17,22 @@ class TranslationResult:
     translated_text: str
     source_language: str
     target_language: str
+    # Similarity of the remembered text, if recalled from translation memory
+    match_score: float | None = None
+
+
+@dataclass(frozen=True)
+class TranslationItem:
+    """A single text together with the language pair it should use."""
+
+    text: str
+    source_language: str = "AUTO"
+    target_language: str = "EN"
+
+
+@dataclass
+class ProviderTranslation:
+    """A provider translation with the source language the provider detected."""
+
+    text: str
+    detected_source_language: str | None = None
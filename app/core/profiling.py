@@ -0,0 +1,147 @@
+import asyncio
+import cProfile
+import io
+import marshal
+import pstats
+import tracemalloc
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a profile is requested while another one is running."""
+
+
+class Profiler:
+    """
+    On-demand, time-bounded profiling of the running worker.
+
+    Nothing is instrumented until a profile is requested, so there is no
+    overhead while idle. Only one profile runs at a time per worker.
+    """
+
+    def __init__(self):
+        """Initialize the profiler."""
+        self._busy = False
+
+    @property
+    def busy(self) -> bool:
+        """Whether a profile is currently being captured."""
+        return self._busy
+
+    async def cpu_profile(self, seconds: float) -> pstats.Stats:
+        """
+        Capture a deterministic CPU profile of the event loop thread.
+
+        Everything the event loop runs while the profile is active (all
+        concurrent requests) is recorded.
+
+        Args:
+            seconds: Capture duration
+
+        Returns:
+            Collected profile statistics
+
+        Raises:
+            ProfilerBusyError: If another profile is running
+        """
+        self._acquire()
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                profile.disable()
+        finally:
+            self._busy = False
+        return pstats.Stats(profile)
+
+    async def allocation_diff(
+        self, seconds: float, limit: int = 25, frames: int = 1
+    ) -> str:
+        """
+        Capture memory allocations made over a time window.
+
+        Args:
+            seconds: Capture duration
+            limit: Number of allocation sites reported
+            frames: Stack frames recorded per allocation
+
+        Returns:
+            Text report of the top allocation sites by size growth
+
+        Raises:
+            ProfilerBusyError: If another profile is running
+        """
+        self._acquire()
+        started_here = not tracemalloc.is_tracing()
+        try:
+            if started_here:
+                tracemalloc.start(frames)
+            try:
+                before = tracemalloc.take_snapshot()
+                await asyncio.sleep(seconds)
+                after = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+            finally:
+                if started_here:
+                    tracemalloc.stop()
+        finally:
+            self._busy = False
+
+        key_type = "traceback" if frames > 1 else "lineno"
+        stats = after.compare_to(before, key_type)
+        lines = [
+            (
+                f"Allocations over {seconds:g}s "
+                f"(traced now {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB)"
+            ),
+            "",
+        ]
+        for stat in stats[:limit]:
+            lines.append(str(stat))
+            if frames > 1:
+                lines.extend(f"    {line}" for line in stat.traceback.format())
+        return "\n".join(lines) + "\n"
+
+    def _acquire(self) -> None:
+        """Mark the profiler busy or fail if it already is."""
+        if self._busy:
+            raise ProfilerBusyError("A profile is already being captured")
+        self._busy = True
+
+
+def stats_to_pstats_file(stats: pstats.Stats) -> bytes:
+    """
+    Serialize profile statistics in the format written by dump_stats.
+
+    Args:
+        stats: Profile statistics
+
+    Returns:
+        Contents of a ``.prof`` file loadable by pstats or snakeviz
+    """
+    return marshal.dumps(stats.stats)  # type: ignore[attr-defined]
+
+
+def stats_to_text(
+    stats: pstats.Stats, sort: str = "cumulative", limit: int = 50
+) -> str:
+    """
+    Render profile statistics as a text report.
+
+    Args:
+        stats: Profile statistics
+        sort: Sort key, e.g. cumulative or tottime
+        limit: Number of functions reported
+
+    Returns:
+        Text report
+    """
+    stream = io.StringIO()
+    stats.stream = stream  # type: ignore[attr-defined]
+    stats.sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+# Process-wide profiler used by the admin endpoints
+profiler = Profiler()
@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
 
-from app.core.models import Language
+from app.core.models import Language, ProviderTranslation
 
 
 class TranslationProvider(ABC):
     """Abstract base class for translation providers."""
 
+    # Whether translate_batch_detailed reports detected source languages
+    detects_language: bool = False
+
     @abstractmethod
     async def translate(
         self,
@@ -54,6 +57,43 @@ class TranslationProvider(ABC):
         """
         pass
 
+    async def translate_batch_detailed(
+        self,
+        texts: list[str],
+        source_language: str,
+        target_language: str,
+    ) -> list[ProviderTranslation]:
+        """
+        Translate multiple texts, reporting the detected source languages.
+
+        The default reports no detection; providers that detect the source
+        language set detects_language and override this method.
+
+        Args:
+            texts: List of texts to translate
+            source_language: Source language code
+            target_language: Target language code
+
+        Returns:
+            List of translations in the order of texts
+
+        Raises:
+            ValueError: If language is not supported
+            Exception: If translation fails
+        """
+        translated = await self.translate_batch(texts, source_language, target_language)
+        return [ProviderTranslation(text) for text in translated]
+
+    async def start(self) -> None:
+        """
+        Prepare the provider for traffic, e.g. open connections.
+
+        Called once at application startup; the default does nothing.
+        """
+
+    async def close(self) -> None:
+        """Release provider resources at application shutdown."""
+
     @abstractmethod
     def get_supported_languages(self) -> list[Language]:
         """
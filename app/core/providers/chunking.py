@@ -0,0 +1,80 @@
+import re
+
+# Preferred split points, coarsest first: paragraphs, sentences, words
+_BOUNDARIES = [
+    re.compile(r"\n\s*\n"),
+    re.compile(r"(?<=[.!?…。！？])[\"'”»)\]]*\s+"),
+    re.compile(r"\s+"),
+]
+
+
+def split_text(text: str, max_chars: int) -> list[str]:
+    """
+    Split a text into chunks of at most max_chars characters.
+
+    Splits at paragraph boundaries where possible, then at sentence
+    boundaries, then between words, and only cuts inside a word that is
+    longer than max_chars on its own. Separators stay attached to the chunk
+    they follow, so joining the chunks gives back the text.
+
+    Args:
+        text: Text to split
+        max_chars: Maximum chunk length
+
+    Returns:
+        Chunks in order
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    chunks: list[str] = []
+    current = ""
+    for piece in _pieces(text, max_chars, 0):
+        if current and len(current) + len(piece) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _pieces(text: str, max_chars: int, level: int) -> list[str]:
+    """Split text at the given boundary level until every piece fits."""
+    if len(text) <= max_chars:
+        return [text]
+    if level == len(_BOUNDARIES):
+        return [
+            text[start : start + max_chars] for start in range(0, len(text), max_chars)
+        ]
+
+    pieces: list[str] = []
+    start = 0
+    for match in _BOUNDARIES[level].finditer(text):
+        if match.end() > start:
+            pieces.append(text[start : match.end()])
+            start = match.end()
+    pieces.append(text[start:])
+
+    result: list[str] = []
+    for piece in pieces:
+        if piece:
+            result.extend(_pieces(piece, max_chars, level + 1))
+    return result
+
+
+def split_whitespace(text: str) -> tuple[str, str, str]:
+    """
+    Separate leading and trailing whitespace from a text.
+
+    Args:
+        text: Text
+
+    Returns:
+        (leading whitespace, stripped text, trailing whitespace)
+    """
+    stripped = text.strip()
+    if not stripped:
+        return text, "", ""
+    start = text.index(stripped)
+    return text[:start], stripped, text[start + len(stripped) :]
@@ -1,12 +1,23 @@
 import asyncio
 import logging
+import time
 
-from app.core.models import Language
+import httpx
+
+from app.core.deadline import DeadlineExceededError, check_deadline, remaining
+from app.core.log import RateLimitedLogger
+from app.core.models import Language, ProviderTranslation
 from app.core.providers.base import TranslationProvider
+from app.core.providers.chunking import split_text, split_whitespace
+from app.core.scheduler import PriorityScheduler
+from app.core.tracing import tracer
 from app.core.translator import call_remote_api
 
 logger = logging.getLogger(__name__)
 
+# Failed attempts come in bursts when DeepL degrades
+_attempt_logger = RateLimitedLogger(logger)
+
 
 class DeepLProvider(TranslationProvider):
     """DeepL translation provider with retry mechanism."""
@@ -18,6 +29,8 @@ class DeepLProvider(TranslationProvider):
         Language("RU", "Russian"),
     ]
 
+    detects_language = True
+
     def __init__(
         self,
         api_url: str,
@@ -26,6 +39,10 @@ class DeepLProvider(TranslationProvider):
         initial_delay: float = 0.5,
         exponential_base: float = 2.0,
         max_delay: float = 30.0,
+        max_concurrency: int = 10,
+        scheduler: PriorityScheduler | None = None,
+        warm_connections: int = 2,
+        max_chunk_chars: int = 5000,
     ):
         """
         Initialize DeepL provider.
@@ -37,6 +54,16 @@ class DeepLProvider(TranslationProvider):
             initial_delay: Initial delay in seconds (default: 0.5)
             exponential_base: Base for exponential backoff (default: 2.0)
             max_delay: Maximum delay cap in seconds (default: 30.0)
+            max_concurrency: Maximum number of concurrent requests to DeepL
+                (default: 10)
+            scheduler: Scheduler arbitrating DeepL requests between traffic
+                classes (default: interactive/bulk scheduler limited to
+                max_concurrency)
+            warm_connections: Connections opened to DeepL at startup
+                (default: 2, capped at max_concurrency)
+            max_chunk_chars: Texts longer than this are split at sentence
+                boundaries and the chunks translated concurrently
+                (default: 5000)
         """
         self.api_url = api_url
         self.api_key = api_key
@@ -44,6 +71,47 @@ class DeepLProvider(TranslationProvider):
         self.initial_delay = initial_delay
         self.exponential_base = exponential_base
         self.max_delay = max_delay
+        self.max_concurrency = max_concurrency
+        self.scheduler = scheduler or PriorityScheduler(max_concurrency)
+        self.warm_connections = min(warm_connections, max_concurrency)
+        self.max_chunk_chars = max_chunk_chars
+        self._client: httpx.AsyncClient | None = None
+
+    async def start(self) -> None:
+        """
+        Open the shared connection pool and pre-warm connections to DeepL.
+
+        Warm-up sends lightweight requests to the usage endpoint; failures
+        are logged and do not prevent startup.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                )
+            )
+        client = self._client
+        usage_url = f"{self.api_url.rsplit('/', 1)[0]}/usage"
+
+        async def warm() -> None:
+            try:
+                await client.get(
+                    usage_url,
+                    headers={"Authorization": f"DeepL-Auth-Key {self.api_key}"},
+                    timeout=10.0,
+                )
+            except httpx.HTTPError as e:
+                logger.warning("DeepL connection warm-up failed: %s", e)
+
+        # Concurrent requests each hold their own connection
+        await asyncio.gather(*(warm() for _ in range(self.warm_connections)))
+
+    async def close(self) -> None:
+        """Close the shared connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def translate(
         self,
@@ -74,7 +142,8 @@ class DeepLProvider(TranslationProvider):
         ):
             raise ValueError(f"Source language '{source_language}' is not supported")
 
-        return await self._translate_with_retry(text, source_language, target_language)
+        translation = await self._translate_text(text, source_language, target_language)
+        return translation.text
 
     async def translate_batch(
         self,
@@ -93,6 +162,32 @@ class DeepLProvider(TranslationProvider):
         Returns:
             List of translated texts
 
+        Raises:
+            ValueError: If language is not supported
+            Exception: If translation fails
+        """
+        translations = await self.translate_batch_detailed(
+            texts, source_language, target_language
+        )
+        return [translation.text for translation in translations]
+
+    async def translate_batch_detailed(
+        self,
+        texts: list[str],
+        source_language: str,
+        target_language: str,
+    ) -> list[ProviderTranslation]:
+        """
+        Translate multiple texts, reporting DeepL's detected source languages.
+
+        Args:
+            texts: List of texts to translate
+            source_language: Source language code
+            target_language: Target language code
+
+        Returns:
+            List of translations in the order of texts
+
         Raises:
             ValueError: If language is not supported
             Exception: If translation fails
@@ -105,9 +200,9 @@ class DeepLProvider(TranslationProvider):
         ):
             raise ValueError(f"Source language '{source_language}' is not supported")
 
-        # Translate all texts concurrently
+        # Translate all texts concurrently, bounded by the scheduler
         tasks = [
-            self._translate_with_retry(text, source_language, target_language)
+            self._translate_text(text, source_language, target_language)
             for text in texts
         ]
         return await asyncio.gather(*tasks)
@@ -151,12 +246,70 @@ class DeepLProvider(TranslationProvider):
         # Cap the delay at max_delay
         return min(delay, self.max_delay)
 
+    async def _translate_text(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str,
+    ) -> ProviderTranslation:
+        """
+        Translate a text, splitting it into chunks if it is too long.
+
+        Chunks are translated concurrently within the scheduler's budget and
+        reassembled in order, keeping the whitespace between them. The
+        language detected for the first chunk is reported for the text.
+
+        Args:
+            text: Text to translate
+            source_language: Source language code
+            target_language: Target language code
+
+        Returns:
+            Translated text with the detected source language
+
+        Raises:
+            Exception: If translating any chunk fails after all retries
+        """
+        chunks = split_text(text, self.max_chunk_chars)
+        if len(chunks) == 1:
+            return await self._translate_with_retry(
+                text, source_language, target_language
+            )
+
+        async def translate_chunk(chunk: str) -> ProviderTranslation:
+            leading, core, trailing = split_whitespace(chunk)
+            if not core:
+                return ProviderTranslation(chunk)
+            translated = await self._translate_with_retry(
+                core, source_language, target_language
+            )
+            return ProviderTranslation(
+                f"{leading}{translated.text}{trailing}",
+                translated.detected_source_language,
+            )
+
+        with tracer.span("deepl.chunked", chunks=len(chunks), characters=len(text)):
+            translated_chunks = await asyncio.gather(
+                *(translate_chunk(chunk) for chunk in chunks)
+            )
+        detected = next(
+            (
+                chunk.detected_source_language
+                for chunk in translated_chunks
+                if chunk.detected_source_language
+            ),
+            None,
+        )
+        return ProviderTranslation(
+            "".join(chunk.text for chunk in translated_chunks), detected
+        )
+
     async def _translate_with_retry(
         self,
         text: str,
         source_language: str,
         target_language: str,
-    ) -> str:
+    ) -> ProviderTranslation:
         """
         Translate with retry mechanism.
 
@@ -166,43 +319,76 @@ class DeepLProvider(TranslationProvider):
             target_language: Target language code
 
         Returns:
-            Translated text
+            Translated text with the detected source language
 
         Raises:
+            DeadlineExceededError: If the request deadline passes, or the
+                next retry could not finish before it
             Exception: If translation fails after all retries
         """
         last_error = None
 
         for attempt in range(self.max_retries):
+            check_deadline()
             try:
-                result = await call_remote_api(
-                    url=self.api_url,
-                    method="POST",
-                    headers={"Authorization": f"DeepL-Auth-Key {self.api_key}"},
-                    json_data={
-                        "text": [text],
-                        "source_lang": source_language.upper(),
-                        "target_lang": target_language.upper(),
-                    },
-                )
+                with tracer.span(
+                    "deepl.attempt", attempt=attempt + 1, characters=len(text)
+                ) as span:
+                    queued_at = time.monotonic()
+                    async with self.scheduler.slot():
+                        if span is not None:
+                            span.set_attribute(
+                                "scheduler.wait_ms",
+                                (time.monotonic() - queued_at) * 1000,
+                            )
+                        result = await call_remote_api(
+                            url=self.api_url,
+                            method="POST",
+                            headers={"Authorization": f"DeepL-Auth-Key {self.api_key}"},
+                            json_data={
+                                "text": [text],
+                                "source_lang": source_language.upper(),
+                                "target_lang": target_language.upper(),
+                            },
+                            client=self._client,
+                        )
 
                 if "translations" in result and result["translations"]:
-                    return result["translations"][0].get("text", "")
+                    translation = result["translations"][0]
+                    return ProviderTranslation(
+                        translation.get("text", ""),
+                        translation.get("detected_source_language"),
+                    )
 
                 raise ValueError("Invalid response format from DeepL API")
 
+            except DeadlineExceededError:
+                raise
             except Exception as e:
                 last_error = e
-                logger.warning(
-                    f"Translation attempt {attempt + 1}/{self.max_retries} failed: {str(e)}"
+                _attempt_logger.warning(
+                    "Translation attempt %d/%d failed: %s",
+                    attempt + 1,
+                    self.max_retries,
+                    e,
                 )
 
                 if attempt < self.max_retries - 1:
                     delay = self._calculate_backoff_delay(attempt)
-                    logger.debug(
-                        f"Retrying in {delay:.2f}s (exponential backoff, attempt {attempt + 1})"
+                    left = remaining()
+                    if left is not None and left <= delay:
+                        # The retry would start after the caller gave up
+                        raise DeadlineExceededError(
+                            f"Request deadline exceeded after {attempt + 1} "
+                            "translation attempts"
+                        ) from e
+                    _attempt_logger.debug(
+                        "Retrying in %.2fs (exponential backoff, attempt %d)",
+                        delay,
+                        attempt + 1,
                     )
-                    await asyncio.sleep(delay)
+                    with tracer.span("deepl.backoff", delay=delay):
+                        await asyncio.sleep(delay)
 
         raise Exception(
             f"Translation failed after {self.max_retries} retries"
@@ -0,0 +1,310 @@
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any
+
+from app.core.models import Language, ProviderTranslation
+from app.core.providers.base import TranslationProvider
+
+logger = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class RecordedProviderError(Exception):
+    """Replayed failure of a recorded provider call."""
+
+
+class UnrecordedTextError(LookupError):
+    """Raised when replaying a text that is not in the recording."""
+
+
+class RecordReplayProvider(TranslationProvider):
+    """
+    Records real provider traffic to a file and replays it offline.
+
+    In record mode every call is forwarded to the wrapped provider and
+    appended to a JSON lines file together with its batch size, latency,
+    outcome and the source languages the provider detected. In replay mode
+    translations (and detections) are served from that file after sleeping
+    for the recorded latency (scaled by speed), so load tests see realistic
+    timings without using provider quota.
+
+    Texts can be replayed in any batch composition. Latency is assumed to
+    grow linearly with batch size: a replayed batch of n texts takes, for
+    the recorded call of each of its texts, that call's latency times n over
+    the call's batch size, and waits for the longest of these. A batch
+    replayed exactly as it was recorded takes the recorded latency.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = REPLAY,
+        provider: TranslationProvider | None = None,
+        speed: float = 1.0,
+    ):
+        """
+        Initialize the provider.
+
+        Args:
+            path: Recording file (JSON lines)
+            mode: record or replay (default: replay)
+            provider: Provider whose traffic is recorded (record mode)
+            speed: Multiplier of replayed latencies; 0 replays instantly
+                (default: 1)
+
+        Raises:
+            ValueError: If the mode is unknown or record mode has no provider
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown record/replay mode '{mode}'")
+        if mode == RECORD and provider is None:
+            raise ValueError("Record mode needs a provider to record")
+        self.path = Path(path)
+        self.mode = mode
+        self.provider = provider
+        self.speed = speed
+        self._recordings: dict[tuple[str, str, str], dict[str, Any]] = {}
+        self._languages: list[Language] = []
+        if provider is not None:
+            self.detects_language = provider.detects_language
+        if mode == REPLAY:
+            self._load()
+
+    def _load(self) -> None:
+        """Index the recording by language pair and text."""
+        codes: dict[str, None] = {}
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                call = json.loads(line)
+                source = call["source_language"].upper()
+                target = call["target_language"].upper()
+                texts = call["texts"]
+                translations = call["translations"] or [None] * len(texts)
+                detected = call.get("detected_source_languages") or [None] * len(texts)
+                # Recordings from before batch sizes were written
+                batch_size = call.get("batch_size", len(texts))
+                for text, translated, language in zip(texts, translations, detected):
+                    self._recordings[(source, target, text)] = {
+                        "translation": translated,
+                        "detected_source_language": language,
+                        "latency": call["latency"],
+                        "batch_size": batch_size,
+                        "error": call["error"],
+                    }
+                    if language:
+                        self.detects_language = True
+                codes.update(dict.fromkeys(c for c in (source, target) if c != "AUTO"))
+        self._languages = [Language(code, code) for code in codes]
+        logger.info("Loaded %d recorded translations", len(self._recordings))
+
+    async def translate(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str,
+    ) -> str:
+        """
+        Translate text from source to target language.
+
+        Args:
+            text: Text to translate
+            source_language: Source language code
+            target_language: Target language code
+
+        Returns:
+            Translated text
+
+        Raises:
+            ValueError: If language is not supported
+            UnrecordedTextError: If the text was not recorded (replay mode)
+            Exception: If the (recorded) translation failed
+        """
+        [translated] = await self.translate_batch(
+            [text], source_language, target_language
+        )
+        return translated
+
+    async def translate_batch(
+        self,
+        texts: list[str],
+        source_language: str,
+        target_language: str,
+    ) -> list[str]:
+        """
+        Translate multiple texts from source to target language.
+
+        Args:
+            texts: List of texts to translate
+            source_language: Source language code
+            target_language: Target language code
+
+        Returns:
+            List of translated texts
+
+        Raises:
+            ValueError: If language is not supported
+            UnrecordedTextError: If a text was not recorded (replay mode)
+            Exception: If the (recorded) translation failed
+        """
+        translations = await self.translate_batch_detailed(
+            texts, source_language, target_language
+        )
+        return [translation.text for translation in translations]
+
+    async def translate_batch_detailed(
+        self,
+        texts: list[str],
+        source_language: str,
+        target_language: str,
+    ) -> list[ProviderTranslation]:
+        """
+        Translate multiple texts, reporting the detected source languages.
+
+        Args:
+            texts: List of texts to translate
+            source_language: Source language code
+            target_language: Target language code
+
+        Returns:
+            List of translations in the order of texts
+
+        Raises:
+            ValueError: If language is not supported
+            UnrecordedTextError: If a text was not recorded (replay mode)
+            Exception: If the (recorded) translation failed
+        """
+        if self.mode == REPLAY:
+            return await self._replay(texts, source_language, target_language)
+
+        # Record mode is only constructed with a provider
+        assert self.provider is not None
+        started = time.monotonic()
+        try:
+            translations = await self.provider.translate_batch_detailed(
+                texts, source_language, target_language
+            )
+        except ValueError:
+            # Invalid requests are not provider traffic
+            raise
+        except Exception as e:
+            await self._record(
+                texts, source_language, target_language, None, started, str(e)
+            )
+            raise
+        await self._record(
+            texts, source_language, target_language, translations, started, None
+        )
+        return translations
+
+    async def _record(
+        self,
+        texts: list[str],
+        source_language: str,
+        target_language: str,
+        translations: list[ProviderTranslation] | None,
+        started: float,
+        error: str | None,
+    ) -> None:
+        """Append a provider call to the recording."""
+        texts_out = detected = None
+        if translations is not None:
+            texts_out = [translation.text for translation in translations]
+            detected = [
+                translation.detected_source_language for translation in translations
+            ]
+        line = json.dumps(
+            {
+                "source_language": source_language,
+                "target_language": target_language,
+                "texts": texts,
+                "batch_size": len(texts),
+                "translations": texts_out,
+                "detected_source_languages": detected,
+                "latency": time.monotonic() - started,
+                "error": error,
+            },
+            ensure_ascii=False,
+        )
+        await asyncio.to_thread(self._append, line + "\n")
+
+    def _append(self, line: str) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(line)
+
+    async def _replay(
+        self, texts: list[str], source_language: str, target_language: str
+    ) -> list[ProviderTranslation]:
+        """Serve texts from the recording with their recorded latency."""
+        if not self.is_language_supported(target_language):
+            raise ValueError(f"Target language '{target_language}' is not supported")
+
+        pair = (source_language.upper(), target_language.upper())
+        found = [self._recordings.get((*pair, text)) for text in texts]
+        recorded = [entry for entry in found if entry is not None]
+        missing = len(texts) - len(recorded)
+        if missing:
+            raise UnrecordedTextError(
+                f"{missing} of {len(texts)} texts were not recorded for "
+                f"{pair[0]}->{pair[1]} in {self.path}"
+            )
+
+        if recorded and self.speed:
+            await asyncio.sleep(
+                max(
+                    entry["latency"] * len(texts) / entry["batch_size"]
+                    for entry in recorded
+                )
+                * self.speed
+            )
+        for entry in recorded:
+            if entry["error"] is not None:
+                raise RecordedProviderError(entry["error"])
+        return [
+            ProviderTranslation(entry["translation"], entry["detected_source_language"])
+            for entry in recorded
+        ]
+
+    async def start(self) -> None:
+        """Start the recorded provider."""
+        if self.provider is not None:
+            await self.provider.start()
+
+    async def close(self) -> None:
+        """Close the recorded provider."""
+        if self.provider is not None:
+            await self.provider.close()
+
+    def get_supported_languages(self) -> list[Language]:
+        """
+        Get list of supported languages.
+
+        Returns:
+            Languages of the recorded provider, or those seen in the
+            recording when replaying without one
+        """
+        if self.provider is not None:
+            return self.provider.get_supported_languages()
+        return self._languages
+
+    def is_language_supported(self, language_code: str) -> bool:
+        """
+        Check if a language is supported.
+
+        Args:
+            language_code: Language code to check
+
+        Returns:
+            True if supported, False otherwise
+        """
+        if self.provider is not None:
+            return self.provider.is_language_supported(language_code)
+        if language_code == "AUTO":
+            return True
+        return any(lang.code == language_code.upper() for lang in self._languages)
@@ -0,0 +1,185 @@
+import asyncio
+import random
+from typing import ClassVar
+
+from app.core.models import Language
+from app.core.providers.base import TranslationProvider
+from app.core.scheduler import PriorityScheduler
+
+
+class SyntheticProviderError(Exception):
+    """Injected provider failure."""
+
+
+class SyntheticProvider(TranslationProvider):
+    """
+    Deterministic local provider for load tests.
+
+    Translates ``text`` into ``[TARGET] text`` without any network access.
+    Every provider request sleeps for a log-normally distributed latency
+    (plus an optional per-character cost), fails with a configurable
+    probability, and is limited in size like a real API: larger batches are
+    split into several requests that share the scheduler's slots.
+    """
+
+    SUPPORTED_LANGUAGES: ClassVar[list[Language]] = [
+        Language("EN", "English"),
+        Language("ES", "Spanish"),
+        Language("RU", "Russian"),
+    ]
+
+    def __init__(
+        self,
+        latency_median: float = 0.1,
+        latency_sigma: float = 0.5,
+        latency_per_char: float = 0.0,
+        error_rate: float = 0.0,
+        max_batch_size: int = 50,
+        max_concurrency: int = 10,
+        scheduler: PriorityScheduler | None = None,
+        seed: int | None = None,
+    ):
+        """
+        Initialize the synthetic provider.
+
+        Args:
+            latency_median: Median latency of a request in seconds
+                (default: 0.1)
+            latency_sigma: Log-normal shape; 0 gives a constant latency
+                (default: 0.5)
+            latency_per_char: Additional seconds per character of a request
+                (default: 0)
+            error_rate: Probability of a request failing (default: 0)
+            max_batch_size: Maximum texts per request (default: 50)
+            max_concurrency: Maximum number of concurrent requests
+                (default: 10)
+            scheduler: Scheduler arbitrating requests between traffic classes
+                (default: interactive/bulk scheduler limited to
+                max_concurrency)
+            seed: Seed of latency and error sampling (default: random)
+        """
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.latency_per_char = latency_per_char
+        self.error_rate = error_rate
+        self.max_batch_size = max_batch_size
+        self.scheduler = scheduler or PriorityScheduler(max_concurrency)
+        self._random = random.Random(seed)
+
+    async def translate(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str,
+    ) -> str:
+        """
+        Translate text from source to target language.
+
+        Args:
+            text: Text to translate
+            source_language: Source language code
+            target_language: Target language code
+
+        Returns:
+            Pseudo-translated text
+
+        Raises:
+            ValueError: If language is not supported
+            SyntheticProviderError: If a failure is injected
+        """
+        [translated] = await self.translate_batch(
+            [text], source_language, target_language
+        )
+        return translated
+
+    async def translate_batch(
+        self,
+        texts: list[str],
+        source_language: str,
+        target_language: str,
+    ) -> list[str]:
+        """
+        Translate multiple texts in requests of at most max_batch_size texts.
+
+        Args:
+            texts: List of texts to translate
+            source_language: Source language code
+            target_language: Target language code
+
+        Returns:
+            List of pseudo-translated texts
+
+        Raises:
+            ValueError: If language is not supported
+            SyntheticProviderError: If a failure is injected
+        """
+        if not self.is_language_supported(target_language):
+            raise ValueError(f"Target language '{target_language}' is not supported")
+
+        if source_language != "AUTO" and not self.is_language_supported(
+            source_language
+        ):
+            raise ValueError(f"Source language '{source_language}' is not supported")
+
+        chunks = [
+            texts[start : start + self.max_batch_size]
+            for start in range(0, len(texts), self.max_batch_size)
+        ]
+        results = await asyncio.gather(
+            *(self._request(chunk, target_language) for chunk in chunks)
+        )
+        return [translated for chunk in results for translated in chunk]
+
+    async def _request(self, texts: list[str], target_language: str) -> list[str]:
+        """Simulate one provider request."""
+        async with self.scheduler.slot():
+            await asyncio.sleep(self._sample_latency(sum(len(t) for t in texts)))
+            if self.error_rate and self._random.random() < self.error_rate:
+                raise SyntheticProviderError("Injected synthetic provider failure")
+        return [self.pseudo_translate(text, target_language) for text in texts]
+
+    def _sample_latency(self, characters: int) -> float:
+        """Draw the latency of a request."""
+        latency = self.latency_median
+        if self.latency_sigma:
+            latency = self._random.lognormvariate(0.0, self.latency_sigma) * latency
+        return latency + characters * self.latency_per_char
+
+    @staticmethod
+    def pseudo_translate(text: str, target_language: str) -> str:
+        """
+        Get the deterministic translation of a text.
+
+        Args:
+            text: Text to translate
+            target_language: Target language code
+
+        Returns:
+            Pseudo-translated text
+        """
+        return f"[{target_language.upper()}] {text}"
+
+    def get_supported_languages(self) -> list[Language]:
+        """
+        Get list of supported languages.
+
+        Returns:
+            List of Language objects
+        """
+        return self.SUPPORTED_LANGUAGES
+
+    def is_language_supported(self, language_code: str) -> bool:
+        """
+        Check if a language is supported.
+
+        Args:
+            language_code: Language code to check
+
+        Returns:
+            True if supported, False otherwise
+        """
+        if language_code == "AUTO":
+            return True
+        return any(
+            lang.code == language_code.upper() for lang in self.SUPPORTED_LANGUAGES
+        )
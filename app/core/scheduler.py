@@ -0,0 +1,233 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+_current_traffic_class: ContextVar[str] = ContextVar(
+    "traffic_class", default=INTERACTIVE
+)
+
+
+def current_traffic_class() -> str:
+    """Get the traffic class of the current request context."""
+    return _current_traffic_class.get()
+
+
+@contextmanager
+def use_traffic_class(name: str) -> Iterator[None]:
+    """
+    Run the enclosed code (and tasks it spawns) under a traffic class.
+
+    Args:
+        name: Traffic class name
+    """
+    token = _current_traffic_class.set(name)
+    try:
+        yield
+    finally:
+        _current_traffic_class.reset(token)
+
+
+@dataclass
+class TrafficClass:
+    """Scheduling budget of a traffic class."""
+
+    name: str
+    weight: float = 1.0
+    max_concurrency: int = 10
+    rate_limit: float | None = None  # Requests per second, None for unlimited
+
+
+@dataclass
+class _ClassState:
+    """Runtime state of a traffic class."""
+
+    config: TrafficClass
+    waiters: deque[asyncio.Future[None]] = field(default_factory=deque)
+    active: int = 0
+    virtual_time: float = 0.0
+    tokens: float = 0.0
+    refilled_at: float = field(default_factory=time.monotonic)
+
+    def refill(self, now: float) -> None:
+        """Refill the token bucket of a rate-limited class."""
+        rate = self.config.rate_limit
+        if rate is None:
+            return
+        burst = max(1.0, rate)
+        self.tokens = min(burst, self.tokens + (now - self.refilled_at) * rate)
+        self.refilled_at = now
+
+
+class PriorityScheduler:
+    """
+    Weighted-fair scheduler in front of provider calls.
+
+    Every provider call takes a slot from the scheduler. Slots are limited
+    globally and per traffic class (concurrency and optional rate limit).
+    When a slot frees up, the waiting class with the smallest virtual time is
+    served next and its virtual time advances by ``1 / weight``, so classes
+    share capacity in proportion to their weights: bulk work soaks up spare
+    capacity but cannot starve interactive requests.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        classes: list[TrafficClass] | None = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Maximum number of slots across all classes
+            classes: Traffic classes (default: interactive and bulk)
+        """
+        if classes is None:
+            classes = [
+                TrafficClass(INTERACTIVE, weight=4.0, max_concurrency=max_concurrency),
+                TrafficClass(BULK, weight=1.0, max_concurrency=max_concurrency),
+            ]
+        self.max_concurrency = max_concurrency
+        self._classes = {
+            traffic_class.name: _ClassState(
+                config=traffic_class, tokens=traffic_class.rate_limit or 0.0
+            )
+            for traffic_class in classes
+        }
+        self._active = 0
+        self._virtual_time = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+
+    @property
+    def class_names(self) -> list[str]:
+        """Names of the configured traffic classes."""
+        return list(self._classes)
+
+    def queued(self, name: str | None = None) -> int:
+        """
+        Get the number of calls waiting for a slot.
+
+        Args:
+            name: Traffic class name (default: all classes)
+
+        Returns:
+            Number of waiting calls
+        """
+        states = self._classes.values() if name is None else [self._classes[name]]
+        return sum(
+            1 for state in states for waiter in state.waiters if not waiter.done()
+        )
+
+    def active(self, name: str | None = None) -> int:
+        """
+        Get the number of calls currently holding a slot.
+
+        Args:
+            name: Traffic class name (default: all classes)
+
+        Returns:
+            Number of active calls
+        """
+        if name is None:
+            return self._active
+        return self._classes[name].active
+
+    @asynccontextmanager
+    async def slot(self, name: str | None = None) -> AsyncIterator[None]:
+        """
+        Hold a provider slot for the duration of the block.
+
+        Args:
+            name: Traffic class name (default: class of the current context)
+
+        Raises:
+            ValueError: If the traffic class is unknown
+        """
+        name = name or current_traffic_class()
+        state = self._classes.get(name)
+        if state is None:
+            raise ValueError(f"Unknown traffic class '{name}'")
+
+        if not state.waiters and state.virtual_time < self._virtual_time:
+            # An idle class must not bank credit while it was not competing
+            state.virtual_time = self._virtual_time
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        state.waiters.append(waiter)
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release(state)
+            else:
+                try:
+                    state.waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+
+        try:
+            yield
+        finally:
+            self._release(state)
+
+    def _release(self, state: _ClassState) -> None:
+        """Return a slot and wake the next waiter."""
+        state.active -= 1
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant free slots to waiters in weighted-fair order."""
+        now = time.monotonic()
+        next_refill: float | None = None
+
+        while self._active < self.max_concurrency:
+            eligible: list[_ClassState] = []
+            for state in self._classes.values():
+                while state.waiters and state.waiters[0].done():
+                    state.waiters.popleft()
+                if not state.waiters:
+                    continue
+                if state.active >= state.config.max_concurrency:
+                    continue
+                if state.config.rate_limit is not None:
+                    state.refill(now)
+                    if state.tokens < 1.0:
+                        wait = (1.0 - state.tokens) / state.config.rate_limit
+                        next_refill = (
+                            wait if next_refill is None else min(next_refill, wait)
+                        )
+                        continue
+                eligible.append(state)
+
+            if not eligible:
+                break
+
+            state = min(eligible, key=lambda s: s.virtual_time)
+            waiter = state.waiters.popleft()
+            state.active += 1
+            self._active += 1
+            if state.config.rate_limit is not None:
+                state.tokens -= 1.0
+            self._virtual_time = state.virtual_time
+            state.virtual_time += 1.0 / state.config.weight
+            waiter.set_result(None)
+
+        if next_refill is not None and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                next_refill, self._on_timer
+            )
+
+    def _on_timer(self) -> None:
+        """Re-run dispatch once rate-limited classes have new tokens."""
+        self._timer = None
+        self._dispatch()
@@ -1,25 +1,79 @@
+import asyncio
 import logging
+from contextlib import AbstractAsyncContextManager, nullcontext
 
-from app.core.cache.base import TranslationCache
-from app.core.models import Language, TranslationResult
+from app.core.admission import AdmissionController
+from app.core.analytics import CacheAnalytics
+from app.core.cache.base import CacheScope, TranslationCache
+from app.core.language_index import DetectedLanguageIndex
+from app.core.log import RateLimitedLogger
+from app.core.models import (
+    Language,
+    ProviderTranslation,
+    TranslationItem,
+    TranslationResult,
+)
 from app.core.providers.base import TranslationProvider
+from app.core.tracing import tracer
+from app.core.translation_memory import MemoryMatch, TranslationMemory
 
 logger = logging.getLogger(__name__)
 
+# Cache hits and misses are logged on every request
+_cache_logger = RateLimitedLogger(logger)
+
 
 class TranslationService:
     """Service for managing translations with caching and provider flexibility."""
 
-    def __init__(self, provider: TranslationProvider, cache: TranslationCache):
+    def __init__(
+        self,
+        provider: TranslationProvider,
+        cache: TranslationCache,
+        admission: AdmissionController | None = None,
+        analytics: CacheAnalytics | None = None,
+        language_index: DetectedLanguageIndex | None = None,
+        translation_memory: TranslationMemory | None = None,
+    ):
         """
         Initialize translation service.
 
         Args:
             provider: Translation provider instance
             cache: Translation cache instance
+            admission: Optional admission controller for provider work
+            analytics: Optional cache analytics updated on every lookup
+            language_index: Optional index of detected source languages; when
+                set, translations requested with source language AUTO are
+                also cached under the detected language and AUTO lookups fall
+                back to that entry
+            translation_memory: Optional memory of provider translations;
+                when set, cache misses similar enough to a remembered text
+                are answered from it instead of the provider
         """
         self.provider = provider
         self.cache = cache
+        self.admission = admission
+        self.analytics = analytics
+        self.language_index = language_index
+        self.translation_memory = translation_memory
+
+    async def start(self) -> None:
+        """Open cache and provider connections before serving traffic."""
+        await asyncio.gather(self.cache.connect(), self.provider.start())
+
+    async def close(self) -> None:
+        """Close cache and provider connections."""
+        await asyncio.gather(self.provider.close(), self.cache.close())
+
+    async def ready(self) -> bool:
+        """
+        Check that the cache backend is reachable.
+
+        Returns:
+            True if the cache backend is reachable, False otherwise
+        """
+        return await self.cache.ping()
 
     async def translate(
         self,
@@ -40,31 +94,75 @@ class TranslationService:
 
         Raises:
             ValueError: If language is not supported
+            OverloadedError: If the text misses the cache and is shed
             Exception: If translation fails
         """
         # Check cache first
-        cache_key = self.cache._make_key(text, source_language, target_language)
-        cached_result = await self.cache.get(cache_key)
+        with tracer.span("cache.make_key"):
+            [cache_key] = await self.cache.make_keys(
+                [(text, source_language, target_language)]
+            )
+        with tracer.span("cache.lookup", keys=1):
+            cached_result = await self.cache.get(cache_key)
+            if not cached_result:
+                [cached_result] = await self._lookup_detected(
+                    [TranslationItem(text, source_language, target_language)]
+                )
+        if self.analytics is not None:
+            self.analytics.record(
+                cache_key,
+                text,
+                source_language,
+                target_language,
+                hit=bool(cached_result),
+            )
 
         if cached_result:
-            print(f"Cache hit for key: {cache_key}")
-            logger.info(f"Cache hit for key: {cache_key}")
+            _cache_logger.debug("Cache hit for key %s", cache_key)
             return TranslationResult(
                 original_text=text,
                 translated_text=cached_result,
                 source_language=source_language,
                 target_language=target_language,
             )
-        logger.info(f"Cache miss for key: {cache_key}")
-        # Translate using provider
-        translated_text = await self.provider.translate(
-            text=text,
-            source_language=source_language,
-            target_language=target_language,
+        _cache_logger.debug("Cache miss for key %s", cache_key)
+        [match] = await self._recall(
+            [TranslationItem(text, source_language, target_language)]
         )
+        if match is not None:
+            return TranslationResult(
+                original_text=text,
+                translated_text=match.translated_text,
+                source_language=source_language,
+                target_language=target_language,
+                match_score=match.score,
+            )
+        # Another replica may already be fetching this key
+        [leased] = await self.cache.acquire_leases([cache_key])
+        try:
+            translated_text = None
+            if not leased:
+                # Waiting does not use the provider, so it is not admitted
+                [translated_text] = await self.cache.wait_for([cache_key])
+            if not translated_text:
+                async with self._admit(1):
+                    # Translate using provider
+                    with tracer.span("provider.translate"):
+                        translation = await self._translate_one(
+                            text, source_language, target_language
+                        )
+                translated_text = translation.text
 
-        # Cache the result
-        await self.cache.set(cache_key, translated_text)
+                # Cache the result
+                with tracer.span("cache.store", keys=1):
+                    await self.cache.set(cache_key, translated_text)
+                    await self._store_detected({text: translation}, target_language)
+                await self._remember(
+                    {text: translated_text}, source_language, target_language
+                )
+        finally:
+            if leased:
+                await self.cache.release_leases([cache_key])
 
         return TranslationResult(
             original_text=text,
@@ -94,57 +192,402 @@ class TranslationService:
             ValueError: If language is not supported
             Exception: If translation fails
         """
-        results = []
+        return await self.translate_items(
+            [TranslationItem(text, source_language, target_language) for text in texts]
+        )
 
-        # Check cache for each text
-        texts_to_translate = []
-        cached_texts = {}
+    async def translate_multi(
+        self,
+        texts: list[str],
+        target_languages: list[str],
+        source_language: str = "AUTO",
+    ) -> dict[str, list[TranslationResult]]:
+        """
+        Translate multiple texts into several target languages at once.
 
-        for text in texts:
-            cache_key = self.cache._make_key(text, source_language, target_language)
-            cached_result = await self.cache.get(cache_key)
+        Args:
+            texts: List of texts to translate
+            target_languages: Target language codes
+            source_language: Source language code (default: AUTO)
 
-            if cached_result:
-                logger.info(f"Cache hit for key: {cache_key}")
-                cached_texts[text] = cached_result
-            else:
-                texts_to_translate.append(text)
+        Returns:
+            Mapping of target language code to the list of TranslationResult
+            objects for that language, in input order
 
-        # Translate uncached texts in batch
-        if texts_to_translate:
-            translated_texts = await self.provider.translate_batch(
-                texts=texts_to_translate,
-                source_language=source_language,
-                target_language=target_language,
-            )
+        Raises:
+            ValueError: If language is not supported
+            Exception: If translation fails
+        """
+        targets = list(dict.fromkeys(target_languages))
+        results = await self.translate_items(
+            [
+                TranslationItem(text, source_language, target)
+                for target in targets
+                for text in texts
+            ]
+        )
+
+        grouped: dict[str, list[TranslationResult]] = {target: [] for target in targets}
+        for result in results:
+            grouped[result.target_language].append(result)
+        return grouped
+
+    async def translate_items(
+        self, items: list[TranslationItem]
+    ) -> list[TranslationResult]:
+        """
+        Translate texts that may each use a different language pair.
+
+        All items are looked up in the cache with a single bulk read; the
+        misses are grouped by language pair and dispatched to the provider
+        concurrently, one batch per pair, under the provider's concurrency
+        limit. Results are returned in input order.
+
+        Args:
+            items: Texts with their source and target languages
 
-            # Cache translated results
-            for original, translated in zip(texts_to_translate, translated_texts):
-                cache_key = self.cache._make_key(
-                    original, source_language, target_language
+        Returns:
+            List of TranslationResult objects in the order of items
+
+        Raises:
+            ValueError: If language is not supported
+            OverloadedError: If some items miss the cache and are shed
+            Exception: If translation fails
+        """
+        with tracer.span("cache.make_keys", keys=len(items)):
+            keys = await self.cache.make_keys(
+                [
+                    (item.text, item.source_language, item.target_language)
+                    for item in items
+                ]
+            )
+        with tracer.span("cache.lookup", keys=len(keys)):
+            cached_results = await self.cache.get_many(keys)
+            missed = [i for i, result in enumerate(cached_results) if not result]
+            detected = await self._lookup_detected([items[i] for i in missed])
+            for i, result in zip(missed, detected):
+                cached_results[i] = result
+        if self.analytics is not None:
+            for item, cache_key, cached_result in zip(items, keys, cached_results):
+                self.analytics.record(
+                    cache_key,
+                    item.text,
+                    item.source_language,
+                    item.target_language,
+                    hit=bool(cached_result),
                 )
-                await self.cache.set(cache_key, translated)
 
-        # Build results list
-        for text in texts:
-            if text in cached_texts:
-                translated_text = cached_texts[text]
-            else:
-                # Find in translated batch
-                idx = texts_to_translate.index(text)
-                translated_text = translated_texts[idx]
-
-            results.append(
-                TranslationResult(
-                    original_text=text,
-                    translated_text=translated_text,
+        scores: list[float | None] = [None] * len(items)
+        missed = [i for i, result in enumerate(cached_results) if not result]
+        matches = await self._recall([items[i] for i in missed])
+        for i, match in zip(missed, matches):
+            if match is not None:
+                cached_results[i] = match.translated_text
+                scores[i] = match.score
+
+        misses: dict[tuple[str, str], dict[str, str]] = {}
+        for item, cache_key, cached_result in zip(items, keys, cached_results):
+            if not cached_result:
+                pair = (item.source_language, item.target_language)
+                misses.setdefault(pair, {})[item.text] = cache_key
+        _cache_logger.debug(
+            "Cache lookup of %d keys: %d misses",
+            len(keys),
+            sum(len(texts) for texts in misses.values()),
+        )
+
+        translated = await self._translate_uncached(misses)
+
+        return [
+            TranslationResult(
+                original_text=item.text,
+                translated_text=cached_result
+                or translated[(item.source_language, item.target_language)][item.text],
+                source_language=item.source_language,
+                target_language=item.target_language,
+                match_score=score,
+            )
+            for item, cached_result, score in zip(items, cached_results, scores)
+        ]
+
+    async def _translate_uncached(
+        self, misses: dict[tuple[str, str], dict[str, str]]
+    ) -> dict[tuple[str, str], dict[str, str]]:
+        """
+        Translate texts that missed the cache and store the results.
+
+        Keys leased by another fetcher (e.g. another replica sharing a Redis
+        cache) are waited for instead of translated; if they do not show up
+        in time they are translated here as a fallback. Only provider work
+        goes through admission control, so waiting for another fetcher does
+        not hold a slot in the provider queue.
+
+        Args:
+            misses: Mapping of (source, target) language pair to a mapping of
+                unique original text to its cache key
+
+        Returns:
+            Mapping of language pair to a mapping of original text to
+            translated text
+
+        Raises:
+            OverloadedError: If the texts to fetch are shed
+        """
+        keys = [cache_key for texts in misses.values() for cache_key in texts.values()]
+        if not keys:
+            return {}
+
+        leases = iter(await self.cache.acquire_leases(keys))
+        owned: dict[tuple[str, str], dict[str, str]] = {}
+        contended: dict[tuple[str, str], dict[str, str]] = {}
+        for pair, texts in misses.items():
+            for text, cache_key in texts.items():
+                group = owned if next(leases) else contended
+                group.setdefault(pair, {})[text] = cache_key
+
+        waiting = asyncio.ensure_future(
+            self.cache.wait_for(
+                [key for texts in contended.values() for key in texts.values()]
+            )
+        )
+        try:
+            translated = await self._fetch_pairs(owned)
+            waited = iter(await waiting)
+        finally:
+            # Stop waiting if the fetch failed or the request was cancelled
+            waiting.cancel()
+            await self.cache.release_leases(
+                [key for texts in owned.values() for key in texts.values()]
+            )
+
+        fallback: dict[tuple[str, str], dict[str, str]] = {}
+        for pair, texts in contended.items():
+            for text, cache_key in texts.items():
+                value = next(waited)
+                if value:
+                    translated.setdefault(pair, {})[text] = value
+                else:
+                    fallback.setdefault(pair, {})[text] = cache_key
+        for pair, fetched in (await self._fetch_pairs(fallback)).items():
+            translated.setdefault(pair, {}).update(fetched)
+        return translated
+
+    async def _fetch_pairs(
+        self, misses: dict[tuple[str, str], dict[str, str]]
+    ) -> dict[tuple[str, str], dict[str, str]]:
+        """
+        Translate texts of several language pairs under one admission.
+
+        The pairs are dispatched to the provider concurrently, one batch per
+        pair.
+
+        Args:
+            misses: Mapping of (source, target) language pair to a mapping of
+                unique original text to its cache key
+
+        Returns:
+            Mapping of language pair to a mapping of original text to
+            translated text
+
+        Raises:
+            OverloadedError: If the texts are shed
+        """
+        if not misses:
+            return {}
+        pairs = list(misses)
+        async with self._admit(sum(len(texts) for texts in misses.values())):
+            translated = await asyncio.gather(
+                *(self._fetch(misses[pair], *pair) for pair in pairs)
+            )
+        return dict(zip(pairs, translated))
+
+    async def _fetch(
+        self,
+        misses: dict[str, str],
+        source_language: str,
+        target_language: str,
+    ) -> dict[str, str]:
+        """
+        Translate texts with the provider and store the results.
+
+        Args:
+            misses: Mapping of unique original text to its cache key
+            source_language: Source language code
+            target_language: Target language code
+
+        Returns:
+            Mapping of original text to translated text
+        """
+        if not misses:
+            return {}
+
+        texts = list(misses)
+        with tracer.span(
+            "provider.translate_batch",
+            texts=len(texts),
+            source_language=source_language,
+            target_language=target_language,
+        ):
+            if self._detects(source_language):
+                translations = await self.provider.translate_batch_detailed(
+                    texts=texts,
                     source_language=source_language,
                     target_language=target_language,
                 )
+            else:
+                translations = [
+                    ProviderTranslation(translated_text)
+                    for translated_text in await self.provider.translate_batch(
+                        texts=texts,
+                        source_language=source_language,
+                        target_language=target_language,
+                    )
+                ]
+        detailed = dict(zip(texts, translations))
+        translated = {text: translation.text for text, translation in detailed.items()}
+
+        with tracer.span("cache.store", keys=len(translated)):
+            await self.cache.set_many(
+                {
+                    misses[text]: translated_text
+                    for text, translated_text in translated.items()
+                }
+            )
+            await self._store_detected(detailed, target_language)
+        await self._remember(translated, source_language, target_language)
+        return translated
+
+    async def _translate_one(
+        self, text: str, source_language: str, target_language: str
+    ) -> ProviderTranslation:
+        """Translate a single text with the provider."""
+        if self._detects(source_language):
+            translations = await self.provider.translate_batch_detailed(
+                [text], source_language, target_language
             )
+            return translations[0]
+        return ProviderTranslation(
+            await self.provider.translate(
+                text=text,
+                source_language=source_language,
+                target_language=target_language,
+            )
+        )
 
+    def _detects(self, source_language: str) -> bool:
+        """Check whether provider work should report detected languages."""
+        return (
+            self.language_index is not None
+            and source_language.upper() == "AUTO"
+            and getattr(self.provider, "detects_language", False) is True
+        )
+
+    async def _lookup_detected(self, items: list[TranslationItem]) -> list[str | None]:
+        """
+        Look up AUTO-source items under their detected source language.
+
+        Args:
+            items: Items that missed the cache
+
+        Returns:
+            Cached translations (or None) in the order of items
+        """
+        results: list[str | None] = [None] * len(items)
+        if self.language_index is None:
+            return results
+
+        aliased: dict[int, tuple[str, str, str]] = {}
+        for i, item in enumerate(items):
+            if item.source_language.upper() != "AUTO":
+                continue
+            language = self.language_index.get(item.text)
+            if language is not None:
+                aliased[i] = (item.text, language, item.target_language)
+        if not aliased:
+            return results
+
+        keys = await self.cache.make_keys(list(aliased.values()))
+        for i, value in zip(aliased, await self.cache.get_many(keys)):
+            results[i] = value
         return results
 
+    async def _store_detected(
+        self, translations: dict[str, ProviderTranslation], target_language: str
+    ) -> None:
+        """
+        Also cache AUTO-source translations under their detected language.
+
+        Args:
+            translations: Mapping of original text to provider translation
+            target_language: Target language code
+        """
+        detected = {
+            text: (translation.detected_source_language, translation.text)
+            for text, translation in translations.items()
+            if translation.detected_source_language
+        }
+        if self.language_index is None or not detected:
+            return
+
+        for text, (language, _) in detected.items():
+            self.language_index.set(text, language)
+        keys = await self.cache.make_keys(
+            [
+                (text, language, target_language)
+                for text, (language, _) in detected.items()
+            ]
+        )
+        await self.cache.set_many(
+            {key: translated for key, (_, translated) in zip(keys, detected.values())}
+        )
+
+    async def _recall(self, items: list[TranslationItem]) -> list[MemoryMatch | None]:
+        """
+        Look up items that missed the cache in the translation memory.
+
+        Args:
+            items: Items that missed the cache
+
+        Returns:
+            Matches (or None) in the order of items
+        """
+        if self.translation_memory is None or not items:
+            return [None] * len(items)
+        with tracer.span("memory.lookup", texts=len(items)):
+            return await self.translation_memory.lookup_many(
+                [
+                    (item.text, item.source_language, item.target_language)
+                    for item in items
+                ]
+            )
+
+    async def _remember(
+        self, translated: dict[str, str], source_language: str, target_language: str
+    ) -> None:
+        """
+        Add provider translations to the translation memory.
+
+        Args:
+            translated: Mapping of original text to translated text
+            source_language: Source language code
+            target_language: Target language code
+        """
+        if self.translation_memory is not None:
+            await self.translation_memory.add_many(
+                translated, source_language, target_language
+            )
+
+    def _admit(self, items: int) -> AbstractAsyncContextManager[None]:
+        """
+        Pass provider work through admission control, if configured.
+
+        Args:
+            items: Number of texts sent to the provider
+        """
+        if self.admission is None or not items:
+            return nullcontext()
+        return self.admission.admit(items)
+
     def get_supported_languages(self) -> list[Language]:
         """
         Get list of supported languages from the provider.
@@ -154,6 +597,12 @@ class TranslationService:
         """
         return self.provider.get_supported_languages()
 
-    async def clear_cache(self) -> None:
-        """Clear all cached translations."""
-        await self.cache.clear()
+    async def clear_cache(self, scope: CacheScope | None = None) -> None:
+        """
+        Clear cached translations.
+
+        Args:
+            scope: Only clear translations of this language pair scope, e.g.
+                after a glossary change (default: all)
+        """
+        await self.cache.clear(scope)
@@ -0,0 +1,429 @@
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+from abc import ABC, abstractmethod
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_TRACEPARENT_RE = re.compile(
+    r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$", re.IGNORECASE
+)
+
+
+@dataclass
+class Span:
+    """A timed stage of a request."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        """Span duration in milliseconds (0 while the span is open)."""
+        if self.end_ns is None:
+            return 0.0
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        """W3C ``traceparent`` header value for calls made within this span."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the span for file export."""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Span | None:
+    """Get the sampled span of the current context, if any."""
+    return _current_span.get()
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    """
+    Parse a W3C ``traceparent`` header.
+
+    Args:
+        header: Header value
+
+    Returns:
+        (trace id, parent span id, sampled flag), or None if invalid
+    """
+    if not header:
+        return None
+    match = _TRACEPARENT_RE.match(header.strip())
+    if match is None:
+        return None
+    trace_id, parent_id, flags = match.groups()
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id.lower(), parent_id.lower(), bool(int(flags, 16) & 1)
+
+
+class SpanExporter(ABC):
+    """Abstract destination for finished spans."""
+
+    @abstractmethod
+    async def export(self, spans: list[Span]) -> None:
+        """
+        Export a batch of finished spans.
+
+        Args:
+            spans: Finished spans
+        """
+
+    async def shutdown(self) -> None:
+        """Release exporter resources."""
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends spans as JSON lines to a local file."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the exporter.
+
+        Args:
+            path: File to append spans to
+        """
+        self.path = Path(path)
+
+    async def export(self, spans: list[Span]) -> None:
+        lines = "".join(json.dumps(span.to_dict()) + "\n" for span in spans)
+        await asyncio.to_thread(self._append, lines)
+
+    def _append(self, lines: str) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class OTLPHttpSpanExporter(SpanExporter):
+    """Sends spans to an OTLP/HTTP collector using the JSON encoding."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str = "translator-api",
+        timeout: float = 5.0,
+    ):
+        """
+        Initialize the exporter.
+
+        Args:
+            endpoint: Collector traces URL, e.g. http://collector:4318/v1/traces
+            service_name: Value of the ``service.name`` resource attribute
+            timeout: Request timeout in seconds
+        """
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self._client = httpx.AsyncClient(timeout=timeout)
+
+    async def export(self, spans: list[Span]) -> None:
+        response = await self._client.post(self.endpoint, json=self._encode(spans))
+        response.raise_for_status()
+
+    async def shutdown(self) -> None:
+        await self._client.aclose()
+
+    def _encode(self, spans: list[Span]) -> dict[str, Any]:
+        """Encode spans as an OTLP ExportTraceServiceRequest."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            _otlp_attribute("service.name", self.service_name)
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "app.core.tracing"},
+                            "spans": [
+                                {
+                                    "traceId": span.trace_id,
+                                    "spanId": span.span_id,
+                                    "parentSpanId": span.parent_id or "",
+                                    "name": span.name,
+                                    "kind": 2 if span.parent_id is None else 1,
+                                    "startTimeUnixNano": str(span.start_ns),
+                                    "endTimeUnixNano": str(span.end_ns),
+                                    "attributes": [
+                                        _otlp_attribute(key, value)
+                                        for key, value in span.attributes.items()
+                                    ],
+                                    "status": (
+                                        {"code": 2, "message": span.error}
+                                        if span.error
+                                        else {"code": 1}
+                                    ),
+                                }
+                                for span in spans
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+def _otlp_attribute(key: str, value: Any) -> dict[str, Any]:
+    """Encode an attribute as an OTLP KeyValue."""
+    encoded: dict[str, Any]
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+class _NoopSpanContext:
+    """Context manager used when the current request is not sampled."""
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NOOP = _NoopSpanContext()
+
+
+class _SpanContext:
+    """Context manager that opens a span and makes it current."""
+
+    def __init__(self, tracer: "Tracer", span: Span):
+        self._tracer = tracer
+        self._span = span
+        self._token: Token[Span | None] | None = None
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._span.end_ns = time.time_ns()
+        if exc is not None:
+            self._span.error = f"{type(exc).__name__}: {exc}"
+        if self._token is not None:
+            _current_span.reset(self._token)
+        self._tracer._finish(self._span)
+
+
+class Tracer:
+    """
+    Minimal tracer with W3C trace-context propagation and sampling.
+
+    Spans are only recorded below a sampled root span, so unsampled requests
+    pay a single context variable lookup per stage. Finished spans are
+    buffered and exported in batches from a background task.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        exporter: SpanExporter | None = None,
+        max_batch_size: int = 512,
+        max_buffer_size: int = 8192,
+        export_interval: float = 5.0,
+    ):
+        """
+        Initialize the tracer.
+
+        Args:
+            sample_rate: Fraction of new traces to record (default: 0, off)
+            exporter: Destination of finished spans (default: none)
+            max_batch_size: Spans per export call
+            max_buffer_size: Spans buffered before new ones are dropped
+            export_interval: Seconds between background exports
+        """
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self.max_batch_size = max_batch_size
+        self.max_buffer_size = max_buffer_size
+        self.export_interval = export_interval
+        self._buffer: list[Span] = []
+        self._export_task: asyncio.Task | None = None
+
+    def configure(self, sample_rate: float, exporter: SpanExporter | None) -> None:
+        """
+        Change sampling and export at runtime.
+
+        Args:
+            sample_rate: Fraction of new traces to record
+            exporter: Destination of finished spans
+        """
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any spans can be recorded."""
+        return self.exporter is not None
+
+    def start_trace(
+        self, name: str, traceparent: str | None = None, **attributes: Any
+    ) -> "_SpanContext | _NoopSpanContext":
+        """
+        Open the root span of a request.
+
+        Continues the caller's trace when a valid ``traceparent`` is given
+        (honouring its sampled flag), otherwise starts a new trace sampled at
+        sample_rate.
+
+        Args:
+            name: Span name
+            traceparent: Incoming W3C ``traceparent`` header
+            **attributes: Span attributes
+
+        Returns:
+            Context manager yielding the span (or None when not sampled)
+        """
+        if not self.enabled:
+            return _NOOP
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+            sampled = random.random() < self.sample_rate
+        if not sampled:
+            return _NOOP
+        return _SpanContext(
+            self,
+            Span(
+                name=name,
+                trace_id=trace_id,
+                span_id=f"{random.getrandbits(64):016x}",
+                parent_id=parent_id,
+                attributes=attributes,
+            ),
+        )
+
+    def span(self, name: str, **attributes: Any) -> "_SpanContext | _NoopSpanContext":
+        """
+        Open a child span of the current span.
+
+        Args:
+            name: Span name
+            **attributes: Span attributes
+
+        Returns:
+            Context manager yielding the span (or None when not sampled)
+        """
+        parent = _current_span.get()
+        if parent is None:
+            return _NOOP
+        return _SpanContext(
+            self,
+            Span(
+                name=name,
+                trace_id=parent.trace_id,
+                span_id=f"{random.getrandbits(64):016x}",
+                parent_id=parent.span_id,
+                attributes=attributes,
+            ),
+        )
+
+    def inject(self, headers: dict[str, str] | None) -> dict[str, str] | None:
+        """
+        Add the ``traceparent`` header of the current span to outgoing headers.
+
+        Args:
+            headers: Outgoing request headers
+
+        Returns:
+            Headers including ``traceparent`` when a span is active
+        """
+        span = _current_span.get()
+        if span is None:
+            return headers
+        return {**(headers or {}), "traceparent": span.traceparent}
+
+    def _finish(self, span: Span) -> None:
+        """Buffer a finished span for export."""
+        if len(self._buffer) >= self.max_buffer_size:
+            return
+        self._buffer.append(span)
+        if self._export_task is None or self._export_task.done():
+            try:
+                self._export_task = asyncio.get_running_loop().create_task(
+                    self._export_loop()
+                )
+            except RuntimeError:
+                # No running loop (e.g. synchronous tests); flush() exports
+                pass
+
+    async def _export_loop(self) -> None:
+        """Export buffered spans periodically until the buffer stays empty."""
+        while self._buffer:
+            await asyncio.sleep(self.export_interval)
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Export all buffered spans now."""
+        while self._buffer and self.exporter is not None:
+            batch = self._buffer[: self.max_batch_size]
+            del self._buffer[: self.max_batch_size]
+            try:
+                await self.exporter.export(batch)
+            except Exception:
+                # Any exporter failure must not stop the export loop
+                logger.warning(
+                    "Span export failed, dropped %d spans", len(batch), exc_info=True
+                )
+
+    async def shutdown(self) -> None:
+        """Flush buffered spans and release the exporter."""
+        if self._export_task is not None:
+            self._export_task.cancel()
+            self._export_task = None
+        await self.flush()
+        if self.exporter is not None:
+            await self.exporter.shutdown()
+
+
+# Process-wide tracer, configured at startup
+tracer = Tracer()
@@ -0,0 +1,311 @@
+import asyncio
+import re
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+# Placeholders ({name}, {{name}}, %s, %(name)d) and numbers (3, 1,000.50)
+_VALUE = re.compile(r"\{\{[^{}]*\}\}|\{[^{}]*\}|%(?:\([^)]*\))?[sdif]|\d+(?:[.,]\d+)*")
+_SLOT = re.compile("\x00(\\d+)\x00")
+_PUNCTUATION = re.compile(r"[^\w\s\x00]+")
+_SPACE = re.compile(r"\s+")
+
+# Texts are masked and hashed in a worker thread above this many characters
+OFFLOAD_SIGNATURE_SIZE = 64 * 1024
+
+_HASH_MASK = (1 << 64) - 1
+
+_Key = tuple[str, str, str]
+T = TypeVar("T")
+
+
+@dataclass
+class MemoryMatch:
+    """A translation recalled from the translation memory."""
+
+    translated_text: str
+    score: float
+
+
+@dataclass
+class _Entry:
+    target: str
+    slots: int
+    signature: tuple[int, ...]
+
+
+@dataclass
+class _Prepared:
+    template: str
+    values: list[str]
+    signature: tuple[int, ...]
+
+
+def mask(text: str) -> tuple[str, list[str]]:
+    """
+    Replace the numbers and placeholders of a text with numbered slots.
+
+    Args:
+        text: Original text
+
+    Returns:
+        Template and the values cut out of it, in order
+    """
+    values: list[str] = []
+
+    def slot(match: re.Match) -> str:
+        values.append(match.group())
+        return f"\x00{len(values) - 1}\x00"
+
+    return _VALUE.sub(slot, text), values
+
+
+def _mask_translation(translation: str, values: list[str]) -> str | None:
+    """Turn a translation into a template with the slots of its source."""
+    if not values:
+        return translation
+    if len(set(values)) != len(values):
+        # Which occurrence goes into which slot would be a guess
+        return None
+    pattern = re.compile(
+        "|".join(
+            # A number must not be part of a longer number or word
+            rf"(?<![\w.,]){re.escape(value)}(?!\w|[.,]\d)"
+            if value[0].isdigit()
+            else re.escape(value)
+            for value in sorted(values, key=len, reverse=True)
+        )
+    )
+    if sorted(pattern.findall(translation)) != sorted(values):
+        return None
+    return pattern.sub(lambda m: f"\x00{values.index(m.group())}\x00", translation)
+
+
+def _fill(template: str, values: list[str]) -> str:
+    """Put values into the slots of a template."""
+    return _SLOT.sub(lambda m: values[int(m.group(1))], template)
+
+
+class TranslationMemory:
+    """
+    Bounded in-process memory of provider translations with fuzzy lookup.
+
+    Numbers and placeholders are masked before texts are compared, so
+    templated strings ("You have 3 items", "You have 4 items") share one
+    entry and the values are put back into the remembered translation. Texts
+    whose template is not remembered are matched against similar ones with
+    a MinHash/LSH index over character trigrams (ignoring case and
+    punctuation); a match is returned only if its estimated Jaccard
+    similarity reaches threshold. The least recently used entries are
+    dropped once max_entries is reached.
+
+    Signatures use one-permutation hashing: every trigram is hashed once and
+    binned, so the cost grows with the text, not with the signature length.
+    Large inputs are masked and hashed in a worker thread; the index itself
+    is only touched on the event loop.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        threshold: float = 0.9,
+        num_perm: int = 64,
+        bands: int = 16,
+    ):
+        """
+        Initialize the memory.
+
+        Args:
+            max_entries: Maximum number of templates remembered
+                (default: 100000)
+            threshold: Minimum similarity of a fuzzy match (default: 0.9)
+            num_perm: MinHash signature length (default: 64)
+            bands: LSH bands the signature is split into; more bands find
+                less similar candidates (default: 16)
+
+        Raises:
+            ValueError: If num_perm is not a multiple of bands
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self._rows = num_perm // bands
+        # Filled-in bins get values above any real hash in their bin
+        self._densify_step = _HASH_MASK // num_perm + 1
+        self._entries: OrderedDict[_Key, _Entry] = OrderedDict()
+        self._buckets: dict[tuple, set[_Key]] = {}
+
+    def _signature(self, template: str) -> tuple[int, ...]:
+        """Compute the MinHash signature of a template."""
+        normalized = _SPACE.sub(" ", _PUNCTUATION.sub("", template.lower())).strip()
+        shingles = {normalized[i : i + 3] for i in range(max(len(normalized) - 2, 1))}
+        bins = self.num_perm
+        # str hashes are salted per process; signatures never leave it
+        minimums: dict[int, int] = {}
+        for shingle in shingles:
+            value, index = divmod(hash(shingle) & _HASH_MASK, bins)
+            if value < minimums.get(index, _HASH_MASK):
+                minimums[index] = value
+        # Empty bins borrow the next filled bin's value (rotation densification)
+        filled = sorted(minimums)
+        signature = []
+        position = 0
+        for index in range(bins):
+            while position < len(filled) and filled[position] < index:
+                position += 1
+            source = filled[position] if position < len(filled) else filled[0] + bins
+            signature.append(
+                minimums[source % bins] + (source - index) * self._densify_step
+            )
+        return tuple(signature)
+
+    def _prepare(self, text: str) -> _Prepared:
+        """Mask a text and compute the signature of its template."""
+        template, values = mask(text)
+        return _Prepared(template, values, self._signature(template))
+
+    async def _offload(self, size: int, work: Callable[[], T]) -> T:
+        """Run CPU-bound work in a worker thread if the input is large."""
+        if size < OFFLOAD_SIGNATURE_SIZE:
+            return work()
+        return await asyncio.to_thread(work)
+
+    def _bucket_keys(
+        self, source: str, target: str, signature: tuple[int, ...]
+    ) -> list[tuple]:
+        """Get the LSH buckets of a signature within a language pair."""
+        return [
+            (
+                source,
+                target,
+                band,
+                signature[band * self._rows : (band + 1) * self._rows],
+            )
+            for band in range(self.bands)
+        ]
+
+    async def lookup_many(
+        self, items: list[tuple[str, str, str]]
+    ) -> list[MemoryMatch | None]:
+        """
+        Recall the translations of texts or of similar ones.
+
+        Args:
+            items: (text, source language, target language) tuples
+
+        Returns:
+            Translations with their similarity score (1.0 if only numbers or
+            placeholders differ), or None where nothing is similar enough,
+            in the order of items
+        """
+        prepared = await self._offload(
+            sum(len(text) for text, _, _ in items),
+            lambda: [self._prepare(text) for text, _, _ in items],
+        )
+        return [
+            self._match(source.upper(), target.upper(), entry)
+            for (_, source, target), entry in zip(items, prepared)
+        ]
+
+    def _match(
+        self, source: str, target: str, prepared: _Prepared
+    ) -> MemoryMatch | None:
+        """Find the remembered template closest to a prepared text."""
+        key = (source, target, prepared.template)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return MemoryMatch(_fill(entry.target, prepared.values), 1.0)
+
+        signature = prepared.signature
+        candidates: set[_Key] = set()
+        for bucket in self._bucket_keys(source, target, signature):
+            candidates |= self._buckets.get(bucket, set())
+
+        best: tuple[float, _Key] | None = None
+        for candidate in candidates:
+            entry = self._entries[candidate]
+            if entry.slots != len(prepared.values):
+                continue
+            agreeing = sum(x == y for x, y in zip(signature, entry.signature))
+            score = agreeing / len(signature)
+            if score >= self.threshold and (best is None or score > best[0]):
+                best = (score, candidate)
+        if best is None:
+            return None
+        score, key = best
+        self._entries.move_to_end(key)
+        return MemoryMatch(_fill(self._entries[key].target, prepared.values), score)
+
+    async def add_many(
+        self,
+        translations: dict[str, str],
+        source_language: str,
+        target_language: str,
+    ) -> None:
+        """
+        Remember translations.
+
+        Translations that do not contain each number and placeholder of
+        their text exactly once are not remembered, since their template is
+        ambiguous.
+
+        Args:
+            translations: Mapping of original text to its translation
+            source_language: Source language code
+            target_language: Target language code
+        """
+        if self.max_entries <= 0 or not translations:
+            return
+
+        def prepare() -> list[tuple[_Prepared, str | None]]:
+            entries = []
+            for text, translated_text in translations.items():
+                prepared = self._prepare(text)
+                entries.append(
+                    (prepared, _mask_translation(translated_text, prepared.values))
+                )
+            return entries
+
+        prepared = await self._offload(
+            sum(
+                len(text) + len(translated) for text, translated in translations.items()
+            ),
+            prepare,
+        )
+        source, target = source_language.upper(), target_language.upper()
+        for entry, target_template in prepared:
+            if target_template is not None:
+                self._store(source, target, entry, target_template)
+
+    def _store(
+        self, source: str, target: str, prepared: _Prepared, target_template: str
+    ) -> None:
+        """Add or refresh a template in the index."""
+        key = (source, target, prepared.template)
+        if key in self._entries:
+            self._entries[key].target = target_template
+            self._entries.move_to_end(key)
+            return
+        signature = prepared.signature
+        self._entries[key] = _Entry(target_template, len(prepared.values), signature)
+        for bucket in self._bucket_keys(source, target, signature):
+            self._buckets.setdefault(bucket, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop the least recently used entry."""
+        key, entry = self._entries.popitem(last=False)
+        for bucket in self._bucket_keys(key[0], key[1], entry.signature):
+            members = self._buckets[bucket]
+            members.discard(key)
+            if not members:
+                del self._buckets[bucket]
+
+    def __len__(self) -> int:
+        return len(self._entries)
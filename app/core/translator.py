@@ -1,7 +1,14 @@
+import asyncio
 from typing import Any
 
 import httpx
 
+from app.core.deadline import timeout_for
+from app.core.tracing import tracer
+
+# Response bodies larger than this (in bytes) are parsed in a worker thread
+OFFLOAD_JSON_SIZE = 256 * 1024
+
 
 async def call_remote_api(
     url: str,
@@ -10,6 +17,7 @@ async def call_remote_api(
     params: dict[str, Any] | None = None,
     json_data: dict[str, Any] | None = None,
     timeout: float = 30.0,
+    client: httpx.AsyncClient | None = None,
 ) -> dict[str, Any]:
     """
     Call a remote REST API endpoint asynchronously using httpx.
@@ -20,7 +28,10 @@ async def call_remote_api(
         headers: Optional HTTP headers
         params: Optional query parameters
         json_data: Optional JSON request body
-        timeout: Request timeout in seconds (default: 30)
+        timeout: Request timeout in seconds, shortened to the time left
+            before the request deadline (default: 30)
+        client: Shared client whose connection pool is reused (default: a
+            new client for this call)
 
     Returns:
         Dictionary containing the response data
@@ -28,14 +39,31 @@ async def call_remote_api(
     Raises:
         httpx.HTTPError: If the request fails
         httpx.TimeoutException: If the request times out
+        DeadlineExceededError: If the request deadline has already passed
     """
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.request(
-            method=method.upper(),
-            url=url,
-            headers=headers,
-            params=params,
-            json=json_data,
-        )
+    timeout = timeout_for(timeout)
+    # No traceparent: trace ids are internal and must not leak to third parties
+    with tracer.span("http.request", **{"http.method": method.upper()}) as span:
+
+        async def send(http: httpx.AsyncClient) -> httpx.Response:
+            return await http.request(
+                method.upper(),
+                url,
+                headers=headers,
+                params=params,
+                json=json_data,
+                timeout=timeout,
+            )
+
+        if client is not None:
+            response = await send(client)
+        else:
+            async with httpx.AsyncClient() as new_client:
+                response = await send(new_client)
+        if span is not None:
+            span.set_attribute("http.status_code", response.status_code)
         response.raise_for_status()
-        return response.json()
+        with tracer.span("http.parse_json"):
+            if len(response.content) >= OFFLOAD_JSON_SIZE:
+                return await asyncio.to_thread(response.json)
+            return response.json()
@@ -0,0 +1,121 @@
+"""
+Benchmark Redis value compression: memory saved versus CPU cost.
+
+Usage:
+    python -m benchmarks.compression [--corpus FILE] [--samples N]
+
+FILE holds one translation per line (blank lines are skipped). Without it a
+synthetic corpus mixing short UI strings, sentences and long paragraphs in
+English, Spanish and Russian is used. A quarter of the corpus trains the
+dictionary, the rest is measured.
+"""
+
+import argparse
+import random
+import time
+
+from app.core.cache.compression import ValueCodec, train_dictionary
+
+# Vocabulary per language, as space-separated words
+_VOCABULARY = {
+    "EN": (
+        "the service translation your account order has been shipped please "
+        "check settings update payment page customer support we are sorry for "
+        "the delay thank you for choosing our product new message available "
+        "download the latest version to continue with this feature"
+    ),
+    "ES": (
+        "el servicio traducción su cuenta pedido ha sido enviado por favor "
+        "revise la configuración actualice el pago página atención al cliente "
+        "lamentamos el retraso gracias por elegir nuestro producto nuevo "
+        "mensaje disponible descargue la última versión para continuar"
+    ),
+    "RU": (
+        "сервис перевод ваш аккаунт заказ был отправлен пожалуйста проверьте "
+        "настройки обновите оплату страница поддержка клиентов приносим "
+        "извинения за задержку спасибо что выбрали наш продукт новое "
+        "сообщение доступно загрузите последнюю версию чтобы продолжить"
+    ),
+}
+
+
+def _sentence(rng: random.Random, words: list[str]) -> str:
+    sentence = " ".join(rng.choices(words, k=rng.randint(6, 18)))
+    return sentence.capitalize() + rng.choice([".", ".", "!", "?"])
+
+
+def synthetic_corpus(samples: int, seed: int = 42) -> list[str]:
+    """Generate a mix of UI strings, sentences and paragraphs."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(samples):
+        words = _VOCABULARY[rng.choice(list(_VOCABULARY))].split()
+        kind = rng.random()
+        if kind < 0.4:
+            corpus.append(" ".join(rng.choices(words, k=rng.randint(1, 4))))
+        elif kind < 0.8:
+            corpus.append(_sentence(rng, words))
+        else:
+            corpus.append(
+                " ".join(_sentence(rng, words) for _ in range(rng.randint(5, 40)))
+            )
+    return corpus
+
+
+def measure(name: str, codec: ValueCodec, corpus: list[str]) -> None:
+    """Print stored size and encode/decode cost of a codec on a corpus."""
+    raw = sum(len(value.encode()) for value in corpus)
+
+    started = time.perf_counter()
+    stored = [codec.encode(value) for value in corpus]
+    encode_us = (time.perf_counter() - started) / len(corpus) * 1e6
+
+    started = time.perf_counter()
+    for value in stored:
+        codec.decode(value)
+    decode_us = (time.perf_counter() - started) / len(corpus) * 1e6
+
+    stored_bytes = sum(len(value) for value in stored)
+    print(
+        f"{name:<28} {stored_bytes:>12,} {100 * (1 - stored_bytes / raw):>7.1f}% "
+        f"{encode_us:>10.2f} {decode_us:>10.2f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="File with one translation per line")
+    parser.add_argument("--samples", type=int, default=20000)
+    args = parser.parse_args()
+
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            corpus = [line.rstrip("\n") for line in f if line.strip()]
+    else:
+        corpus = synthetic_corpus(args.samples)
+
+    split = len(corpus) // 4
+    training, corpus = corpus[:split], corpus[split:]
+    dictionary = train_dictionary(training)
+    raw = sum(len(value.encode()) for value in corpus)
+
+    print(f"{len(corpus):,} values, {raw:,} bytes raw")
+    print(f"{'codec':<28} {'stored':>12} {'saved':>8} {'enc µs':>10} {'dec µs':>10}")
+    measure("plain", ValueCodec(threshold=None), corpus)
+    for threshold in (128, 512, 2048):
+        for level in (1, 6):
+            measure(
+                f"zlib >={threshold}B level {level}",
+                ValueCodec(threshold=threshold, level=level),
+                corpus,
+            )
+    for threshold in (32, 128):
+        measure(
+            f"zlib+dict >={threshold}B",
+            ValueCodec(threshold=threshold, dictionary=dictionary),
+            corpus,
+        )
+
+
+if __name__ == "__main__":
+    main()
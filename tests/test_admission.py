@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import AdmissionController, OverloadedError
+
+
+@pytest.mark.asyncio
+async def test_admission_admits_when_idle():
+    """Test work is admitted on an idle controller regardless of size."""
+    controller = AdmissionController(max_queued=2)
+
+    async with controller.admit(10):
+        assert controller.pending == 10
+
+    assert controller.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_admission_rejects_full_queue():
+    """Test work is shed when the queue bound is exceeded."""
+    controller = AdmissionController(max_queued=5, max_queue_wait=100.0)
+
+    async with controller.admit(4):
+        with pytest.raises(OverloadedError, match="queue is full"):
+            async with controller.admit(2):
+                pass
+        async with controller.admit(1):
+            assert controller.pending == 5
+
+
+@pytest.mark.asyncio
+async def test_admission_rejects_slow_queue():
+    """Test work is shed when the estimated wait exceeds the deadline."""
+    controller = AdmissionController(
+        max_queue_wait=1.0, concurrency=2, initial_latency=0.6
+    )
+
+    async with controller.admit(2):
+        with pytest.raises(OverloadedError) as exc_info:
+            async with controller.admit(1):
+                pass
+
+    assert exc_info.value.retry_after == pytest.approx(0.2)
+    assert exc_info.value.retry_after_header == "1"
+
+
+@pytest.mark.asyncio
+async def test_admission_learns_latency():
+    """Test completed work updates the latency estimate."""
+    controller = AdmissionController(initial_latency=1.0, smoothing=1.0)
+
+    async with controller.admit(1):
+        await asyncio.sleep(0.01)
+
+    assert controller.latency < 0.5
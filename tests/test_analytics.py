@@ -0,0 +1,66 @@
+from app.core.analytics import (
+    OTHER_PAIR,
+    CacheAnalytics,
+    CountMinSketch,
+    HyperLogLog,
+    _hash128,
+)
+
+
+def test_count_min_sketch_never_underestimates():
+    """Test count-min sketch estimates are upper bounds."""
+    sketch = CountMinSketch(width=64, depth=4)
+    for i in range(500):
+        sketch.add(_hash128(f"key{i % 50}"))
+
+    assert all(sketch.estimate(_hash128(f"key{i}")) >= 10 for i in range(50))
+
+
+def test_hyperloglog_estimates_cardinality():
+    """Test HyperLogLog stays within a few percent of the true count."""
+    hll = HyperLogLog(precision=12)
+    for i in range(20000):
+        hll.add(_hash128(f"key{i % 10000}"))
+
+    assert abs(hll.count() - 10000) < 500
+
+
+def test_cache_analytics_report():
+    """Test per-pair hit ratios, characters saved and hot keys."""
+    analytics = CacheAnalytics(top_k=2)
+    for _ in range(5):
+        analytics.record("hot", "hello", "EN", "ES", hit=True)
+    analytics.record("warm", "world", "EN", "ES", hit=False)
+    analytics.record("warm", "world", "EN", "ES", hit=True)
+    for i in range(3):
+        analytics.record(f"cold{i}", "bye", "en", "ru", hit=False)
+
+    report = analytics.snapshot()
+
+    assert report["lookups"] == 10
+    assert report["hit_ratio"] == 0.6
+    assert report["characters_saved"] == 30
+    assert report["working_set_estimate"] == 5
+    en_es, en_ru = report["language_pairs"]
+    assert (en_es["hits"], en_es["misses"]) == (6, 1)
+    assert (en_ru["target_language"], en_ru["hit_ratio"]) == ("RU", 0.0)
+    assert [key["key"] for key in report["hot_keys"]] == ["hot", "warm"]
+    assert report["hot_keys"][0]["text_preview"] == "hello"
+
+
+def test_cache_analytics_bounds_language_pairs():
+    """Test unknown language pairs beyond max_pairs share one entry."""
+    analytics = CacheAnalytics(max_pairs=3)
+    for i in range(100):
+        analytics.record(f"key{i}", "text", "EN", f"X{i}", hit=False)
+    analytics.record("key0", "text", "EN", "X0", hit=True)
+
+    pairs = {
+        (pair["source_language"], pair["target_language"]): pair
+        for pair in analytics.snapshot()["language_pairs"]
+    }
+
+    assert len(analytics.pairs) == 4
+    assert pairs[("EN", "X0")]["hits"] == 1
+    assert pairs[OTHER_PAIR]["misses"] == 97
+    assert analytics.snapshot()["lookups"] == 101
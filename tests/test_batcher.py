@@ -0,0 +1,86 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.batcher import MicroBatcher
+from app.core.cache.memory import InMemoryTranslationCache
+from app.core.deadline import remaining, use_deadline
+from app.core.models import Language, TranslationItem
+from app.core.service import TranslationService
+
+
+class EchoProvider:
+    """Provider translating text into its upper-cased form."""
+
+    def __init__(self):
+        self.translate_batch = AsyncMock(side_effect=self._translate_batch)
+        self.deadlines = []
+
+    async def _translate_batch(self, texts, source_language, target_language):
+        if target_language == "XX":
+            raise ValueError("Target language 'XX' is not supported")
+        self.deadlines.append(remaining())
+        return [text.upper() for text in texts]
+
+    def get_supported_languages(self):
+        return [Language("EN", "English"), Language("ES", "Spanish")]
+
+    def is_language_supported(self, code: str):
+        return code in ["EN", "ES", "AUTO"]
+
+
+@pytest.fixture
+def batcher():
+    """Create a batcher over a service with an echo provider."""
+    service = TranslationService(
+        provider=EchoProvider(), cache=InMemoryTranslationCache()
+    )
+    return MicroBatcher(service, max_batch_size=10, max_delay=0.01)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_texts_share_one_provider_call(batcher):
+    """Test texts submitted together go out as a single batch."""
+    results = await asyncio.gather(
+        *(batcher.translate(TranslationItem(text, "EN", "ES")) for text in "abc")
+    )
+
+    assert [result.translated_text for result in results] == ["A", "B", "C"]
+    assert batcher.service.provider.translate_batch.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting(batcher):
+    """Test a batch reaching max_batch_size is not held back."""
+    batcher.max_delay = 10
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            *(batcher.translate(TranslationItem(str(i), "EN", "ES")) for i in range(10))
+        ),
+        timeout=1,
+    )
+
+    assert len(results) == 10
+
+
+@pytest.mark.asyncio
+async def test_failing_pair_does_not_fail_other_pairs(batcher):
+    """Test an error only reaches the callers of its language pair."""
+    good, bad = await asyncio.gather(
+        batcher.translate(TranslationItem("a", "EN", "ES")),
+        batcher.translate(TranslationItem("b", "EN", "XX")),
+        return_exceptions=True,
+    )
+
+    assert good.translated_text == "A"
+    assert isinstance(bad, ValueError)
+
+
+@pytest.mark.asyncio
+async def test_batches_do_not_inherit_caller_deadline(batcher):
+    """Test a shared batch is not bound by the deadline of one caller."""
+    with use_deadline(5.0):
+        await batcher.translate(TranslationItem("a", "EN", "ES"))
+
+    assert batcher.service.provider.deadlines == [None]
@@ -1,6 +1,9 @@
+import asyncio
+
 import pytest
 import pytest_asyncio
 
+from app.core.cache.base import KEY_FORMAT_VERSION, CacheScope
 from app.core.cache.memory import InMemoryTranslationCache
 
 
@@ -49,9 +52,77 @@ async def test_cache_clear(cache):
 async def test_cache_make_key(cache):
     """Test cache key generation."""
     key = cache._make_key("hello", "EN", "ES")
-    # Should be a 64-character SHA256 hex digest
+    # Layout version and language pair followed by a 64-character SHA256 digest
     assert isinstance(key, str)
-    assert len(key) == 64
+    assert key.startswith(f"{KEY_FORMAT_VERSION}:EN:ES:")
+    assert len(key.split(":")[-1]) == 64
 
     key2 = cache._make_key("hello", "EN", "ES")
     assert key == key2
+
+
+@pytest.mark.asyncio
+async def test_cache_get_many_and_set_many(cache):
+    """Test bulk cache operations."""
+    await cache.set_many({"key1": "value1", "key2": "value2"})
+
+    assert await cache.get_many(["key1", "missing", "key2"]) == [
+        "value1",
+        None,
+        "value2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cache_clear_scope(cache):
+    """Test clearing only one language pair."""
+    en_es = cache._make_key("hello", "EN", "ES")
+    en_ru = cache._make_key("hello", "en", "ru")
+    await cache.set_many({en_es: "hola", en_ru: "привет"})
+
+    await cache.clear(CacheScope(target_language="ru"))
+
+    assert await cache.get(en_es) == "hola"
+    assert await cache.get(en_ru) is None
+
+
+@pytest.mark.asyncio
+async def test_cache_clear_scope_yields_between_batches(cache):
+    """Test a scoped clear lets other tasks run between batches."""
+    keys = [cache._make_key(f"text {index}", "EN", "ES") for index in range(10)]
+    await cache.set_many({key: "hola" for key in keys})
+    # Keys from before the layout was versioned are never in a scope
+    await cache.set("a" * 64, "legacy")
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    ticker = asyncio.create_task(tick())
+    await asyncio.sleep(0)
+    await cache.clear(CacheScope(target_language="ES"), batch_size=3)
+    ticker.cancel()
+
+    assert await cache.get_many(keys) == [None] * len(keys)
+    assert await cache.get("a" * 64) == "legacy"
+    assert ticks >= 4
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used():
+    """Test a bounded cache drops the entries read or written longest ago."""
+    cache = InMemoryTranslationCache(max_entries=2)
+    await cache.set_many({"key1": "value1", "key2": "value2"})
+    await cache.get("key1")
+
+    await cache.set("key3", "value3")
+
+    assert cache.get_cache_size() == 2
+    assert await cache.get_many(["key1", "key2", "key3"]) == [
+        "value1",
+        None,
+        "value3",
+    ]
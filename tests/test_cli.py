@@ -0,0 +1,132 @@
+import argparse
+import csv
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app import cli
+from app.core.cache.memory import InMemoryTranslationCache
+from app.core.models import Language
+from app.core.service import TranslationService
+
+
+class UpperProvider:
+    """Provider upper-casing texts, optionally failing on one text."""
+
+    def __init__(self, fail_on: str | None = None):
+        self.fail_on = fail_on
+        self.translate_batch = AsyncMock(side_effect=self._translate_batch)
+
+    async def _translate_batch(self, texts, source_language, target_language):
+        if self.fail_on in texts:
+            raise RuntimeError("provider down")
+        return [text.upper() for text in texts]
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    def get_supported_languages(self):
+        return [Language("EN", "English"), Language("ES", "Spanish")]
+
+    def is_language_supported(self, code: str):
+        return True
+
+
+def make_args(tmp_path, input_name, output_name, **overrides):
+    """Build the parsed command line of a run."""
+    values = {
+        "input": str(tmp_path / input_name),
+        "output": str(tmp_path / output_name),
+        "format": None,
+        "text_field": "text",
+        "source_language": "EN",
+        "target_language": "ES",
+        "batch_size": 2,
+        "concurrency": 2,
+        "checkpoint": None,
+    }
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+
+def use_provider(monkeypatch, provider):
+    """Make the CLI build its service around provider."""
+    monkeypatch.setattr(
+        cli,
+        "create_service",
+        lambda: TranslationService(provider=provider, cache=InMemoryTranslationCache()),
+    )
+
+
+@pytest.mark.asyncio
+async def test_cli_resumes_from_checkpoint(tmp_path, monkeypatch):
+    """Test an interrupted run resumes without translating done rows again."""
+    texts = ["a", "b", "c", "d", "e"]
+    (tmp_path / "in.jsonl").write_text(
+        "".join(json.dumps({"id": i, "text": t}) + "\n" for i, t in enumerate(texts))
+    )
+    args = make_args(tmp_path, "in.jsonl", "out.jsonl", concurrency=1)
+
+    use_provider(monkeypatch, UpperProvider(fail_on="c"))
+    with pytest.raises(RuntimeError):
+        await cli.run(args)
+    checkpoint = cli.Checkpoint.load(tmp_path / "out.jsonl.checkpoint")
+    assert checkpoint.rows == 2
+
+    provider = UpperProvider()
+    use_provider(monkeypatch, provider)
+    assert await cli.run(args) == 3
+
+    lines = (tmp_path / "out.jsonl").read_text().splitlines()
+    assert [json.loads(line)["translated_text"] for line in lines] == [
+        "A",
+        "B",
+        "C",
+        "D",
+        "E",
+    ]
+    translated = [
+        text
+        for call in provider.translate_batch.call_args_list
+        for text in call.kwargs["texts"]
+    ]
+    assert translated == ["c", "d", "e"]
+
+
+@pytest.mark.asyncio
+async def test_cli_translates_csv(tmp_path, monkeypatch):
+    """Test CSV records keep their columns and order."""
+    with (tmp_path / "in.csv").open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["key", "text"])
+        writer.writerows([["k1", "one"], ["k2", "two"], ["k3", "three"]])
+    use_provider(monkeypatch, UpperProvider())
+
+    await cli.run(make_args(tmp_path, "in.csv", "out.csv"))
+
+    with (tmp_path / "out.csv").open(newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["key"] for row in rows] == ["k1", "k2", "k3"]
+    assert [row["translated_text"] for row in rows] == ["ONE", "TWO", "THREE"]
+
+
+@pytest.mark.asyncio
+async def test_cli_skips_records_without_text(tmp_path, monkeypatch, caplog):
+    """Test records missing the text field are counted instead of failing."""
+    records = [{"text": "a"}, {"id": 1}, {"id": 2}, {"id": 3}, {"text": "e"}]
+    (tmp_path / "in.jsonl").write_text(
+        "".join(json.dumps(record) + "\n" for record in records)
+    )
+    args = make_args(tmp_path, "in.jsonl", "out.jsonl")
+    use_provider(monkeypatch, UpperProvider())
+
+    assert await cli.run(args) == 2
+
+    lines = (tmp_path / "out.jsonl").read_text().splitlines()
+    assert [json.loads(line)["translated_text"] for line in lines] == ["A", "E"]
+    assert cli.Checkpoint.load(tmp_path / "out.jsonl.checkpoint").rows == 5
+    assert "Skipped 3 rows without a 'text' field" in caplog.text
@@ -0,0 +1,170 @@
+import asyncio
+from unittest.mock import create_autospec
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.api.dependencies import get_translation_service
+from app.api.main import app
+from app.api.schemas import BatchTranslationItem
+from app.client.translator import TranslatorClient, TranslatorClientError
+from app.core.cache.memory import InMemoryTranslationCache
+from app.core.config import settings
+from app.core.providers.base import TranslationProvider
+from app.core.service import TranslationService
+
+
+@pytest.fixture
+def service():
+    """Create a translation service with mock provider and real cache."""
+    provider = create_autospec(TranslationProvider, spec_set=True)
+
+    async def translate_batch(texts, source_language, target_language):
+        if target_language == "XX":
+            raise ValueError("Unsupported target language: XX")
+        return [f"{text} ({target_language})" for text in texts]
+
+    provider.translate_batch.side_effect = translate_batch
+    service = TranslationService(provider=provider, cache=InMemoryTranslationCache())
+    app.dependency_overrides[get_translation_service] = lambda: service
+    yield service
+    app.dependency_overrides.pop(get_translation_service, None)
+
+
+@pytest.fixture
+def requests():
+    """Paths of the requests the client sends."""
+    return []
+
+
+@pytest_asyncio.fixture
+async def client(service, requests):
+    """Create a client talking to the app in process."""
+
+    async def record(request: httpx.Request) -> None:
+        requests.append(request.url.path)
+
+    transport = httpx.ASGITransport(app=app)
+    async with TranslatorClient("http://test", transport=transport) as client:
+        client._http.event_hooks["request"].append(record)
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_translate_calls_share_batch(client, service, requests):
+    """Test concurrent translate calls are sent as one batch per language pair."""
+    results = await asyncio.gather(
+        client.translate("Hello", "EN", "DE"),
+        client.translate("World", "EN", "DE"),
+        client.translate("Hello", "EN", "DE"),
+        client.translate("Hello", "EN", "FR"),
+    )
+
+    assert [result.translated_text for result in results] == [
+        "Hello (DE)",
+        "World (DE)",
+        "Hello (DE)",
+        "Hello (FR)",
+    ]
+    assert requests == ["/api/v1/translate/batch"] * 2
+    texts = sorted(
+        call.kwargs["texts"] for call in service.provider.translate_batch.call_args_list
+    )
+    assert texts == [["Hello"], ["Hello", "World"]]
+
+
+@pytest.mark.asyncio
+async def test_coalesced_calls_promoted_with_token(service, monkeypatch):
+    """Test coalesced calls are sent as interactive traffic with the token."""
+    monkeypatch.setattr(settings, "traffic_class_token", "secret")
+    headers = []
+
+    async def record(request: httpx.Request) -> None:
+        headers.append(request.headers)
+
+    transport = httpx.ASGITransport(app=app)
+    async with TranslatorClient(
+        "http://test", traffic_class_token="secret", transport=transport
+    ) as client:
+        client._http.event_hooks["request"].append(record)
+        result = await client.translate("Hello", "EN", "DE")
+
+    assert result.translated_text == "Hello (DE)"
+    assert headers[0]["X-Traffic-Class"] == "interactive"
+    assert headers[0]["X-Traffic-Class-Token"] == "secret"
+
+
+@pytest.mark.asyncio
+async def test_translate_uses_local_cache(client, requests):
+    """Test repeated texts are answered without a request."""
+    first = await client.translate("Hello", "EN", "DE")
+    second = await client.translate("Hello", "en", "de")
+
+    assert second == first
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_local_cache_evicts_least_recently_used(service, requests):
+    """Test the local cache keeps only cache_size results."""
+    transport = httpx.ASGITransport(app=app)
+    async with TranslatorClient(
+        "http://test", transport=transport, cache_size=1
+    ) as client:
+        await client.translate("Hello", "EN", "DE")
+        await client.translate("World", "EN", "DE")
+        await client.translate("Hello", "EN", "DE")
+
+    assert service.provider.translate_batch.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_translate_error_fails_only_its_pair(client):
+    """Test an API error reaches the callers of the failed language pair."""
+    good, bad = await asyncio.gather(
+        client.translate("Hello", "EN", "DE"),
+        client.translate("Hello", "EN", "XX"),
+        return_exceptions=True,
+    )
+
+    assert good.translated_text == "Hello (DE)"
+    assert isinstance(bad, TranslatorClientError)
+    assert bad.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_translate_batch_fills_local_cache(client, requests):
+    """Test translate_batch results answer later translate calls."""
+    translations = await client.translate_batch(["Hello", "World"], "EN", "DE")
+    result = await client.translate("World", "EN", "DE")
+
+    assert [t.translated_text for t in translations] == ["Hello (DE)", "World (DE)"]
+    assert result.translated_text == "World (DE)"
+    assert requests == ["/api/v1/translate/batch"]
+
+
+@pytest.mark.asyncio
+async def test_translate_stream(client):
+    """Test streaming texts and items through the NDJSON endpoint."""
+
+    async def texts():
+        yield "Hello"
+        yield BatchTranslationItem(text="World", target_language="FR")
+
+    results = [
+        result.translated_text
+        async for result in client.translate_stream(texts(), "EN", "DE")
+    ]
+
+    assert results == ["Hello (DE)", "World (FR)"]
+
+
+@pytest.mark.asyncio
+async def test_translate_stream_error(client):
+    """Test a rejected stream raises TranslatorClientError."""
+    with pytest.raises(TranslatorClientError) as exc_info:
+        async for _ in client.translate_stream(["Hello"], "EN", "XX"):
+            pass
+
+    assert exc_info.value.status_code == 400
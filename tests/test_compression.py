@@ -0,0 +1,60 @@
+from app.core.cache.compression import ValueCodec, train_dictionary
+
+PARAGRAPH = (
+    "The quick brown fox jumps over the lazy dog while the translation "
+    "service keeps every paragraph in the cache for a whole day. "
+) * 20
+
+
+def test_codec_compresses_large_values():
+    """Test values above the threshold are stored compressed."""
+    codec = ValueCodec(threshold=256)
+    stored = codec.encode(PARAGRAPH)
+
+    assert stored.startswith(b"\x00z")
+    assert len(stored) < len(PARAGRAPH.encode()) / 4
+    assert codec.decode(stored) == PARAGRAPH
+
+
+def test_codec_keeps_small_values_plain():
+    """Test values below the threshold are stored as plain UTF-8."""
+    codec = ValueCodec(threshold=256)
+
+    assert codec.encode("привет") == "привет".encode()
+    assert codec.decode("привет".encode()) == "привет"
+
+
+def test_codec_reads_entries_written_without_compression():
+    """Test plain and compressed entries coexist."""
+    plain = ValueCodec(threshold=None)
+    compressing = ValueCodec(threshold=64)
+
+    assert compressing.decode(plain.encode(PARAGRAPH)) == PARAGRAPH
+    assert plain.decode(compressing.encode(PARAGRAPH)) == PARAGRAPH
+
+
+def test_codec_escapes_values_starting_with_marker():
+    """Test plain values that look like a format marker round-trip."""
+    codec = ValueCodec(threshold=None)
+    value = "\x00z not compressed"
+
+    assert codec.decode(codec.encode(value)) == value
+
+
+def test_codec_with_trained_dictionary():
+    """Test a trained dictionary helps short strings and must match."""
+    samples = [
+        f"You have {i} new messages in your inbox. Open the app to read them."
+        for i in range(50)
+    ]
+    dictionary = train_dictionary(samples, size=1024)
+    value = "You have 7 new messages in your inbox. Open the app to read them."
+
+    with_dictionary = ValueCodec(threshold=16, dictionary=dictionary)
+    stored = with_dictionary.encode(value)
+    assert stored.startswith(b"\x00d")
+    assert len(stored) < len(ValueCodec(threshold=16).encode(value))
+    assert with_dictionary.decode(stored) == value
+
+    # Entries written with another dictionary are treated as misses
+    assert ValueCodec(dictionary=b"other dictionary").decode(stored) is None
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import AdmissionController
+from app.core.deadline import (
+    DeadlineExceededError,
+    check_deadline,
+    remaining,
+    run_with_deadline,
+    timeout_for,
+    use_deadline,
+)
+
+
+def test_no_deadline_keeps_default_timeout():
+    """Test timeouts are untouched outside of a deadline."""
+    assert remaining() is None
+    assert timeout_for(30.0) == 30.0
+    check_deadline()
+
+
+def test_nested_deadline_only_shortens():
+    """Test an inner deadline cannot extend the outer one."""
+    with use_deadline(1.0):
+        with use_deadline(60.0):
+            assert remaining() <= 1.0
+        with use_deadline(0.5):
+            assert timeout_for(30.0) <= 0.5
+        with use_deadline(None):
+            assert remaining() <= 1.0
+    assert remaining() is None
+
+
+def test_expired_deadline_raises():
+    """Test work is refused once the deadline has passed."""
+    with use_deadline(0.0):
+        with pytest.raises(DeadlineExceededError):
+            check_deadline()
+        with pytest.raises(DeadlineExceededError):
+            timeout_for(30.0)
+
+
+@pytest.mark.asyncio
+async def test_run_with_deadline_cancels_slow_work():
+    """Test work still running at the deadline is cancelled."""
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(DeadlineExceededError):
+        await run_with_deadline(slow(), 0.05)
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_run_with_deadline_keeps_timeouts_of_the_work():
+    """Test a timeout raised by the work itself is not a missed deadline."""
+
+    async def read_socket():
+        raise TimeoutError("read timed out")
+
+    with pytest.raises(TimeoutError, match="read timed out"):
+        await run_with_deadline(read_socket(), 10)
+
+
+@pytest.mark.asyncio
+async def test_deadline_propagates_to_spawned_tasks():
+    """Test tasks created under a deadline inherit it."""
+
+    async def child():
+        return remaining()
+
+    async def work():
+        return await asyncio.gather(child(), child())
+
+    results = await run_with_deadline(work(), 5.0)
+    assert all(0 < left <= 5.0 for left in results)
+
+
+@pytest.mark.asyncio
+async def test_admission_sheds_work_that_would_miss_the_deadline():
+    """Test queued work is refused when it cannot finish in time."""
+    controller = AdmissionController(concurrency=1, initial_latency=1.0)
+    async with controller.admit(1):
+        with use_deadline(0.5), pytest.raises(DeadlineExceededError):
+            async with controller.admit(1):
+                pass
+        async with controller.admit(1):
+            pass
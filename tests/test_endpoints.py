@@ -1,12 +1,22 @@
+import asyncio
+import json
 from unittest.mock import AsyncMock, create_autospec, patch
 
 import pytest
+from fastapi import HTTPException, Request
 from fastapi.testclient import TestClient
 
-from app.api.dependencies import get_translation_service
-from app.api.main import app
+from app.api.dependencies import get_micro_batcher, get_translation_service
+from app.api.main import app, lifespan
+from app.api.translation import _run_request
+from app.core.admission import OverloadedError
+from app.core.analytics import CacheAnalytics
+from app.core.batcher import MicroBatcher
 from app.core.cache.memory import InMemoryTranslationCache
+from app.core.config import settings
+from app.core.lifecycle import lifecycle
 from app.core.providers.base import TranslationProvider
+from app.core.providers.record_replay import UnrecordedTextError
 from app.core.service import TranslationService
 
 
@@ -53,6 +63,7 @@ def test_translate_single_text(client, service):
     assert data["original_text"] == "Hello, how are you?"
     assert data["translated_text"] == "Здравствуйте, как поживаете?"
 
+
 def test_translate_batch_text(client, service):
     """Test batch text translation endpoint."""
     service.provider.translate_batch.return_value = [
@@ -75,7 +86,57 @@ def test_translate_batch_text(client, service):
     assert data["translations"][0]["translated_text"] == "Здравствуйте"
     assert data["translations"][1]["original_text"] == "How are you?"
     assert data["translations"][1]["translated_text"] == "Как дела?"
-    
+
+
+def test_translate_batch_mixed_pairs(client, service):
+    """Test batch endpoint with per-item language pairs."""
+    service.provider.translate_batch.side_effect = [["Hola"], ["Привет"]]
+
+    response = client.post(
+        "/api/v1/translate/batch",
+        json={
+            "items": [
+                {"text": "Hello", "target_language": "ES"},
+                {"text": "Hi", "source_language": "EN", "target_language": "RU"},
+            ],
+            "source_language": "EN",
+        },
+    )
+    data = response.json()
+    assert response.status_code == 200
+    assert [t["translated_text"] for t in data["translations"]] == ["Hola", "Привет"]
+    assert data["translations"][0]["source_language"] == "EN"
+    assert data["translations"][1]["target_language"] == "RU"
+
+
+def test_translate_batch_requires_texts(client, service):
+    """Test batch requests without texts or items are rejected."""
+    for body in ({}, {"texts": [], "items": []}):
+        response = client.post("/api/v1/translate/batch", json=body)
+        assert response.status_code == 422
+        assert "at least one entry" in response.text
+    service.provider.translate_batch.assert_not_called()
+
+
+def test_translate_multi_target(client, service):
+    """Test multi-target translation endpoint groups results by language."""
+    service.provider.translate_batch.side_effect = [["Hola"], ["Привет"]]
+
+    response = client.post(
+        "/api/v1/translate/multi",
+        json={
+            "texts": ["Hello"],
+            "source_language": "EN",
+            "target_languages": ["ES", "RU"],
+        },
+    )
+    data = response.json()
+    assert response.status_code == 200
+    assert data["translations"]["ES"][0]["translated_text"] == "Hola"
+    assert data["translations"]["RU"][0]["translated_text"] == "Привет"
+    assert data["translations"]["RU"][0]["target_language"] == "RU"
+
+
 # def test_translate_batch(client):
 #     """Test batch translation endpoint."""
 #     with patch("app.api.dependencies.get_translation_service") as mock_service_dep:
@@ -142,3 +203,309 @@ def test_translate_unsupported_language_error(client):
         )
 
         assert response.status_code == 400
+
+
+def test_translate_unknown_traffic_class(client):
+    """Test an unknown X-Traffic-Class header is rejected."""
+    response = client.post(
+        "/api/v1/translate/",
+        json={"text": "hello", "target_language": "ES"},
+        headers={"X-Traffic-Class": "urgent"},
+    )
+    assert response.status_code == 400
+
+
+def test_traffic_class_promotion_needs_token(client, service, monkeypatch):
+    """Test only callers with the token can promote bulk routes."""
+    service.provider.translate.return_value = "Hola"
+    service.provider.translate_batch.return_value = ["Hola"]
+    body = {"texts": ["hello"], "target_language": "ES"}
+    promote = {"X-Traffic-Class": "interactive"}
+
+    response = client.post("/api/v1/translate/batch", json=body, headers=promote)
+    assert response.status_code == 403
+
+    monkeypatch.setattr(settings, "traffic_class_token", "secret")
+    response = client.post(
+        "/api/v1/translate/batch",
+        json=body,
+        headers={**promote, "X-Traffic-Class-Token": "wrong"},
+    )
+    assert response.status_code == 403
+    response = client.post(
+        "/api/v1/translate/batch",
+        json=body,
+        headers={**promote, "X-Traffic-Class-Token": "secret"},
+    )
+    assert response.status_code == 200
+
+    response = client.post(
+        "/api/v1/translate/",
+        json={"text": "hello", "target_language": "ES"},
+        headers={"X-Traffic-Class": "bulk"},
+    )
+    assert response.status_code == 200
+
+
+def test_translate_overloaded_returns_503(client, service):
+    """Test shed requests get 503 with a Retry-After header."""
+    service.provider.translate.side_effect = OverloadedError("busy", 2.5)
+
+    response = client.post(
+        "/api/v1/translate/",
+        json={"text": "hello", "target_language": "ES"},
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+
+
+def test_translate_unrecorded_text_returns_422(client, service):
+    """Test replaying a text missing from the recording is a client error."""
+    service.provider.translate.side_effect = UnrecordedTextError(
+        "1 of 1 texts were not recorded for AUTO->ES in recordings.jsonl"
+    )
+
+    response = client.post(
+        "/api/v1/translate/",
+        json={"text": "hello", "target_language": "ES"},
+    )
+    assert response.status_code == 422
+    assert "not recorded" in response.json()["detail"]
+
+
+def test_translate_past_deadline_returns_504(client, service):
+    """Test a request still running at its deadline gets 504."""
+
+    async def slow_translate(*args, **kwargs):
+        await asyncio.sleep(1)
+        return "hola"
+
+    service.provider.translate.side_effect = slow_translate
+
+    response = client.post(
+        "/api/v1/translate/",
+        json={"text": "hello", "target_language": "ES"},
+        headers={"X-Request-Timeout": "0.05"},
+    )
+    assert response.status_code == 504
+
+
+def test_translate_provider_timeout_returns_500(client, service):
+    """Test a provider timeout within the deadline is not answered with 504."""
+    service.provider.translate.side_effect = TimeoutError("read timed out")
+
+    response = client.post(
+        "/api/v1/translate/",
+        json={"text": "hello", "target_language": "ES"},
+    )
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Translation failed: read timed out"
+
+
+def test_translate_invalid_request_timeout(client):
+    """Test an invalid X-Request-Timeout header is rejected."""
+    for value in ("soon", "0", "-1", "nan"):
+        response = client.post(
+            "/api/v1/translate/",
+            json={"text": "hello", "target_language": "ES"},
+            headers={"X-Request-Timeout": value},
+        )
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_client_disconnect_cancels_translation():
+    """Test work of a request is cancelled when its client goes away."""
+    http_request = create_autospec(Request, instance=True)
+    http_request.is_disconnected.return_value = True
+    cancelled = asyncio.Event()
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(HTTPException) as exc_info:
+        await _run_request(http_request, work(), 5.0)
+    assert exc_info.value.status_code == 499
+    assert cancelled.is_set()
+
+
+def test_websocket_translates_messages(client, service):
+    """Test messages sent over the WebSocket are answered by id."""
+    service.provider.translate_batch.return_value = ["Hola"]
+    app.dependency_overrides[get_micro_batcher] = lambda: MicroBatcher(service)
+
+    with client.websocket_connect("/api/v1/translate/ws") as websocket:
+        websocket.send_json(
+            {"id": 7, "text": "Hello", "source_language": "EN", "target_language": "ES"}
+        )
+        reply = websocket.receive_json()
+        websocket.send_json({"text": "missing id"})
+        invalid = websocket.receive_json()
+        # The open session keeps shutdown draining until it closes
+        assert lifecycle.in_flight == 1
+    assert lifecycle.in_flight == 0
+
+    assert reply["id"] == 7
+    assert reply["translated_text"] == "Hola"
+    assert reply["status"] == 200
+    assert invalid["status"] == 422
+
+
+def test_translate_batch_stream(client, service, monkeypatch):
+    """Test an NDJSON batch is translated in chunks and streamed back."""
+    monkeypatch.setattr(settings, "stream_chunk_size", 2)
+    service.provider.translate_batch.side_effect = (
+        lambda texts, source_language, target_language: [t.upper() for t in texts]
+    )
+    body = '"a"\n"b"\n{"text": "c", "target_language": "RU"}\n\n"d"'
+
+    response = client.post(
+        "/api/v1/translate/batch/stream?source_language=EN&target_language=ES",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["translated_text"] for line in lines] == ["A", "B", "C", "D"]
+    assert [line["target_language"] for line in lines] == ["ES", "ES", "RU", "ES"]
+    assert service.provider.translate_batch.call_count == 3
+
+
+def test_translate_batch_stream_limits(client, monkeypatch):
+    """Test invalid lines and oversized NDJSON batches are rejected."""
+    monkeypatch.setattr(settings, "stream_max_items", 2)
+    url = "/api/v1/translate/batch/stream"
+
+    assert client.post(url, content='"a"\n[1]\n').status_code == 400
+    assert client.post(url, content='"a"\n"b"\n"c"\n').status_code == 413
+
+    monkeypatch.setattr(settings, "stream_max_bytes", 4)
+    assert client.post(url, content='"long text"\n').status_code == 413
+
+
+def test_translate_batch_stream_splits_lines_across_chunks(
+    client, service, monkeypatch
+):
+    """Test lines split over many body chunks and the per-line limit."""
+    service.provider.translate_batch.side_effect = (
+        lambda texts, source_language, target_language: [t.upper() for t in texts]
+    )
+    url = "/api/v1/translate/batch/stream?target_language=ES"
+
+    def body():
+        for piece in ['"ab', "c", '"\n\n"d', 'ef"', '\n"g"']:
+            yield piece.encode()
+
+    response = client.post(url, content=body())
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["translated_text"] for line in lines] == ["ABC", "DEF", "G"]
+
+    monkeypatch.setattr(settings, "stream_max_line_bytes", 4)
+    assert client.post(url, content='"a"\n"too long"\n').status_code == 413
+    assert client.post(url, content=iter([b'"too', b" long"])).status_code == 413
+
+
+def test_admin_cache_stats_requires_token(client, service, monkeypatch):
+    """Test the admin cache stats endpoint is guarded by the admin token."""
+    service.analytics = CacheAnalytics()
+    service.analytics.record("key", "hello", "EN", "ES", hit=True)
+
+    monkeypatch.setattr(settings, "admin_token", "")
+    assert client.get("/api/v1/admin/cache/stats").status_code == 404
+
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    response = client.get(
+        "/api/v1/admin/cache/stats", headers={"X-Admin-Token": "wrong"}
+    )
+    assert response.status_code == 403
+
+    response = client.get(
+        "/api/v1/admin/cache/stats", headers={"X-Admin-Token": "secret"}
+    )
+    assert response.status_code == 200
+    assert response.json()["language_pairs"][0]["hit_ratio"] == 1.0
+
+
+def test_admin_cpu_profile(client, monkeypatch):
+    """Test the CPU profile endpoint returns a downloadable profile."""
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    headers = {"X-Admin-Token": "secret"}
+
+    response = client.get(
+        "/api/v1/admin/profile/cpu", params={"seconds": 0.01}, headers=headers
+    )
+    assert response.status_code == 200
+    assert "cpu.prof" in response.headers["Content-Disposition"]
+
+    response = client.get(
+        "/api/v1/admin/profile/cpu",
+        params={"seconds": 0.01, "format": "text"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert "function calls" in response.text
+
+    assert client.get("/api/v1/admin/profile/memory").status_code == 403
+
+
+def test_admin_loop_metrics(client, monkeypatch):
+    """Test the loop lag metrics endpoint."""
+    monkeypatch.setattr(settings, "admin_token", "secret")
+
+    response = client.get(
+        "/api/v1/admin/metrics/loop", headers={"X-Admin-Token": "secret"}
+    )
+    assert response.status_code == 200
+    assert set(response.json()) >= {"lag_ms", "p99_lag_ms", "blocked_events"}
+
+    response = client.get("/api/v1/admin/metrics", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE translator_event_loop_probe_lag_seconds histogram" in response.text
+
+
+def test_health_probes(client, service, monkeypatch):
+    """Test liveness always succeeds and readiness follows the lifecycle."""
+    monkeypatch.setattr(app.state, "service", service, raising=False)
+    monkeypatch.setattr(lifecycle, "ready", False)
+    assert client.get("/api/v1/health/live").status_code == 200
+    assert client.get("/api/v1/health/ready").status_code == 503
+
+    monkeypatch.setattr(lifecycle, "ready", True)
+    response = client.get("/api/v1/health/ready")
+    assert response.status_code == 200
+    assert response.json()["checks"] == {"started": True, "cache": True}
+
+    service.cache.ping = AsyncMock(return_value=False)
+    response = client.get("/api/v1/health/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "degraded"
+    assert response.json()["checks"] == {"started": True, "cache": False}
+
+
+@pytest.mark.asyncio
+async def test_lifespan_cleans_up_when_startup_fails(service, monkeypatch):
+    """Test a failed startup still closes the service and stops monitoring."""
+    service.provider.start.side_effect = RuntimeError("DeepL unreachable")
+    monkeypatch.setattr(settings, "loop_monitor_enabled", True)
+    monkeypatch.setattr(settings, "shutdown_drain_timeout", 0.1)
+    monkeypatch.setattr(lifecycle, "ready", False)
+    stop = AsyncMock()
+
+    with (
+        patch("app.api.main.create_service", return_value=service),
+        patch("app.api.main.loop_monitor.start"),
+        patch("app.api.main.loop_monitor.stop", stop),
+        pytest.raises(RuntimeError),
+    ):
+        async with lifespan(app):
+            pass
+
+    service.provider.close.assert_awaited_once()
+    stop.assert_awaited_once()
+    assert not lifecycle.ready
@@ -0,0 +1,36 @@
+import pytest
+
+from app.core.hashring import HashRing
+
+
+def test_hash_ring_is_deterministic():
+    """Test the same key always maps to the same node."""
+    ring = HashRing(["a", "b", "c"])
+    assert ring.get_node("hello") == ring.get_node("hello")
+    assert ring.get_node("hello") == HashRing(["c", "b", "a"]).get_node("hello")
+
+
+def test_hash_ring_spreads_keys():
+    """Test keys are spread over all nodes."""
+    ring = HashRing(["a", "b", "c"])
+    groups = ring.group([f"key{i}" for i in range(3000)])
+
+    assert set(groups) == {"a", "b", "c"}
+    assert all(len(indices) > 700 for indices in groups.values())
+
+
+def test_hash_ring_minimal_movement():
+    """Test adding a node only moves keys onto the new node."""
+    keys = [f"key{i}" for i in range(1000)]
+    before = HashRing(["a", "b", "c"])
+    after = HashRing(["a", "b", "c", "d"])
+
+    moved = [key for key in keys if before.get_node(key) != after.get_node(key)]
+    assert moved
+    assert all(after.get_node(key) == "d" for key in moved)
+
+
+def test_hash_ring_requires_nodes():
+    """Test an empty ring is rejected."""
+    with pytest.raises(ValueError):
+        HashRing([])
@@ -0,0 +1,23 @@
+from app.core.language_index import DetectedLanguageIndex
+
+
+def test_index_remembers_detected_language():
+    """Test detected languages are stored upper-cased per text."""
+    index = DetectedLanguageIndex()
+    index.set("hola", "es")
+
+    assert index.get("hola") == "ES"
+    assert index.get("hello") is None
+
+
+def test_index_drops_least_recently_used():
+    """Test the index stays within its size bound."""
+    index = DetectedLanguageIndex(max_entries=2)
+    index.set("a", "EN")
+    index.set("b", "EN")
+    index.get("a")
+    index.set("c", "EN")
+
+    assert len(index) == 2
+    assert index.get("a") == "EN"
+    assert index.get("b") is None
@@ -0,0 +1,61 @@
+import asyncio
+import os
+import signal
+
+import pytest
+
+from app.core.lifecycle import Lifecycle
+
+
+@pytest.mark.asyncio
+async def test_drain_waits_for_in_flight_requests():
+    """Test shutdown waits for requests that are still being served."""
+    lifecycle = Lifecycle()
+    lifecycle.mark_ready()
+    finished = []
+
+    async def request():
+        with lifecycle.track():
+            await asyncio.sleep(0.05)
+            finished.append(True)
+
+    task = asyncio.create_task(request())
+    await asyncio.sleep(0)
+    assert lifecycle.in_flight == 1
+
+    assert await lifecycle.drain(timeout=1.0)
+    assert finished == [True]
+    assert not lifecycle.ready
+    assert lifecycle.draining
+    await task
+
+
+@pytest.mark.asyncio
+async def test_drain_times_out():
+    """Test the drain gives up after the timeout."""
+    lifecycle = Lifecycle()
+
+    with lifecycle.track():
+        assert not await lifecycle.drain(timeout=0.01)
+    assert lifecycle.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_sigterm_fails_readiness_before_passing_signal_on():
+    """Test SIGTERM stops readiness first and reaches the server later."""
+    lifecycle = Lifecycle()
+    lifecycle.mark_ready()
+    received = []
+    previous = signal.signal(signal.SIGTERM, lambda *_: received.append(True))
+    try:
+        with lifecycle.drain_on_signal(delay=0.05):
+            os.kill(os.getpid(), signal.SIGTERM)
+            await asyncio.sleep(0.01)
+            assert not lifecycle.ready
+            assert lifecycle.draining
+            assert received == []
+
+            await asyncio.sleep(0.1)
+            assert received == [True]
+    finally:
+        signal.signal(signal.SIGTERM, previous)
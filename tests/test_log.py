@@ -0,0 +1,106 @@
+import json
+import logging
+from logging.handlers import QueueHandler
+
+import pytest
+
+from app.core.log import (
+    JsonFormatter,
+    RateLimitedLogger,
+    configure_logging,
+    shutdown_logging,
+)
+from app.core.tracing import Tracer
+from tests.test_tracing import RecordingExporter
+
+
+def make_record(msg, *args, **extra):
+    """Create a log record as Logger.makeRecord would."""
+    record = logging.LogRecord("app.test", logging.INFO, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    """Test records are rendered as JSON with their extra fields."""
+    entry = json.loads(
+        JsonFormatter().format(make_record("hit %s", "key", suppressed=3))
+    )
+
+    assert entry["message"] == "hit key"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "app.test"
+    assert entry["suppressed"] == 3
+
+
+def test_rate_limited_logger_suppresses_bursts(caplog):
+    """Test records over the rate are dropped and counted."""
+    limited = RateLimitedLogger(logging.getLogger("app.test"), rate=1e-9, burst=2)
+
+    with caplog.at_level(logging.INFO, logger="app.test"):
+        for i in range(5):
+            limited.info("event %d", i)
+        limited._tokens = 1.0
+        limited.info("event after pause")
+
+    assert [r.getMessage() for r in caplog.records] == [
+        "event 0",
+        "event 1",
+        "event after pause",
+    ]
+    assert caplog.records[-1].suppressed == 3
+
+
+def test_rate_limited_logger_skips_disabled_levels():
+    """Test calls below the logger level do not consume the rate."""
+    logger = logging.getLogger("app.test.quiet")
+    logger.setLevel(logging.WARNING)
+    limited = RateLimitedLogger(logger, rate=1.0, burst=1)
+
+    limited.debug("not emitted %s", object())
+
+    assert limited._tokens is None
+
+
+@pytest.fixture
+def restore_root_logger():
+    """Put the root logger back after configure_logging."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+@pytest.mark.asyncio
+async def test_configure_logging_writes_json_from_listener(restore_root_logger, capfd):
+    """Test records go through the queue and carry the trace id."""
+    configure_logging(level="INFO")
+    tracer = Tracer()
+    tracer.configure(sample_rate=1.0, exporter=RecordingExporter())
+
+    with tracer.start_trace("request") as span:
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logging.getLogger("app.test").exception("failed for %s", "key")
+    shutdown_logging()
+
+    entry = json.loads(capfd.readouterr().err.strip().splitlines()[-1])
+    assert entry["message"] == "failed for key"
+    assert entry["trace_id"] == span.trace_id
+    assert "RuntimeError: boom" in entry["exception"]
+
+
+def test_configure_logging_keeps_foreign_handlers(restore_root_logger):
+    """Test reconfiguring only replaces the handler this module installed."""
+    root = logging.getLogger()
+    foreign = logging.NullHandler()
+    root.addHandler(foreign)
+
+    configure_logging(level="INFO")
+    configure_logging(level="INFO")
+
+    assert foreign in root.handlers
+    assert sum(isinstance(h, QueueHandler) for h in root.handlers) == 1
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from app.core.cache.memory import InMemoryTranslationCache
+from app.core.loop_monitor import LoopMonitor
+
+
+def blocking_call(seconds):
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_measures_lag_and_logs_blocking_stack(caplog):
+    """Test blocking the loop shows up as lag and logs the blocking stack."""
+    monitor = LoopMonitor(interval=0.01, block_threshold=0.05)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        with caplog.at_level(logging.WARNING, logger="app.core.loop_monitor"):
+            blocking_call(0.2)
+            await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    snapshot = monitor.snapshot()
+    assert not snapshot["running"]
+    assert snapshot["max_lag_ms"] >= 100
+    assert snapshot["blocked_events"] == 1
+    assert "blocking_call" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_idle_loop_has_no_blocking_events():
+    """Test an idle loop reports low lag and no blocking."""
+    monitor = LoopMonitor(interval=0.01, block_threshold=0.2)
+    monitor.start()
+    await asyncio.sleep(0.1)
+    await monitor.stop()
+
+    snapshot = monitor.snapshot()
+    assert snapshot["blocked_events"] == 0
+    assert snapshot["p99_lag_ms"] < 200
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_renders_lag_histogram():
+    """Test probes are counted in cumulative Prometheus histogram buckets."""
+    monitor = LoopMonitor(interval=0.01, block_threshold=1.0)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    blocking_call(0.1)
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    lines = monitor.render_metrics().splitlines()
+    buckets = {
+        line.split('"')[1]: int(line.split()[-1])
+        for line in lines
+        if line.startswith("translator_event_loop_probe_lag_seconds_bucket")
+    }
+    count = next(line for line in lines if line.endswith(f"_count {buckets['+Inf']}"))
+    assert count.startswith("translator_event_loop_probe_lag_seconds_count")
+    assert list(buckets.values()) == sorted(buckets.values())
+    assert buckets["0.05"] < buckets["+Inf"]
+    assert "translator_event_loop_blocked_total 0" in lines
+
+
+@pytest.mark.asyncio
+async def test_make_keys_offloads_large_texts():
+    """Test large texts get the same keys when hashed off the loop."""
+    cache = InMemoryTranslationCache()
+    items = [("x" * 100_000, "EN", "ES"), ("hello", "en", "es")]
+
+    keys = await cache.make_keys(items)
+
+    assert keys == [cache._make_key(*item) for item in items]
@@ -0,0 +1,185 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+
+from app.api.dependencies import create_service
+from app.api.internal import router as internal_router
+from app.core.cache.base import KEY_FORMAT_VERSION, CacheScope
+from app.core.cache.peer import PeerTranslationCache
+from app.core.config import settings
+from app.core.service import TranslationService
+
+PEERS = ["http://peer-a", "http://peer-b", "http://peer-c"]
+
+
+class PeerNetwork(httpx.AsyncBaseTransport):
+    """Routes peer requests to in-process replica apps by host name."""
+
+    def __init__(self):
+        self.apps: dict[str, httpx.ASGITransport] = {}
+
+    async def handle_async_request(self, request):
+        transport = self.apps.get(request.url.host)
+        if transport is None:
+            raise httpx.ConnectError("peer down", request=request)
+        return await transport.handle_async_request(request)
+
+
+def make_provider():
+    """Provider that takes a while, so concurrent misses overlap."""
+
+    async def translate_batch(texts, source_language, target_language):
+        await asyncio.sleep(0.05)
+        return [f"{text}-{target_language}" for text in texts]
+
+    provider = AsyncMock()
+    provider.translate_batch = AsyncMock(side_effect=translate_batch)
+    return provider
+
+
+@pytest_asyncio.fixture
+async def replicas(monkeypatch):
+    """Start three replicas sharing one peer cache."""
+    monkeypatch.setattr(settings, "cache_peer_token", "fleet-token")
+    network = PeerNetwork()
+    services = {}
+    for url in PEERS:
+        cache = PeerTranslationCache(
+            self_url=url,
+            peer_urls=PEERS,
+            client=httpx.AsyncClient(transport=network),
+            token="fleet-token",
+            lease_wait_timeout=2.0,
+        )
+        app = FastAPI()
+        app.include_router(internal_router, prefix="/api/v1")
+        app.state.service = TranslationService(provider=make_provider(), cache=cache)
+        network.apps[httpx.URL(url).host] = httpx.ASGITransport(app=app)
+        services[url] = app.state.service
+    yield services
+    for service in services.values():
+        await service.cache.close()
+
+
+@pytest.mark.asyncio
+async def test_keys_are_stored_on_their_owner(replicas):
+    """Test every replica sees values stored through any other replica."""
+    a, b, c = (replicas[url].cache for url in PEERS)
+    keys = [f"EN:ES:{index}" for index in range(20)]
+
+    await a.set_many({key: f"value{index}" for index, key in enumerate(keys)})
+
+    assert await b.get_many(keys) == [f"value{index}" for index in range(20)]
+    assert await c.get(keys[0]) == "value0"
+    # Each key is held once in the fleet, by its owner
+    for key in keys:
+        owner = replicas[a.owner(key)].cache
+        assert await owner.local.get(key) is not None
+    assert sum(cache.get_cache_size() for cache in (a, b, c)) == 20
+
+
+@pytest.mark.asyncio
+async def test_string_is_translated_once_cluster_wide(replicas):
+    """Test concurrent misses on several replicas call the provider once."""
+    results = await asyncio.gather(
+        *(
+            service.translate_batch(["hello", "world"], "EN", "ES")
+            for service in replicas.values()
+        )
+    )
+
+    for batch in results:
+        assert [r.translated_text for r in batch] == ["hello-ES", "world-ES"]
+    translated = [
+        text
+        for service in replicas.values()
+        for call in service.provider.translate_batch.call_args_list
+        for text in call.kwargs["texts"]
+    ]
+    assert sorted(translated) == ["hello", "world"]
+
+
+@pytest.mark.asyncio
+async def test_unreachable_peer_is_a_miss(replicas):
+    """Test a replica that is down does not fail reads or writes."""
+    a = replicas[PEERS[0]].cache
+    lonely = PeerTranslationCache(
+        self_url=PEERS[0],
+        peer_urls=PEERS + ["http://peer-down"],
+        client=a._client,
+    )
+    keys = [f"EN:ES:{index}" for index in range(20)]
+    down = [key for key in keys if lonely.owner(key) == "http://peer-down"]
+    assert down
+
+    await lonely.set_many({key: "value" for key in keys})
+
+    assert await lonely.get_many(down) == [None] * len(down)
+    assert await lonely.acquire_leases(down) == [True] * len(down)
+
+
+@pytest.mark.asyncio
+async def test_clear_reaches_every_peer(replicas):
+    """Test clearing a scope removes it from the whole fleet."""
+    a, b, _ = (replicas[url].cache for url in PEERS)
+    keys = [f"{KEY_FORMAT_VERSION}:EN:ES:{index}" for index in range(10)]
+    keys.append(f"{KEY_FORMAT_VERSION}:EN:RU:0")
+    await a.set_many({key: "value" for key in keys})
+
+    await b.clear(CacheScope(target_language="ES"))
+
+    assert await a.get_many(keys) == [None] * 10 + ["value"]
+
+
+@pytest.mark.asyncio
+async def test_internal_endpoints_check_peer_token(replicas, monkeypatch):
+    """Test peers must present the shared token when one is configured."""
+    a = replicas[PEERS[0]].cache
+    key = next(key for key in ("k1", "k2", "k3", "k4") if a.owner(key) != a.self_url)
+    monkeypatch.setattr(settings, "cache_peer_token", "secret")
+
+    await a.set(key, "value")
+    assert await a.get(key) is None
+
+    a.token = "secret"
+    await a.set(key, "value")
+    assert await a.get(key) == "value"
+
+
+@pytest.mark.asyncio
+async def test_internal_endpoints_hidden_without_peer_token(monkeypatch):
+    """Test the internal endpoints are not served unless a token is set."""
+    monkeypatch.setattr(settings, "cache_peer_token", "")
+    app = FastAPI()
+    app.include_router(internal_router, prefix="/api/v1")
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://peer"
+    ) as client:
+        response = await client.post("/api/v1/internal/cache/clear", json={})
+
+    assert response.status_code == 404
+
+
+def test_peer_cache_requires_token(monkeypatch):
+    """Test a replica refuses to start a peer cache without a token."""
+    monkeypatch.setattr(settings, "cache_type", "peer")
+    monkeypatch.setattr(settings, "cache_peer_token", "")
+
+    with pytest.raises(ValueError, match="CACHE_PEER_TOKEN"):
+        create_service()
+
+
+@pytest.mark.asyncio
+async def test_expired_leases_are_swept_on_access():
+    """Test leases never released are dropped once they expire."""
+    cache = PeerTranslationCache(self_url=PEERS[0], peer_urls=[], lease_ttl=0.01)
+    assert await cache.serve_acquire(["k1", "k2"], "crashed-replica") == [True] * 2
+    await asyncio.sleep(0.02)
+
+    await cache.serve_release([], "other-replica")
+
+    assert cache._leases == {}
@@ -0,0 +1,70 @@
+import asyncio
+import marshal
+
+import pytest
+
+from app.core.profiling import (
+    Profiler,
+    ProfilerBusyError,
+    stats_to_pstats_file,
+    stats_to_text,
+)
+
+
+def busy_work():
+    return sum(i * i for i in range(20000))
+
+
+async def run_busy_work(duration):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+    while loop.time() < deadline:
+        busy_work()
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_cpu_profile_captures_concurrent_work():
+    """Test the CPU profile records code running on the event loop."""
+    profiler = Profiler()
+    worker = asyncio.create_task(run_busy_work(0.2))
+
+    stats = await profiler.cpu_profile(0.1)
+    await worker
+
+    assert "busy_work" in stats_to_text(stats)
+    functions = marshal.loads(stats_to_pstats_file(stats))
+    assert any(name == "busy_work" for _, _, name in functions)
+
+
+@pytest.mark.asyncio
+async def test_allocation_diff_reports_growth():
+    """Test the allocation report lists sites that allocated memory."""
+    profiler = Profiler()
+    retained = []
+
+    async def allocate():
+        await asyncio.sleep(0.01)
+        retained.append([bytearray(1024) for _ in range(200)])
+
+    task = asyncio.create_task(allocate())
+    report = await profiler.allocation_diff(0.05, limit=5)
+    await task
+
+    assert report.startswith("Allocations over 0.05s")
+    assert "test_profiling.py" in report
+
+
+@pytest.mark.asyncio
+async def test_profiles_do_not_overlap():
+    """Test a second profile is rejected while one is running."""
+    profiler = Profiler()
+    first = asyncio.create_task(profiler.cpu_profile(0.05))
+    await asyncio.sleep(0)
+
+    assert profiler.busy
+    with pytest.raises(ProfilerBusyError):
+        await profiler.allocation_diff(0.01)
+
+    await first
+    assert not profiler.busy
@@ -2,6 +2,8 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from app.core.deadline import DeadlineExceededError, use_deadline
+from app.core.providers.chunking import split_text
 from app.core.providers.deepl import DeepLProvider
 
 
@@ -82,6 +84,40 @@ async def test_translate_with_retry_failure(deepl_provider):
         assert mock_call.call_count == 2
 
 
+@pytest.mark.asyncio
+async def test_translate_batch_reports_detected_language(deepl_provider):
+    """Test the source language detected by DeepL is passed on."""
+    mock_response = {
+        "translations": [{"text": "hello", "detected_source_language": "ES"}]
+    }
+
+    with patch(
+        "app.core.providers.deepl.call_remote_api", new_callable=AsyncMock
+    ) as mock_call:
+        mock_call.return_value = mock_response
+
+        [result] = await deepl_provider.translate_batch_detailed(["hola"], "AUTO", "EN")
+
+    assert result.text == "hello"
+    assert result.detected_source_language == "ES"
+
+
+@pytest.mark.asyncio
+async def test_translate_skips_retry_past_deadline(deepl_provider):
+    """Test no retry is attempted when its backoff outlasts the deadline."""
+    deepl_provider.retry_delay = 1.0
+
+    with patch(
+        "app.core.providers.deepl.call_remote_api", new_callable=AsyncMock
+    ) as mock_call:
+        mock_call.side_effect = Exception("API Error")
+
+        with use_deadline(0.5), pytest.raises(DeadlineExceededError):
+            await deepl_provider.translate("hello", "EN", "ES")
+
+        assert mock_call.call_count == 1
+
+
 @pytest.mark.asyncio
 async def test_translate_batch(deepl_provider):
     """Test batch translation."""
@@ -94,3 +130,55 @@ async def test_translate_batch(deepl_provider):
 
         results = await deepl_provider.translate_batch(["hello", "world"], "EN", "ES")
         assert len(results) == 2
+
+
+@pytest.mark.asyncio
+async def test_deepl_provider_reuses_shared_client(deepl_provider):
+    """Test requests go through the pool opened at startup."""
+    with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
+        await deepl_provider.start()
+    assert mock_get.await_count == deepl_provider.warm_connections
+
+    with patch(
+        "app.core.providers.deepl.call_remote_api", new_callable=AsyncMock
+    ) as mock_call:
+        mock_call.return_value = {"translations": [{"text": "hola"}]}
+        await deepl_provider.translate("hello", "EN", "ES")
+    assert mock_call.call_args.kwargs["client"] is deepl_provider._client
+
+    await deepl_provider.close()
+    assert deepl_provider._client is None
+
+
+def test_split_text_prefers_sentence_boundaries():
+    """Test oversized texts split at paragraphs, then sentences, then words."""
+    paragraph = "First sentence here. Second one follows! Third? "
+    text = paragraph * 3 + "\n\n" + "word " * 30 + "x" * 25
+
+    chunks = split_text(text, 24)
+
+    assert "".join(chunks) == text
+    assert all(len(chunk) <= 24 for chunk in chunks)
+    assert chunks[0] == "First sentence here. "
+    assert split_text("short", 24) == ["short"]
+
+
+@pytest.mark.asyncio
+async def test_deepl_provider_translates_oversized_text_in_chunks():
+    """Test long texts are translated chunk by chunk and reassembled in order."""
+    provider = DeepLProvider(api_url="test.url", api_key="test-key", max_chunk_chars=30)
+    text = "One sentence here. Another sentence.\n\nA new paragraph starts."
+
+    async def echo(**kwargs):
+        return {"translations": [{"text": kwargs["json_data"]["text"][0].upper()}]}
+
+    with patch(
+        "app.core.providers.deepl.call_remote_api", new_callable=AsyncMock
+    ) as mock_call:
+        mock_call.side_effect = echo
+        result = await provider.translate(text, "EN", "ES")
+
+    assert result == text.upper()
+    assert mock_call.call_count == 3
+    sent = [call.kwargs["json_data"]["text"][0] for call in mock_call.call_args_list]
+    assert all(len(chunk) <= 30 and chunk == chunk.strip() for chunk in sent)
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.models import ProviderTranslation
+from app.core.providers.deepl import DeepLProvider
+from app.core.providers.record_replay import (
+    RECORD,
+    REPLAY,
+    RecordedProviderError,
+    RecordReplayProvider,
+    UnrecordedTextError,
+)
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay(tmp_path):
+    """Test recorded translations, latencies and failures replay offline."""
+    path = tmp_path / "recording.jsonl"
+    inner = DeepLProvider(api_url="test.url", api_key="test-key")
+
+    async def slow_batch(texts, source_language, target_language):
+        await asyncio.sleep(0.05)
+        if "boom" in texts:
+            raise ConnectionError("DeepL is down")
+        return [ProviderTranslation(text.upper()) for text in texts]
+
+    inner.translate_batch_detailed = AsyncMock(side_effect=slow_batch)
+    recorder = RecordReplayProvider(str(path), mode=RECORD, provider=inner)
+    assert await recorder.translate_batch(["hello", "world"], "EN", "ES") == [
+        "HELLO",
+        "WORLD",
+    ]
+    with pytest.raises(ConnectionError, match="DeepL is down"):
+        await recorder.translate("boom", "EN", "ES")
+
+    calls = [json.loads(line) for line in path.read_text().splitlines()]
+    assert calls[0]["latency"] >= 0.05
+    assert calls[1]["error"] == "DeepL is down"
+
+    replayer = RecordReplayProvider(str(path), mode=REPLAY)
+    started = time.monotonic()
+    assert await replayer.translate_batch(["world", "hello"], "EN", "ES") == [
+        "WORLD",
+        "HELLO",
+    ]
+    assert time.monotonic() - started >= 0.05
+    with pytest.raises(RecordedProviderError):
+        await replayer.translate("boom", "EN", "ES")
+    with pytest.raises(UnrecordedTextError, match="not recorded for EN->ES"):
+        await replayer.translate("unrecorded", "EN", "ES")
+    with pytest.raises(ValueError):
+        await replayer.translate("hello", "EN", "RU")
+    assert {lang.code for lang in replayer.get_supported_languages()} == {"EN", "ES"}
+
+
+@pytest.mark.asyncio
+async def test_replay_keeps_detections_and_scales_latency(tmp_path):
+    """Test detected languages replay and latency follows the batch size."""
+    path = tmp_path / "recording.jsonl"
+    inner = DeepLProvider(api_url="test.url", api_key="test-key")
+
+    async def detailed_batch(texts, source_language, target_language):
+        await asyncio.sleep(0.2)
+        return [ProviderTranslation(text.upper(), "DE") for text in texts]
+
+    inner.translate_batch_detailed = AsyncMock(side_effect=detailed_batch)
+    recorder = RecordReplayProvider(str(path), mode=RECORD, provider=inner)
+    assert recorder.detects_language
+    translations = await recorder.translate_batch_detailed(
+        ["hallo", "welt", "guten", "tag"], "AUTO", "EN"
+    )
+    assert [t.detected_source_language for t in translations] == ["DE"] * 4
+
+    [call] = [json.loads(line) for line in path.read_text().splitlines()]
+    assert call["batch_size"] == 4
+    assert call["detected_source_languages"] == ["DE"] * 4
+
+    replayer = RecordReplayProvider(str(path), mode=REPLAY)
+    assert replayer.detects_language
+    started = time.monotonic()
+    assert await replayer.translate_batch_detailed(["welt"], "AUTO", "EN") == [
+        ProviderTranslation("WELT", "DE")
+    ]
+    # A quarter of the recorded batch takes about a quarter of its latency
+    assert 0.04 <= time.monotonic() - started < 0.15
@@ -1,6 +1,11 @@
+from unittest.mock import AsyncMock
+
 import pytest
 import pytest_asyncio
+from redis.exceptions import RedisClusterException
 
+from app.core.cache.base import KEY_FORMAT_VERSION, CacheScope
+from app.core.cache.compression import ValueCodec
 from app.core.cache.redis import RedisTranslationCache
 
 
@@ -46,6 +51,13 @@ async def test_redis_cache_clear(redis_cache):
     size = await redis_cache.async_get_cache_size()
     assert size == 2
 
+    leasing = RedisTranslationCache(redis_url="redis://localhost:6379/1", lease_ttl=5.0)
+    try:
+        await leasing.acquire_leases(["key3"])
+        assert await redis_cache.async_get_cache_size() == 2
+    finally:
+        await leasing.close()
+
     await redis_cache.clear()
     size = await redis_cache.async_get_cache_size()
     assert size == 0
@@ -56,8 +68,10 @@ async def test_redis_cache_clear(redis_cache):
 async def test_redis_cache_make_key(redis_cache):
     """Test cache key generation."""
     key = redis_cache._make_key("hello", "EN", "ES")
+    # Layout version and language pair followed by a 64-character SHA256 digest
     assert isinstance(key, str)
-    assert len(key) == 64  # SHA256 hex digest is 64 characters
+    assert key.startswith(f"{KEY_FORMAT_VERSION}:EN:ES:")
+    assert len(key.split(":")[-1]) == 64
 
 
 @pytest.mark.asyncio
@@ -87,3 +101,148 @@ async def test_redis_cache_size(redis_cache):
     await redis_cache.set("key2", "value2")
     size = await redis_cache.async_get_cache_size()
     assert size == 2
+
+    leasing = RedisTranslationCache(redis_url="redis://localhost:6379/1", lease_ttl=5.0)
+    try:
+        await leasing.acquire_leases(["key3"])
+        assert await redis_cache.async_get_cache_size() == 2
+    finally:
+        await leasing.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_get_many_and_set_many(redis_cache):
+    """Test bulk MGET / pipelined SET operations."""
+    await redis_cache.set_many({"key1": "value1", "key2": "value2"})
+
+    assert await redis_cache.get_many(["key1", "missing", "key2"]) == [
+        "value1",
+        None,
+        "value2",
+    ]
+    assert await redis_cache.get_many([]) == []
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_leases(redis_cache):
+    """Test only one replica acquires the lease for a missed key."""
+    redis_cache.lease_ttl = 5.0
+    other_replica = RedisTranslationCache(
+        redis_url="redis://localhost:6379/1", lease_ttl=5.0, lease_wait_timeout=1.0
+    )
+    try:
+        assert await redis_cache.acquire_leases(["key1"]) == [True]
+        assert await other_replica.acquire_leases(["key1"]) == [False]
+
+        await redis_cache.set("key1", "value1")
+        assert await other_replica.wait_for(["key1"]) == ["value1"]
+
+        # Releasing ignores leases held by someone else
+        await other_replica.release_leases(["key1"])
+        assert await other_replica.acquire_leases(["key1"]) == [False]
+        await redis_cache.release_leases(["key1"])
+        assert await other_replica.acquire_leases(["key1"]) == [True]
+    finally:
+        await other_replica.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_wait_for_released_lease(redis_cache):
+    """Test waiting stops when the lease holder gives up without a value."""
+    redis_cache.lease_ttl = 5.0
+    assert await redis_cache.acquire_leases(["key1"]) == [True]
+    await redis_cache.release_leases(["key1"])
+
+    assert await redis_cache.wait_for(["key1"]) == [None]
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_down_shard_is_a_miss():
+    """Test an unreachable shard degrades to cache misses instead of errors."""
+    cache = RedisTranslationCache(
+        redis_urls=["redis://localhost:1/0", "redis://localhost:2/0"]
+    )
+    try:
+        await cache.set_many({"key1": "value1", "key2": "value2"})
+        assert await cache.get_many(["key1", "key2"]) == [None, None]
+        assert await cache.get("key1") is None
+        assert await cache.exists("key1") is False
+        await cache.clear()
+        assert await cache.async_get_cache_size() == 0
+        assert not await cache.ping()
+    finally:
+        await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_cluster_errors_are_misses():
+    """Test cluster errors and undecodable values degrade to misses."""
+    cache = RedisTranslationCache(cluster=True)
+    cache._get_client = AsyncMock(side_effect=RedisClusterException("no nodes"))
+
+    assert await cache.get_many(["key1"]) == [None]
+    await cache.clear()
+    assert await cache.async_get_cache_size() == 0
+
+    client = AsyncMock()
+    client.mget.return_value = [b"\xff\xfe", b"valid"]
+    cache = RedisTranslationCache()
+    cache._get_client = AsyncMock(return_value=client)
+    assert await cache.get_many(["corrupt", "valid"]) == [None, "valid"]
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_clear_is_namespaced(redis_cache):
+    """Test clearing leaves other namespaces and language pairs alone."""
+    other_tenant = RedisTranslationCache(
+        redis_url="redis://localhost:6379/1", namespace="other"
+    )
+    try:
+        en_es = redis_cache._make_key("hello", "EN", "ES")
+        en_ru = redis_cache._make_key("hello", "EN", "RU")
+        await redis_cache.set_many({en_es: "hola", en_ru: "привет"})
+        await other_tenant.set(en_es, "hola")
+
+        await redis_cache.clear(CacheScope(source_language="EN", target_language="RU"))
+        assert await redis_cache.get(en_es) == "hola"
+        assert await redis_cache.get(en_ru) is None
+
+        await redis_cache.clear()
+        assert await redis_cache.async_get_cache_size() == 0
+        assert await other_tenant.get(en_es) == "hola"
+    finally:
+        await other_tenant.clear()
+        await other_tenant.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_compression(redis_cache):
+    """Test compressed and plain entries are both readable."""
+    paragraph = "A long translated paragraph. " * 100
+    compressing = RedisTranslationCache(
+        redis_url="redis://localhost:6379/1", codec=ValueCodec(threshold=256)
+    )
+    try:
+        await compressing.set("long", paragraph)
+        await redis_cache.set("short", "plain value")
+
+        assert await compressing.get_many(["long", "short"]) == [
+            paragraph,
+            "plain value",
+        ]
+        assert await redis_cache.get("long") == paragraph
+    finally:
+        await compressing.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_ping():
+    """Test ping reports reachable and unreachable Redis."""
+    cache = RedisTranslationCache(redis_url="redis://localhost:6379/1")
+    unreachable = RedisTranslationCache(redis_url="redis://localhost:1/0")
+    try:
+        assert await cache.ping()
+        assert not await unreachable.ping()
+    finally:
+        await cache.close()
+        await unreachable.close()
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+
+from app.core.scheduler import (
+    BULK,
+    INTERACTIVE,
+    PriorityScheduler,
+    TrafficClass,
+    current_traffic_class,
+    use_traffic_class,
+)
+
+
+def test_use_traffic_class():
+    """Test the traffic class context is set and restored."""
+    assert current_traffic_class() == INTERACTIVE
+    with use_traffic_class(BULK):
+        assert current_traffic_class() == BULK
+    assert current_traffic_class() == INTERACTIVE
+
+
+@pytest.mark.asyncio
+async def test_scheduler_limits_concurrency():
+    """Test the scheduler never exceeds its global concurrency."""
+    scheduler = PriorityScheduler(max_concurrency=2)
+    running = 0
+    peak = 0
+
+    async def work():
+        nonlocal running, peak
+        async with scheduler.slot(BULK):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(work() for _ in range(6)))
+    assert peak == 2
+    assert scheduler.active() == 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_weighted_fair_order():
+    """Test interactive waiters are served ahead of a bulk backlog."""
+    scheduler = PriorityScheduler(
+        max_concurrency=1,
+        classes=[
+            TrafficClass(INTERACTIVE, weight=4.0, max_concurrency=1),
+            TrafficClass(BULK, weight=1.0, max_concurrency=1),
+        ],
+    )
+    order: list[str] = []
+
+    async def work(name: str):
+        async with scheduler.slot(name):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    async with scheduler.slot(BULK):
+        tasks = [asyncio.create_task(work(BULK)) for _ in range(4)]
+        tasks += [asyncio.create_task(work(INTERACTIVE)) for _ in range(4)]
+        await asyncio.sleep(0)
+        assert scheduler.queued() == 8
+
+    await asyncio.gather(*tasks)
+    # Bulk still makes progress, but interactive work drains first
+    assert order[:5].count(INTERACTIVE) == 4
+    assert order.count(BULK) == 4
+
+
+@pytest.mark.asyncio
+async def test_scheduler_per_class_concurrency():
+    """Test a class cannot use more than its own concurrency budget."""
+    scheduler = PriorityScheduler(
+        max_concurrency=4,
+        classes=[
+            TrafficClass(INTERACTIVE, max_concurrency=4),
+            TrafficClass(BULK, max_concurrency=1),
+        ],
+    )
+    peak = 0
+
+    async def work():
+        nonlocal peak
+        async with scheduler.slot(BULK):
+            peak = max(peak, scheduler.active(BULK))
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(work() for _ in range(3)))
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_rate_limit():
+    """Test rate-limited classes wait for tokens."""
+    scheduler = PriorityScheduler(
+        max_concurrency=4,
+        classes=[TrafficClass(BULK, rate_limit=20.0)],
+    )
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    async def work():
+        async with scheduler.slot(BULK):
+            pass
+
+    # Burst of 20 is available immediately, the rest is paced
+    await asyncio.gather(*(work() for _ in range(22)))
+    assert loop.time() - started >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_scheduler_cancelled_waiter_frees_queue():
+    """Test cancelling a queued call does not leak a slot."""
+    scheduler = PriorityScheduler(max_concurrency=1)
+
+    async def work():
+        async with scheduler.slot(BULK):
+            await asyncio.sleep(0)
+
+    async with scheduler.slot(BULK):
+        task = asyncio.create_task(work())
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.sleep(0)
+
+    assert scheduler.active() == 0
+    assert scheduler.queued() == 0
+    await work()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_unknown_class():
+    """Test unknown traffic classes are rejected."""
+    scheduler = PriorityScheduler()
+    with pytest.raises(ValueError, match="Unknown traffic class 'batchy'"):
+        async with scheduler.slot("batchy"):
+            pass
@@ -1,10 +1,16 @@
+import asyncio
 from unittest.mock import AsyncMock
 
 import pytest
 
+from app.core.admission import AdmissionController, OverloadedError
+from app.core.analytics import CacheAnalytics
+from app.core.cache.base import CacheScope
 from app.core.cache.memory import InMemoryTranslationCache
-from app.core.models import Language
+from app.core.language_index import DetectedLanguageIndex
+from app.core.models import Language, ProviderTranslation, TranslationItem
 from app.core.service import TranslationService
+from app.core.translation_memory import TranslationMemory
 
 
 class MockProvider:
@@ -119,3 +125,250 @@ async def test_clear_cache(service):
 
     await service.clear_cache()
     assert service.cache.get_cache_size() == 0
+
+
+@pytest.mark.asyncio
+async def test_translate_multi(service):
+    """Test fan-out translation into several target languages."""
+    results = await service.translate_multi(["hello", "world"], ["ES", "EN"], "EN")
+
+    assert list(results) == ["ES", "EN"]
+    assert [r.original_text for r in results["ES"]] == ["hello", "world"]
+    assert all(r.target_language == "EN" for r in results["EN"])
+    # One provider batch per target language
+    assert service.provider.translate_batch.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_translate_multi_uses_cache(service):
+    """Test fan-out translation only sends cache misses to the provider."""
+    await service.translate_batch(["hello", "world"], "EN", "ES")
+    assert service.provider.translate_batch.call_count == 1
+
+    results = await service.translate_multi(["hello", "world"], ["ES", "EN"], "EN")
+
+    assert service.provider.translate_batch.call_count == 2
+    service.provider.translate_batch.assert_called_with(
+        texts=["hello", "world"], source_language="EN", target_language="EN"
+    )
+    assert [r.translated_text for r in results["ES"]] == ["translated1", "translated2"]
+
+
+@pytest.mark.asyncio
+async def test_translate_items_mixed_pairs(service):
+    """Test mixed language pairs are grouped per pair and kept in input order."""
+    service.provider.translate_batch.side_effect = [["hola", "mundo"], ["hello"]]
+
+    results = await service.translate_items(
+        [
+            TranslationItem("hello", "EN", "ES"),
+            TranslationItem("hola", "ES", "EN"),
+            TranslationItem("world", "EN", "ES"),
+        ]
+    )
+
+    assert [r.translated_text for r in results] == ["hola", "hello", "mundo"]
+    assert [r.target_language for r in results] == ["ES", "EN", "ES"]
+    assert service.provider.translate_batch.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_admission_sheds_misses_but_serves_cache(service):
+    """Test overload rejects provider work but still serves cached texts."""
+    await service.translate("hello", "EN", "ES")
+    service.admission = AdmissionController(max_queued=1)
+
+    async with service.admission.admit(1):
+        cached = await service.translate("hello", "EN", "ES")
+        assert cached.translated_text == "translated text"
+
+        with pytest.raises(OverloadedError):
+            await service.translate("world", "EN", "ES")
+
+
+class ContendedCache(InMemoryTranslationCache):
+    """Cache whose leases are always held by another replica."""
+
+    def __init__(self):
+        super().__init__()
+        self.filled_by_other_replica: dict[str, str] = {}
+
+    async def acquire_leases(self, keys):
+        return [False] * len(keys)
+
+    async def wait_for(self, keys):
+        return [self.filled_by_other_replica.get(key) for key in keys]
+
+
+@pytest.mark.asyncio
+async def test_leased_keys_are_waited_for():
+    """Test keys leased elsewhere are read from cache instead of fetched."""
+    cache = ContendedCache()
+    service = TranslationService(provider=MockProvider(), cache=cache)
+    # The lease holder fills the key while we wait
+    cache.filled_by_other_replica[cache._make_key("hello", "EN", "ES")] = "hola"
+
+    results = await service.translate_batch(["hello"], "EN", "ES")
+
+    assert results[0].translated_text == "hola"
+    service.provider.translate_batch.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_leased_keys_fall_back_to_provider():
+    """Test keys whose lease holder never delivers are fetched after all."""
+    service = TranslationService(provider=MockProvider(), cache=ContendedCache())
+
+    result = await service.translate("hello", "EN", "ES")
+
+    assert result.translated_text == "translated text"
+    assert service.provider.translate.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_waiting_for_leased_keys_is_not_admitted():
+    """Test waiting for another fetcher does not hold provider queue slots."""
+    pending: list[int] = []
+
+    class ObservedCache(ContendedCache):
+        async def wait_for(self, keys):
+            pending.append(service.admission.pending)
+            return await super().wait_for(keys)
+
+    cache = ObservedCache()
+    service = TranslationService(provider=MockProvider(), cache=cache)
+    service.admission = AdmissionController(max_queued=10)
+    cache.filled_by_other_replica[cache._make_key("hello", "EN", "ES")] = "hola"
+
+    single = await service.translate("hello", "EN", "ES")
+    [batch] = await service.translate_batch(["hello"], "EN", "ES")
+
+    assert single.translated_text == batch.translated_text == "hola"
+    assert pending == [0, 0]
+
+
+@pytest.mark.asyncio
+async def test_failed_fetch_cancels_lease_wait():
+    """Test a failing provider call stops the wait for contended keys."""
+    waiting = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    class HalfContendedCache(InMemoryTranslationCache):
+        async def acquire_leases(self, keys):
+            return [True] + [False] * (len(keys) - 1)
+
+        async def wait_for(self, keys):
+            waiting.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+    service = TranslationService(provider=MockProvider(), cache=HalfContendedCache())
+
+    async def fail(texts, source_language, target_language):
+        await waiting.wait()
+        raise RuntimeError("provider down")
+
+    service.provider.translate_batch.side_effect = fail
+
+    with pytest.raises(RuntimeError, match="provider down"):
+        await service.translate_batch(["hello", "world"], "EN", "ES")
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_clear_cache_scope(service):
+    """Test clearing the cache for one language pair only."""
+    await service.translate("hello", "EN", "ES")
+    await service.translate("hello", "ES", "EN")
+
+    await service.clear_cache(CacheScope(source_language="ES"))
+
+    assert service.cache.get_cache_size() == 1
+
+
+@pytest.mark.asyncio
+async def test_analytics_recorded_on_lookup(service):
+    """Test every cache lookup updates the analytics."""
+    service.analytics = CacheAnalytics()
+
+    await service.translate("hello", "EN", "ES")
+    await service.translate_batch(["hello", "world"], "EN", "ES")
+
+    report = service.analytics.snapshot()
+    assert report["lookups"] == 3
+    assert report["language_pairs"][0]["hits"] == 1
+    assert report["characters_saved"] == len("hello")
+
+
+class DetectingProvider(MockProvider):
+    """Mock provider that reports the detected source language."""
+
+    detects_language = True
+
+    def __init__(self):
+        super().__init__()
+        self.translate_batch_detailed = AsyncMock(
+            side_effect=lambda texts, source_language, target_language: [
+                ProviderTranslation(f"translated {text}", "ES") for text in texts
+            ]
+        )
+
+
+@pytest.mark.asyncio
+async def test_auto_source_is_cached_under_detected_language():
+    """Test AUTO and explicit source requests share cache entries."""
+    service = TranslationService(
+        provider=DetectingProvider(),
+        cache=InMemoryTranslationCache(),
+        language_index=DetectedLanguageIndex(),
+    )
+
+    await service.translate_batch(["hola"], "AUTO", "EN")
+    result = await service.translate("hola", "ES", "EN")
+
+    assert result.translated_text == "translated hola"
+    service.provider.translate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_auto_lookup_uses_detected_language():
+    """Test AUTO lookups hit entries cached for the detected language."""
+    service = TranslationService(
+        provider=DetectingProvider(),
+        cache=InMemoryTranslationCache(),
+        language_index=DetectedLanguageIndex(),
+    )
+    await service.translate("hola", "AUTO", "EN")
+    service.language_index.set("adios", "ES")
+    await service.cache.set(service.cache._make_key("adios", "ES", "EN"), "bye")
+
+    results = await service.translate_batch(["hola", "adios"], "AUTO", "EN")
+
+    assert [r.translated_text for r in results] == ["translated hola", "bye"]
+    assert service.provider.translate_batch_detailed.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_translation_memory_answers_templated_misses():
+    """Test misses matching a remembered template skip the provider."""
+    provider = MockProvider()
+    provider.translate_batch.return_value = ["Sie haben 3 Artikel"]
+    service = TranslationService(
+        provider=provider,
+        cache=InMemoryTranslationCache(),
+        translation_memory=TranslationMemory(),
+    )
+
+    [first] = await service.translate_batch(["You have 3 items"], "EN", "DE")
+    [second] = await service.translate_batch(["You have 4 items"], "EN", "DE")
+    single = await service.translate("You have 5 items", "EN", "DE")
+
+    assert first.match_score is None
+    assert second.translated_text == "Sie haben 4 Artikel"
+    assert second.match_score == 1.0
+    assert single.translated_text == "Sie haben 5 Artikel"
+    assert provider.translate_batch.call_count == 1
+    provider.translate.assert_not_called()
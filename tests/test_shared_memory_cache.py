@@ -0,0 +1,171 @@
+import asyncio
+import multiprocessing
+import uuid
+from multiprocessing import shared_memory
+
+import pytest
+import pytest_asyncio
+
+from app.core.cache.base import CacheScope
+from app.core.cache.shared_memory import SharedMemoryTranslationCache
+
+
+@pytest_asyncio.fixture
+async def segment_name():
+    """Unique segment name, removed after the test."""
+    name = f"translator-test-{uuid.uuid4().hex[:12]}"
+    yield name
+    cache = SharedMemoryTranslationCache(name=name)
+    await cache.close()
+    cache.unlink()
+
+
+@pytest_asyncio.fixture
+async def cache(segment_name):
+    """Create a small shared-memory cache for each test."""
+    cache = SharedMemoryTranslationCache(name=segment_name, slots=64, arena_size=4096)
+    yield cache
+    await cache.close()
+
+
+def write_from_other_process(name, items):
+    """Write entries to the shared cache from a separate process."""
+
+    async def write():
+        cache = SharedMemoryTranslationCache(name=name, slots=64, arena_size=4096)
+        await cache.set_many(items)
+        await cache.close()
+
+    asyncio.run(write())
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_set_get_and_overwrite(cache):
+    """Test basic reads and writes, including overwriting a key."""
+    assert await cache.get("key1") is None
+
+    await cache.set("key1", "value1")
+    await cache.set_many({"key2": "value2", "ключ": "значение"})
+    await cache.set("key1", "updated")
+
+    assert await cache.get_many(["key1", "key2", "ключ", "missing"]) == [
+        "updated",
+        "value2",
+        "значение",
+        None,
+    ]
+    assert await cache.exists("key2")
+    assert cache.get_cache_size() == 3
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_is_shared_between_processes(cache, segment_name):
+    """Test entries written by another worker process are visible."""
+    process = multiprocessing.get_context("spawn").Process(
+        target=write_from_other_process,
+        args=(segment_name, {"EN:ES:abc": "hola"}),
+    )
+    process.start()
+    process.join(timeout=30)
+    assert process.exitcode == 0
+
+    assert await cache.get("EN:ES:abc") == "hola"
+
+
+def segment_exists(name):
+    """Check if a shared memory segment is present on the host."""
+    try:
+        shared_memory.SharedMemory(name=name, track=False).close()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+@pytest.mark.asyncio
+async def test_last_owner_unlinks_segment(segment_name):
+    """Test the segment is removed once every cache attached to it is closed."""
+    first = SharedMemoryTranslationCache(name=segment_name, slots=64, arena_size=4096)
+    second = SharedMemoryTranslationCache(name=segment_name, slots=64, arena_size=4096)
+    await first.set("key", "value")
+
+    await first.close()
+    assert segment_exists(segment_name)
+    assert await second.get("key") == "value"
+
+    await second.close()
+    assert not segment_exists(segment_name)
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_clear_scope(cache):
+    """Test clearing a language pair keeps other pairs."""
+    en_es = cache._make_key("a", "EN", "ES")
+    en_ru = cache._make_key("a", "EN", "RU")
+    await cache.set_many({en_es: "hola", en_ru: "привет"})
+
+    await cache.clear(CacheScope(target_language="ES"))
+
+    assert await cache.get(en_es) is None
+    assert await cache.get(en_ru) == "привет"
+    assert cache.get_cache_size() == 1
+
+    await cache.set(en_es, "hola")
+    assert await cache.get(en_es) == "hola"
+
+    await cache.clear()
+    assert cache.get_cache_size() == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_resets_when_full(cache):
+    """Test the cache starts over instead of growing when the arena is full."""
+    for index in range(100):
+        await cache.set(f"key{index}", "x" * 100)
+
+    assert await cache.get("key99") == "x" * 100
+    assert await cache.get("key0") is None
+    assert 0 < cache.get_cache_size() < 100
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_attaches_with_existing_geometry(cache, segment_name):
+    """Test a worker configured differently adopts the existing segment."""
+    await cache.set("key1", "value1")
+
+    other = SharedMemoryTranslationCache(name=segment_name, slots=1024)
+    try:
+        assert (other.slots, other.arena_size) == (64, 4096)
+        assert await other.get("key1") == "value1"
+    finally:
+        await other.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_geometry_survives_writes_and_clear(cache, segment_name):
+    """Test workers attaching after writes and a clear keep the arena size."""
+    await cache.set("key1", "value1")
+    await cache.clear()
+
+    restarted = SharedMemoryTranslationCache(name=segment_name)
+    try:
+        assert (restarted.slots, restarted.arena_size) == (64, 4096)
+        await restarted.set("key2", "value2")
+        assert await cache.get("key2") == "value2"
+        assert cache.get_cache_size() == 1
+    finally:
+        await restarted.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_writes_do_not_block_event_loop(cache):
+    """Test a write waiting for another process's lock leaves the loop free."""
+    other = SharedMemoryTranslationCache(name=cache.name, lock_path=cache.lock_path)
+    try:
+        with other._locked():
+            write = asyncio.create_task(cache.set("key1", "value1"))
+            await asyncio.sleep(0.05)
+            assert not write.done()
+        await asyncio.wait_for(write, timeout=5)
+        assert await cache.get("key1") == "value1"
+    finally:
+        await other.close()
@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+from app.core.providers.synthetic import SyntheticProvider, SyntheticProviderError
+
+
+@pytest.mark.asyncio
+async def test_synthetic_provider_is_deterministic():
+    """Test pseudo-translations depend only on text and target language."""
+    provider = SyntheticProvider(latency_median=0.0, latency_sigma=0.0)
+
+    assert await provider.translate("hello", "EN", "es") == "[ES] hello"
+    assert await provider.translate_batch(["a", "b"], "AUTO", "RU") == [
+        "[RU] a",
+        "[RU] b",
+    ]
+    with pytest.raises(ValueError):
+        await provider.translate("hello", "EN", "XX")
+
+
+@pytest.mark.asyncio
+async def test_synthetic_provider_splits_batches_under_concurrency_limit():
+    """Test large batches become several requests sharing the slots."""
+    provider = SyntheticProvider(
+        latency_median=0.05, latency_sigma=0.0, max_batch_size=2, max_concurrency=2
+    )
+
+    started = time.monotonic()
+    results = await provider.translate_batch(["a", "b", "c", "d", "e"], "EN", "ES")
+    elapsed = time.monotonic() - started
+
+    assert results == ["[ES] a", "[ES] b", "[ES] c", "[ES] d", "[ES] e"]
+    # Three requests, two at a time: two rounds of latency
+    assert 0.09 <= elapsed < 0.2
+
+
+@pytest.mark.asyncio
+async def test_synthetic_provider_injects_errors_reproducibly():
+    """Test error injection follows the seed."""
+
+    async def outcomes():
+        provider = SyntheticProvider(
+            latency_median=0.0, latency_sigma=0.0, error_rate=0.5, seed=7
+        )
+        results = []
+        for _ in range(20):
+            try:
+                await provider.translate("hello", "EN", "ES")
+                results.append(True)
+            except SyntheticProviderError:
+                results.append(False)
+        return results
+
+    first, second = await outcomes(), await outcomes()
+    assert first == second
+    assert True in first and False in first
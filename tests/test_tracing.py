@@ -0,0 +1,124 @@
+import json
+
+import httpx
+import pytest
+
+from app.core import translator
+from app.core.tracing import (
+    FileSpanExporter,
+    SpanExporter,
+    Tracer,
+    parse_traceparent,
+)
+
+TRACEPARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+class RecordingExporter(SpanExporter):
+    """Exporter keeping spans in memory."""
+
+    def __init__(self):
+        self.spans = []
+
+    async def export(self, spans):
+        self.spans.extend(spans)
+
+
+def test_parse_traceparent():
+    """Test W3C traceparent parsing."""
+    assert parse_traceparent(TRACEPARENT) == (
+        "4bf92f3577b34da6a3ce929d0e0e4736",
+        "00f067aa0ba902b7",
+        True,
+    )
+    assert parse_traceparent(TRACEPARENT[:-2] + "00")[2] is False
+    assert parse_traceparent("garbage") is None
+    assert parse_traceparent(None) is None
+
+
+@pytest.mark.asyncio
+async def test_tracer_records_nested_spans():
+    """Test child spans continue the incoming trace."""
+    exporter = RecordingExporter()
+    tracer = Tracer(sample_rate=0.0, exporter=exporter)
+
+    with (
+        tracer.start_trace("request", TRACEPARENT) as root,
+        tracer.span("cache.lookup", keys=2) as child,
+    ):
+        headers = tracer.inject({"Accept": "application/json"})
+    await tracer.flush()
+
+    assert [span.name for span in exporter.spans] == ["cache.lookup", "request"]
+    assert root.trace_id == child.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert root.parent_id == "00f067aa0ba902b7"
+    assert child.parent_id == root.span_id
+    assert child.attributes == {"keys": 2}
+    assert headers["traceparent"] == child.traceparent
+
+
+@pytest.mark.asyncio
+async def test_tracer_sampling():
+    """Test unsampled requests record nothing."""
+    exporter = RecordingExporter()
+    tracer = Tracer(sample_rate=0.0, exporter=exporter)
+
+    with tracer.start_trace("request") as root, tracer.span("child") as child:
+        assert tracer.inject(None) is None
+    with tracer.start_trace("request", TRACEPARENT[:-2] + "00") as unsampled:
+        pass
+    await tracer.flush()
+
+    assert root is None and child is None and unsampled is None
+    assert exporter.spans == []
+
+
+@pytest.mark.asyncio
+async def test_tracer_records_errors():
+    """Test exceptions are recorded on the span."""
+    exporter = RecordingExporter()
+    tracer = Tracer(sample_rate=1.0, exporter=exporter)
+
+    with pytest.raises(ValueError), tracer.start_trace("request"):
+        raise ValueError("boom")
+    await tracer.flush()
+
+    assert exporter.spans[0].error == "ValueError: boom"
+
+
+@pytest.mark.asyncio
+async def test_file_span_exporter(tmp_path):
+    """Test spans are appended to a JSON lines file."""
+    path = tmp_path / "spans.jsonl"
+    tracer = Tracer(sample_rate=1.0, exporter=FileSpanExporter(str(path)))
+
+    with tracer.start_trace("request"):
+        pass
+    await tracer.shutdown()
+
+    [line] = path.read_text().splitlines()
+    assert json.loads(line)["name"] == "request"
+
+
+@pytest.mark.asyncio
+async def test_remote_api_calls_do_not_leak_traceparent(monkeypatch):
+    """Test third-party API calls are traced without forwarding trace context."""
+    exporter = RecordingExporter()
+    tracer = Tracer(sample_rate=0.0, exporter=exporter)
+    monkeypatch.setattr(translator, "tracer", tracer)
+    sent = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        sent.append(request.headers)
+        return httpx.Response(200, json={"ok": True})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(respond)) as client:
+        with tracer.start_trace("request", TRACEPARENT):
+            result = await translator.call_remote_api(
+                "https://api.example.com/v2/translate", client=client
+            )
+    await tracer.flush()
+
+    assert result == {"ok": True}
+    assert "traceparent" not in sent[0]
+    assert "http.request" in [span.name for span in exporter.spans]
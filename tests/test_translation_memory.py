@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.translation_memory import TranslationMemory, mask
+
+
+def test_mask_numbers_and_placeholders():
+    """Test numbers and placeholders are cut out in order."""
+    template, values = mask("Hi {name}, you have 1,000 points and %s")
+
+    assert values == ["{name}", "1,000", "%s"]
+    assert mask("Hi {user}, you have 5 points and %s")[0] == template
+
+
+@pytest.mark.asyncio
+async def test_templated_text_reuses_translation():
+    """Test texts differing only in values share one entry."""
+    memory = TranslationMemory()
+    await memory.add_many(
+        {"You have 3 items in {cart}": "Sie haben 3 Artikel in {cart}"}, "EN", "DE"
+    )
+
+    match, other_pair = await memory.lookup_many(
+        [
+            ("You have 12 items in {basket}", "en", "de"),
+            ("You have 12 items in {basket}", "EN", "FR"),
+        ]
+    )
+
+    assert match.translated_text == "Sie haben 12 Artikel in {basket}"
+    assert match.score == 1.0
+    assert other_pair is None
+
+
+@pytest.mark.asyncio
+async def test_similar_text_matches_above_threshold():
+    """Test near-duplicates match and unrelated texts do not."""
+    memory = TranslationMemory(threshold=0.8)
+    await memory.add_many(
+        {
+            "Your order has been shipped and will arrive soon": (
+                "Ihre Bestellung wurde versandt und kommt bald an"
+            )
+        },
+        "EN",
+        "DE",
+    )
+
+    similar, unrelated = await memory.lookup_many(
+        [
+            ("Your order has been shipped, and will arrive soon!", "EN", "DE"),
+            ("Your password was changed yesterday", "EN", "DE"),
+        ]
+    )
+
+    assert similar.translated_text == "Ihre Bestellung wurde versandt und kommt bald an"
+    assert 0.8 <= similar.score <= 1.0
+    assert unrelated is None
+
+
+@pytest.mark.asyncio
+async def test_ambiguous_translation_is_not_remembered():
+    """Test translations whose values cannot be placed are skipped."""
+    memory = TranslationMemory()
+    await memory.add_many(
+        {"3 of 3 done": "3 von 3 erledigt", "5 files": "fünf Dateien"}, "EN", "DE"
+    )
+
+    assert len(memory) == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_drops_least_recently_used():
+    """Test the memory stays within its size bound."""
+    memory = TranslationMemory(max_entries=2)
+    await memory.add_many({"first text": "erster Text"}, "EN", "DE")
+    await memory.add_many({"second text": "zweiter Text"}, "EN", "DE")
+    await memory.lookup_many([("first text", "EN", "DE")])
+    await memory.add_many({"third text": "dritter Text"}, "EN", "DE")
+
+    assert len(memory) == 2
+    assert await memory.lookup_many([("first text", "EN", "DE")]) != [None]
+    assert memory._buckets and all(
+        key[2] != "second text" for keys in memory._buckets.values() for key in keys
+    )
+
+
+@pytest.mark.asyncio
+async def test_long_texts_do_not_block_event_loop():
+    """Test signatures of large inputs are computed off the event loop."""
+    memory = TranslationMemory()
+    texts = {
+        " ".join(f"word{i}x{j}" for j in range(20_000)): "translated" for i in range(5)
+    }
+    gaps = []
+
+    async def tick():
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    ticker = asyncio.create_task(tick())
+    await asyncio.sleep(0.01)
+    try:
+        await memory.add_many(texts, "EN", "DE")
+        await memory.lookup_many([(text, "EN", "DE") for text in texts])
+        # Let the ticker record the gap a blocking call would have left
+        await asyncio.sleep(0.01)
+    finally:
+        ticker.cancel()
+
+    assert max(gaps) < 0.1
+
+
+def test_bands_must_divide_signature():
+    """Test invalid LSH parameters are rejected."""
+    with pytest.raises(ValueError):
+        TranslationMemory(num_perm=64, bands=10)